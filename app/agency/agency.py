@@ -1,20 +1,29 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 
-from models.types import AgencyState, ActionPlan
+from models.types import ActionPlan
 from app.physio.heart import Heart
 from .drives import DrivesModel
+from .lookahead import LookaheadPlanner
 from .needs_planner import NeedsPlanner
+from .state import AgentState
+from .thoughts import ThoughtLog
 
 
 class Agency:
     """High-level agent managing drives and decisions."""
 
     def __init__(self) -> None:
-        self.state = AgencyState()
+        self.state = AgentState()
+        # bumped on every mutation; keys the cached dump_state() result
+        self.version = 0
+        self._dump: tuple[int, Dict[str, Any]] = (-1, {})
         self.drives = DrivesModel()
         self.planner = NeedsPlanner()
         self.heart = Heart()
+        self.thoughts = ThoughtLog()
+        # optional bounded-time lookahead; None keeps the greedy planner
+        self.lookahead: LookaheadPlanner | None = None
 
     def sense(self, signals: Dict[str, Any]) -> None:
         # direct updates
@@ -22,9 +31,16 @@ class Agency:
             self.drives.threat = max(self.drives.threat, float(th))
         if signals.get("stimulation"):
             self.drives.curiosity = min(1.0, self.drives.curiosity + 0.05)
+        self.version += 1
 
     def step(self, minutes: float, signals: Dict[str, Any]) -> None:
         self.drives.update(minutes, signals)
+        self._sync_state()
+        # heart responds to arousal/activity
+        activity = float(signals.get("activity", 0.0) or 0.0)
+        self.heart.update(minutes * 60.0, arousal=self.state.mood.arousal, activity=activity, rest=bool(signals.get("rest", False)))
+
+    def _sync_state(self) -> None:
         # sync into AgencyState
         self.state.drives.hunger = self.drives.hunger
         self.state.drives.fatigue = self.drives.fatigue
@@ -35,42 +51,119 @@ class Agency:
         self.state.energy = max(0.0, min(1.0, 1.0 - self.drives.fatigue))
         # derive affective summary
         self._update_mood_and_appetite()
-        # heart responds to arousal/activity
-        activity = float(signals.get("activity", 0.0) or 0.0)
-        self.heart.update(minutes * 60.0, arousal=self.state.mood.arousal, activity=activity, rest=bool(signals.get("rest", False)))
+        self.version += 1
+
+    def dump_state(self) -> Dict[str, Any]:
+        """JSON-ready AgencyState (same shape as its model_dump), rebuilt only when the version changes.
+
+        The result is shared between callers and must not be mutated.
+        """
+        version, data = self._dump
+        if version != self.version:
+            self.state.last_thoughts = self.thoughts.render()
+            data = self.state.as_dict()
+            self._dump = (self.version, data)
+        return data
+
+    def fast_forward(self, minutes: float, schedule: Iterable[Dict[str, Any]] | None = None, *, activity: float = 0.0, rest: bool = False) -> Dict[str, Any]:
+        """Advance drives and heart over a long span in closed form.
+
+        `schedule` holds signal events `{"at": minute, "threat": .., "stimulation": ..}`
+        applied at their boundaries; between events drives move linearly (clamped)
+        and the heart follows its exact lag solution, so cost is O(events), not
+        O(duration). Returns beat counts and derived stats.
+        """
+        minutes = max(0.0, float(minutes))
+        events = sorted((dict(e) for e in (schedule or [])), key=lambda e: float(e.get("at", 0.0)))
+        t, beats, area, applied = 0.0, 0.0, 0.0, 0
+        for evt in events + [None]:
+            at = minutes if evt is None else min(max(float(evt.get("at", 0.0)), t), minutes)
+            b, a = self._ff_segment(at - t, activity, rest)
+            beats, area, t = beats + b, area + a, at
+            if evt is not None:
+                signals = {k: v for k, v in evt.items() if k != "at"}
+                self.sense(signals)
+                self.drives.update(0.0, signals)
+                applied += 1
+        self._sync_state()
+        return {
+            "minutes": minutes,
+            "events": applied,
+            "beats": int(beats),
+            "mean_bpm": area / (minutes * 60.0) if minutes > 0 else self.heart.state.bpm,
+            "bpm": self.heart.state.bpm,
+            "hrv": self.heart.state.hrv,
+        }
+
+    def _ff_segment(self, minutes: float, activity: float, rest: bool) -> tuple[float, float]:
+        """Signal-free span: split where threat/curiosity clamp so arousal stays linear."""
+        beats = area = 0.0
+        d, g = self.drives, self.drives.gains
+        while minutes > 1e-12:
+            rates = {"threat": -g.threat_decay_per_min, "curiosity": -g.curiosity_decay_per_min}
+            piece, live = minutes, {}
+            for name, r in rates.items():
+                x = getattr(d, name)
+                if (r < 0 and x > 0.0) or (r > 0 and x < 1.0):
+                    live[name] = r
+                    piece = min(piece, (1.0 - x) / r if r > 0 else -x / r)
+            arousal = 0.5 * d.threat + 0.4 * d.curiosity + 0.1
+            arousal_rate = (0.5 * live.get("threat", 0.0) + 0.4 * live.get("curiosity", 0.0)) / 60.0
+            stats = self.heart.fast_forward(piece * 60.0, arousal=arousal, arousal_rate=arousal_rate, activity=activity, rest=rest)
+            beats += stats["beats"]
+            area += stats["mean_bpm"] * piece * 60.0
+            d.update(piece, {})
+            minutes -= piece
+        return beats, area
 
     def decide(self, affordances: Dict[str, Any]) -> ActionPlan:
-        weights = self.planner.score(self.drives.as_dict(), affordances)
+        drives = self.drives.as_dict()
+        weights = self.planner.score(drives, affordances)
         self.state.weights = weights
-        action, priority, reason, params = self.planner.decide(self.drives.as_dict(), affordances)
-        # generate thoughts
-        self.state.last_thoughts = self._generate_thoughts(action, priority, reason)
+        action, priority, reason, params = (self.lookahead or self.planner).decide(drives, affordances, weights)
+        # record the decision; text is rendered only when serialized
+        self._record_decision(drives, action, priority, reason)
+        self.version += 1
         return ActionPlan(action=action, priority=priority, reason=reason, parameters=params)
 
     def enact(self, plan: ActionPlan) -> None:
-        if plan.action == "eat":
-            self.drives.apply_eat()
-        elif plan.action == "rest":
-            self.drives.apply_rest()
-        elif plan.action == "explore":
-            self.drives.apply_explore()
-        elif plan.action == "seek_safety":
-            self.drives.apply_seek_safety()
+        self.drives.apply(plan.action)
         # sync derived values
         self.step(0.0, {})
 
+    def set_lookahead(self, params: Dict[str, Any] | None) -> None:
+        """Enable/reconfigure lookahead planning (depth, beam, budget_ms, ...); None or depth<=0 disables."""
+        if params is not None and not isinstance(params, dict):
+            raise ValueError(f"lookahead must be an object or null, got {type(params).__name__}")
+        try:
+            disable = not params or int(params.get("depth", 1) or 0) <= 0
+        except (TypeError, ValueError):
+            raise ValueError(f"depth must be an integer, got {params.get('depth')!r}") from None
+        if disable:
+            self.lookahead = None
+        elif self.lookahead is None:
+            # configured before it is installed: invalid params leave planning as it was
+            lookahead = LookaheadPlanner(self.planner, self.drives.gains)
+            lookahead.configure(**params)
+            self.lookahead = lookahead
+        else:
+            self.lookahead.configure(**params)
+
     # Perception API
-    def observe_vision(self, objects: list[dict]) -> None:
-        """Lightweight vision hook: boosts curiosity and records thoughts."""
+    def observe_vision(self, objects: list[dict], count: int | None = None) -> None:
+        """Lightweight vision hook: boosts curiosity and records thoughts.
+
+        `count` is the number of objects in view when `objects` is only a diff.
+        """
         if not isinstance(objects, list):
             return
-        n = len(objects)
+        n = len(objects) if count is None else int(count)
         # small curiosity boost per vision event
         self.drives.curiosity = min(1.0, self.drives.curiosity + 0.02 * n)
         self.state.context["vision_last_count"] = n
         # keep a short thought about what was seen
-        labels = [str(o.get("tag", o.get("id", "?"))) for o in objects[:5]]
-        self.state.last_thoughts = [f"Vision: {n} object(s) in view -> {', '.join(labels)}"] + self.state.last_thoughts[:4]
+        self.thoughts.push("vision", n, tuple(o.get("tag", o.get("id", "?")) for o in objects[:5]))
+        self.version += 1
 
     # --- internals ---
     def _update_mood_and_appetite(self) -> None:
@@ -102,20 +195,18 @@ class Agency:
             return "curious"
         return "neutral"
 
-    def _generate_thoughts(self, action: str, priority: float, reason: str) -> list[str]:
-        d = self.drives.as_dict()
-        thoughts = [
-            f"Assessing drives: hunger={d['hunger']:.2f}, fatigue={d['fatigue']:.2f}, curiosity={d['curiosity']:.2f}, threat={d['threat']:.2f}",
-            f"Mood: {self.state.mood.label} (valence={self.state.mood.valence:.2f}, arousal={self.state.mood.arousal:.2f})",
-            f"Appetite score: {self.state.appetite:.2f}",
-            f"Heart: {self.heart.state.bpm:.1f} bpm (hrv={self.heart.state.hrv:.2f})",
-            f"Action weights: " + ", ".join(f"{k}={v:.2f}" for k, v in sorted(self.state.weights.items(), key=lambda kv: -kv[1])),
-            f"Chosen: {action} (priority={priority:.2f}) because {reason}",
-        ]
-        return thoughts
+    def _record_decision(self, d: Dict[str, float], action: str, priority: float, reason: str) -> None:
+        mood, heart = self.state.mood, self.heart.state
+        self.thoughts.push(
+            "decision",
+            d["hunger"], d["fatigue"], d["curiosity"], d["threat"],
+            mood.label, mood.valence, mood.arousal, self.state.appetite,
+            heart.bpm, heart.hrv, self.state.weights, action, priority, reason,
+        )
 
     # Public helper for computing weights without committing a decision
     def eval_weights(self, affordances: Dict[str, Any]) -> Dict[str, float]:
         w = self.planner.score(self.drives.as_dict(), affordances)
         self.state.weights = w
+        self.version += 1
         return w
@@ -55,6 +55,12 @@ class DrivesModel:
         self.clamp()
 
     # Action effects
+    def apply(self, action: str) -> None:
+        """Effect of a planner action (see ACTIONS); actions without one are a no-op."""
+        effect = ACTION_EFFECTS.get(action)
+        if effect is not None:
+            getattr(self, effect)()
+
     def apply_eat(self) -> None:
         self.hunger = max(0.0, self.hunger - 0.5)
         self.curiosity = min(1.0, self.curiosity + 0.05)
@@ -69,3 +75,7 @@ class DrivesModel:
 
     def apply_seek_safety(self) -> None:
         self.threat = max(0.0, self.threat - 0.5)
+
+
+# action name -> DrivesModel method applying its effect ("think" has none)
+ACTION_EFFECTS = {"eat": "apply_eat", "rest": "apply_rest", "explore": "apply_explore", "seek_safety": "apply_seek_safety"}
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import math
+import time
+from typing import Any, Dict, List, Tuple
+
+from .drives import DriveGains, DrivesModel
+from .needs_planner import ACTIONS, NeedsPlanner
+
+State = Tuple[float, float, float, float]  # hunger, fatigue, curiosity, threat
+
+
+def transition(s: State, action: str, gains: DriveGains, minutes: float, food_available: bool) -> State:
+    """DrivesModel action effect followed by `minutes` of drift (signal-free).
+
+    Runs the real model on a scratch copy of the drives, so planned effects
+    always match Agency.enact. The planner only expects eating to help when
+    food is available.
+    """
+    d = DrivesModel()
+    d.gains = gains
+    d.hunger, d.fatigue, d.curiosity, d.threat = s
+    if action != "eat" or food_available:
+        d.apply(action)
+    d.update(minutes)
+    return d.hunger, d.fatigue, d.curiosity, d.threat
+
+
+def reward(prev: State, nxt: State) -> float:
+    # same shaping as World.tick: relief of hunger/threat, penalty on fatigue growth
+    return 1.0 * (prev[0] - nxt[0]) + 0.8 * (prev[3] - nxt[3]) - 0.2 * (nxt[1] - prev[1])
+
+
+class LookaheadPlanner:
+    """Beam search over the drives model with a strict per-decision time budget.
+
+    Each level expands every beam node by all ACTIONS and keeps the `beam` best
+    by discounted return. Expansions are cached in a transposition table keyed
+    on the quantized drive state, so states reached again (within a search or in
+    later decisions) are not re-simulated. When the budget runs out the best
+    completed level decides; with no completed level it falls back to greedy.
+    """
+
+    def __init__(
+        self,
+        planner: NeedsPlanner,
+        gains: DriveGains,
+        depth: int = 4,
+        beam: int = 8,
+        budget_ms: float = 2.0,
+        step_minutes: float = 5.0,
+        gamma: float = 0.9,
+        quantum: float = 0.01,
+        max_entries: int = 50_000,
+    ) -> None:
+        self.planner = planner
+        self.gains = gains
+        self.depth = int(depth)
+        self.beam = int(beam)
+        self.budget_ms = float(budget_ms)
+        self.step_minutes = float(step_minutes)
+        self.gamma = float(gamma)
+        self.quantum = float(quantum)
+        self.max_entries = int(max_entries)
+        self._table: Dict[tuple, List[Tuple[str, State, float]]] = {}
+        # set by event-log replay: search exactly this many levels, ignoring the clock
+        self.replay_depth: int | None = None
+        self.stats: Dict[str, float] = {"decisions": 0, "nodes": 0, "expanded": 0, "hits": 0, "seconds": 0.0, "timeouts": 0, "last_depth": 0}
+
+    def configure(self, **params: Any) -> None:
+        """Update settings; ValueError (and no change) if any value is malformed or out of range."""
+        new = self.settings()
+        for k in new:
+            if params.get(k) is not None:
+                try:
+                    new[k] = type(new[k])(params[k])
+                except (TypeError, ValueError):
+                    raise ValueError(f"{k} must be a number, got {params[k]!r}") from None
+        if new["depth"] < 1 or new["beam"] < 1:
+            raise ValueError(f"depth and beam must be at least 1, got {new['depth']} and {new['beam']}")
+        if not (math.isfinite(new["quantum"]) and new["quantum"] > 0.0):
+            raise ValueError(f"quantum must be positive, got {new['quantum']}")
+        if not new["budget_ms"] >= 0.0 or not new["step_minutes"] >= 0.0:
+            raise ValueError(f"budget_ms and step_minutes must be non-negative, got {new['budget_ms']} and {new['step_minutes']}")
+        if not math.isfinite(new["gamma"]):
+            raise ValueError(f"gamma must be finite, got {new['gamma']}")
+        for k, v in new.items():
+            setattr(self, k, v)
+        self._table.clear()
+
+    def settings(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in ("depth", "beam", "budget_ms", "step_minutes", "gamma", "quantum")}
+
+    def key(self, s: State, food: bool) -> tuple:
+        q = self.quantum
+        return (round(s[0] / q), round(s[1] / q), round(s[2] / q), round(s[3] / q), food)
+
+    def expand(self, s: State, food: bool) -> List[Tuple[str, State, float]]:
+        self.stats["nodes"] += 1
+        k = self.key(s, food)
+        children = self._table.get(k)
+        if children is not None:
+            self.stats["hits"] += 1
+            return children
+        if len(self._table) >= self.max_entries:
+            self._table.clear()
+        # expand from the key's representative state so cached children never
+        # depend on which exact state first reached the key
+        q = self.quantum
+        rep: State = (k[0] * q, k[1] * q, k[2] * q, k[3] * q)
+        children = []
+        for a in ACTIONS:
+            n = transition(rep, a, self.gains, self.step_minutes, food)
+            children.append((a, n, reward(rep, n)))
+        self._table[k] = children
+        self.stats["expanded"] += 1
+        return children
+
+    def decide(self, drives: Dict[str, float], affordances: Dict[str, Any], scores: Dict[str, float] | None = None) -> tuple[str, float, str, Dict[str, Any]]:
+        t0 = time.perf_counter()
+        deadline = t0 + self.budget_ms / 1000.0
+        replay, self.replay_depth = self.replay_depth, None
+        depth = self.depth if replay is None else replay
+        if replay is not None:
+            deadline = float("inf")
+        food = bool(affordances.get("food_available"))
+        root: State = (drives.get("hunger", 0.0), drives.get("fatigue", 0.0), drives.get("curiosity", 0.0), drives.get("threat", 0.0))
+        # beam entries: (return, first action, state)
+        beam: List[Tuple[float, str, State]] = [(0.0, "", root)]
+        best_first: str | None = None
+        reached = 0
+        for level in range(depth):
+            disc = self.gamma ** level
+            seen: Dict[tuple, Tuple[float, str, State]] = {}
+            timed_out = False
+            for ret, first, s in beam:
+                if time.perf_counter() > deadline:
+                    timed_out = True
+                    break
+                for a, n, r in self.expand(s, food):
+                    cand = (ret + disc * r, first or a, n)
+                    k = self.key(n, food)
+                    # transposition: keep only the best path into each quantized state
+                    if k not in seen or cand[0] > seen[k][0]:
+                        seen[k] = cand
+            if timed_out:
+                self.stats["timeouts"] += 1
+                break
+            beam = sorted(seen.values(), key=lambda e: -e[0])[: self.beam]
+            best_first, reached = beam[0][1], level + 1
+
+        self._account(time.perf_counter() - t0, reached)
+        if scores is None:
+            scores = self.planner.score(drives, affordances)
+        if best_first is None:
+            return self.planner.decide(drives, affordances, scores)
+        reason = self.planner._reason_for(best_first, drives, affordances)
+        return best_first, scores[best_first], reason, {"lookahead_depth": reached}
+
+    def report(self) -> Dict[str, float]:
+        s = self.stats
+        return {
+            **s,
+            "nodes_per_sec": s["nodes"] / s["seconds"] if s["seconds"] > 0 else 0.0,
+            "hit_rate": s["hits"] / s["nodes"] if s["nodes"] else 0.0,
+            "table_size": len(self._table),
+            "depth": self.depth,
+            "beam": self.beam,
+            "budget_ms": self.budget_ms,
+        }
+
+    def _account(self, seconds: float, reached: int) -> None:
+        self.stats["decisions"] += 1
+        self.stats["seconds"] += seconds
+        self.stats["last_depth"] = reached
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import math
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=4096)
+def tag_affordance_codes(tag: str) -> Tuple[float, float, float]:
+    """Per-tag (hunger, threat, curiosity) coefficients of the base affordance."""
+    t = (tag or "").lower()
+    food = 1.2 if "food" in t else 0.0
+    hazard = -1.3 if ("hazard" in t or "danger" in t) else 0.0
+    # unknown objects feed curiosity
+    unknown = 0.8 if (not t or t.startswith("obj")) else 0.0
+    return food, hazard, unknown
+
+
+class NavField:
+    """Array-backed object scene for vectorized potential-field queries.
+
+    Positions live in float arrays and tags in an integer code table, bucketed
+    in a uniform grid whose cell size equals the cutoff distance where
+    exp(-d/sigma) drops below `eps`. A query only touches the 3x3 cells around
+    the agent, so cost scales with nearby objects rather than scene size.
+    Objects are keyed by id and can be upserted or removed one at a time, so
+    a long-lived field follows vision diffs without being rebuilt.
+    """
+
+    def __init__(self, objects: Iterable[dict] = (), sigma: float = 120.0, eps: float = 1e-4) -> None:
+        self.sigma = float(sigma)
+        self.cutoff = self.sigma * math.log(1.0 / eps)
+        self.set_objects(objects)
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def set_objects(self, objects: Iterable[dict]) -> None:
+        """Replace the scene; objects without an id are keyed by position in `objects`."""
+        objs = list(objects)
+        n = len(objs)
+        self.x = np.fromiter((float(o.get("x", 0.0)) for o in objs), dtype=np.float64, count=n)
+        self.y = np.fromiter((float(o.get("y", 0.0)) for o in objs), dtype=np.float64, count=n)
+        self.tags: List[str] = []
+        self._code: Dict[str, int] = {}
+        self.tag_codes = np.fromiter((self._tag_code(str(o.get("tag", ""))) for o in objs), dtype=np.int32, count=n)
+        self._slot: Dict[str, int] = {}
+        for i, o in enumerate(objs):
+            self._slot[str(o.get("id", i))] = i
+        # duplicate ids: the last one wins, earlier slots are free
+        self._free = sorted(set(range(n)) - set(self._slot.values()), reverse=True)
+        self._build_grid()
+
+    def upsert(self, obj: dict) -> None:
+        """Add or move one object (keyed by its "id")."""
+        oid = str(obj["id"])
+        i = self._slot.get(oid)
+        if i is not None:
+            self._cell_members(self._cell_of(i)).discard(i)
+        else:
+            i = self._slot[oid] = self._alloc()
+        self.x[i], self.y[i] = float(obj.get("x", 0.0)), float(obj.get("y", 0.0))
+        self.tag_codes[i] = self._tag_code(str(obj.get("tag", "")))
+        self._cell_members(self._cell_of(i)).add(i)
+
+    def remove(self, oid: object) -> None:
+        i = self._slot.pop(str(oid), None)
+        if i is not None:
+            self._cell_members(self._cell_of(i)).discard(i)
+            self._free.append(i)
+
+    def candidates(self, x: float, y: float) -> np.ndarray:
+        """Indices of objects in the 3x3 grid cells around (x, y)."""
+        cx, cy = int(math.floor(x / self.cutoff)), int(math.floor(y / self.cutoff))
+        parts = [a for a in (self._cell_array(cx + i, cy + j) for i in (-1, 0, 1) for j in (-1, 0, 1)) if a is not None]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def field(self, x: float, y: float, tag_weights: np.ndarray) -> Tuple[float, float]:
+        """Sum of w * exp(-d/sigma) * unit(dx, dy) over objects within the cutoff.
+
+        `tag_weights` is the per-unique-tag total weight (learned + affordance).
+        """
+        idx = self.candidates(x, y)
+        if not len(idx):
+            return 0.0, 0.0
+        dx = self.x[idx] - x
+        dy = self.y[idx] - y
+        dist = np.hypot(dx, dy) + 1e-6
+        near = dist <= self.cutoff
+        w = tag_weights[self.tag_codes[idx]] * np.exp(-dist / self.sigma) / dist
+        w = np.where(near, w, 0.0)
+        return float(np.dot(w, dx)), float(np.dot(w, dy))
+
+    def affordances(self, drives: Dict[str, float]) -> np.ndarray:
+        vec = np.array([
+            float(drives.get("hunger", 0.0) or 0.0),
+            float(drives.get("threat", 0.0) or 0.0),
+            float(drives.get("curiosity", 0.0) or 0.0),
+        ])
+        return self.tag_coeffs @ vec
+
+    def _tag_code(self, tag: str) -> int:
+        code = self._code.get(tag)
+        if code is None:
+            code = self._code[tag] = len(self.tags)
+            self.tags.append(tag)
+            # (T, 3) base affordance coefficients per known tag
+            self.tag_coeffs = np.array([tag_affordance_codes(t) for t in self.tags], dtype=np.float64).reshape(-1, 3)
+        return code
+
+    def _alloc(self) -> int:
+        if self._free:
+            return self._free.pop()
+        n = len(self.x)
+        grow = max(16, n)
+        self.x = np.concatenate([self.x, np.zeros(grow)])
+        self.y = np.concatenate([self.y, np.zeros(grow)])
+        self.tag_codes = np.concatenate([self.tag_codes, np.zeros(grow, dtype=np.int32)])
+        self._free.extend(range(n + grow - 1, n, -1))
+        return n
+
+    def _cell_of(self, i: int) -> Tuple[int, int]:
+        return int(math.floor(self.x[i] / self.cutoff)), int(math.floor(self.y[i] / self.cutoff))
+
+    def _cell_members(self, cell: Tuple[int, int]) -> Set[int]:
+        # mutable view of a cell; its index array is rebuilt on the next query
+        self._arrays.pop(cell, None)
+        members = self._cells.get(cell)
+        if members is None:
+            members = self._cells[cell] = set()
+        return members
+
+    def _cell_array(self, cx: int, cy: int) -> np.ndarray | None:
+        cell = (cx, cy)
+        a = self._arrays.get(cell)
+        if a is None:
+            members = self._cells.get(cell)
+            if not members:
+                return None
+            a = self._arrays[cell] = np.fromiter(sorted(members), dtype=np.int64, count=len(members))
+        return a
+
+    def _build_grid(self) -> None:
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._arrays: Dict[Tuple[int, int], np.ndarray] = {}
+        live = np.fromiter(sorted(self._slot.values()), dtype=np.int64, count=len(self._slot))
+        if not len(live):
+            return
+        cx = np.floor(self.x[live] / self.cutoff).astype(np.int64)
+        cy = np.floor(self.y[live] / self.cutoff).astype(np.int64)
+        keys, inverse = np.unique(np.stack([cx, cy], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        for k, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+            cell = (int(keys[k, 0]), int(keys[k, 1]))
+            self._arrays[cell] = live[order[a:b]]
+            self._cells[cell] = set(self._arrays[cell].tolist())
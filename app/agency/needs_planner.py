@@ -1,6 +1,10 @@
 from __future__ import annotations
 from typing import Dict, Any
 
+import numpy as np
+
+ACTIONS = ("seek_safety", "eat", "rest", "explore", "think")
+
 
 class NeedsPlanner:
     """Utility-based prioritization of actions from drives.
@@ -8,6 +12,16 @@ class NeedsPlanner:
     Returns action suggestions with priority scores.
     """
 
+    # scoring coefficients (class-level defaults; override per instance to tune)
+    safety_gain: float = 0.9
+    eat_without_food: float = 0.2
+    eat_threat_suppression: float = 0.8
+    rest_gain_safe: float = 0.6
+    rest_gain_unsafe: float = 0.2
+    explore_gain_safe: float = 0.7
+    explore_gain_unsafe: float = 0.1
+    think_base: float = 0.2
+
     def score(self, drives: Dict[str, float], affordances: Dict[str, Any]) -> Dict[str, float]:
         hunger = drives.get("hunger", 0.0)
         fatigue = drives.get("fatigue", 0.0)
@@ -16,21 +30,48 @@ class NeedsPlanner:
 
         scores: Dict[str, float] = {}
         # Safety dominates
-        scores["seek_safety"] = max(threat * 0.9, 0.0)
+        scores["seek_safety"] = max(threat * self.safety_gain, 0.0)
         # Eating only if food exists; suppressed by high threat
-        base_eat = hunger * (1.0 if affordances.get("food_available") else 0.2)
-        suppression = max(0.0, 1.0 - 0.8 * threat)
+        base_eat = hunger * (1.0 if affordances.get("food_available") else self.eat_without_food)
+        suppression = max(0.0, 1.0 - self.eat_threat_suppression * threat)
         scores["eat"] = base_eat * suppression
         # Rest depends on fatigue and safety
-        scores["rest"] = max(fatigue * (0.6 if threat < 0.3 else 0.2), 0.0)
+        scores["rest"] = max(fatigue * (self.rest_gain_safe if threat < 0.3 else self.rest_gain_unsafe), 0.0)
         # Explore if curious and safe
-        scores["explore"] = max(curiosity * (0.7 if threat < 0.2 else 0.1), 0.0)
+        scores["explore"] = max(curiosity * (self.explore_gain_safe if threat < 0.2 else self.explore_gain_unsafe), 0.0)
         # Work/think is default
-        scores["think"] = max(0.2 * (1.0 - threat), 0.05)
+        scores["think"] = max(self.think_base * (1.0 - threat), 0.05)
         return scores
 
-    def decide(self, drives: Dict[str, float], affordances: Dict[str, Any]) -> tuple[str, float, str, Dict[str, Any]]:
-        scores = self.score(drives, affordances)
+    def score_batch(self, drives: Dict[str, Any], food_available: Any = False) -> np.ndarray:
+        """Vectorized score() over many drive/affordance combinations.
+
+        `drives` maps hunger/fatigue/curiosity/threat to scalars or equal-length
+        arrays; returns an (n, len(ACTIONS)) array with columns in ACTIONS order.
+        """
+        cols = {k: np.asarray(drives.get(k, 0.0), dtype=np.float64) for k in ("hunger", "fatigue", "curiosity", "threat")}
+        food = np.asarray(food_available, dtype=bool)
+        shape = np.broadcast_shapes(*(a.shape for a in (*cols.values(), food)))
+        n = shape[0] if shape else 1  # all scalars: one row; empty arrays: none
+        hunger, fatigue, curiosity, threat = (np.broadcast_to(cols[k], (n,)) for k in ("hunger", "fatigue", "curiosity", "threat"))
+        food = np.broadcast_to(food, (n,))
+        out = np.empty((n, len(ACTIONS)))
+        out[:, 0] = np.maximum(threat * self.safety_gain, 0.0)
+        out[:, 1] = hunger * np.where(food, 1.0, self.eat_without_food) * np.maximum(0.0, 1.0 - self.eat_threat_suppression * threat)
+        out[:, 2] = np.maximum(fatigue * np.where(threat < 0.3, self.rest_gain_safe, self.rest_gain_unsafe), 0.0)
+        out[:, 3] = np.maximum(curiosity * np.where(threat < 0.2, self.explore_gain_safe, self.explore_gain_unsafe), 0.0)
+        out[:, 4] = np.maximum(self.think_base * (1.0 - threat), 0.05)
+        return out
+
+    def decide_batch(self, drives: Dict[str, Any], food_available: Any = False) -> tuple[list[str], np.ndarray]:
+        """Chosen action per row (ties resolve in ACTIONS order, like decide) and the score matrix."""
+        scores = self.score_batch(drives, food_available)
+        return [ACTIONS[i] for i in scores.argmax(axis=1)], scores
+
+    def decide(self, drives: Dict[str, float], affordances: Dict[str, Any], scores: Dict[str, float] | None = None) -> tuple[str, float, str, Dict[str, Any]]:
+        """Pick the top-scoring action; pass `scores` to reuse an earlier score() call."""
+        if scores is None:
+            scores = self.score(drives, affordances)
         action = max(scores, key=scores.get)
         reason = self._reason_for(action, drives, affordances)
         return action, scores[action], reason, {}
@@ -1,72 +1,164 @@
 from __future__ import annotations
 import math, random
-from collections import defaultdict
-from typing import Dict, Iterable, Tuple
+import numpy as np
+from typing import Any, Dict, Iterable, Tuple
+
+from .nav_field import NavField, tag_affordance_codes
 
 
 class Policy:
     """Emergent navigation policy via learned tag values and drive-affordances.
 
-    - tag_weights[tag]: learned value (attraction>0 / repulsion<0)
+    - weight(tag): learned value (attraction>0 / repulsion<0)
     - nav_vector(objects, drives): continuous potential-field sum with curiosity noise
+    - nav_vector_field(field, x, y, drives): same field, vectorized over a NavField
     - update(objects, reward): simple online update for all visible tags
+
+    Weights decay lazily: each tag stores a value normalized by a global decay
+    scale (effective = stored * scale), so an update touches only the visible
+    tags. Every `renorm_every` updates the scale is folded back into the stored
+    values and long-forgotten near-zero tags are dropped.
     """
 
-    def __init__(self) -> None:
-        self.tag_weights: Dict[str, float] = defaultdict(float)
+    def __init__(self, rng: random.Random | None = None) -> None:
+        # per-instance RNG so concurrent simulations stay reproducible
+        self.rng = rng or random.Random()
         self.lr: float = 0.05
         self.decay: float = 0.999
         self.sigma: float = 120.0  # spatial falloff (pixels)
+        self.renorm_every: int = 1000
+        self.prune_below: float = 1e-6
+        self._weights: Dict[str, float] = {}  # tag -> value / scale
+        self._seen: Dict[str, int] = {}  # tag -> last update step that touched it
+        self._scale: float = 1.0
+        self._step: int = 0
+
+    # --- learned weights ---
+    def weight(self, tag: str) -> float:
+        """Effective learned weight; unknown tags are 0.0 and are not inserted."""
+        u = self._weights.get(tag)
+        return 0.0 if u is None else u * self._scale
+
+    def set_weight(self, tag: str, value: float) -> None:
+        self._weights[tag] = float(value) / self._scale
+        self._seen[tag] = self._step
+
+    @property
+    def tag_weights(self) -> Dict[str, float]:
+        """Materialized copy of all effective weights (O(tags))."""
+        return {t: u * self._scale for t, u in self._weights.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "weights": self.tag_weights,
+            "lr": self.lr,
+            "decay": self.decay,
+            "sigma": self.sigma,
+            "step": self._step,
+        }
+
+    def restore(self, snap: Dict[str, Any]) -> None:
+        """Load a snapshot(); ValueError (and no change) if any value is malformed or out of range."""
+        try:
+            lr = float(snap.get("lr", self.lr))
+            decay = float(snap.get("decay", self.decay))
+            sigma = float(snap.get("sigma", self.sigma))
+            step = int(snap.get("step", 0))
+            raw = snap.get("weights") or {}
+            if not isinstance(raw, dict):
+                raise TypeError(f"weights must be an object, got {type(raw).__name__}")
+            weights = {str(t): float(v) for t, v in raw.items()}
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"invalid policy snapshot: {exc}") from None
+        if not math.isfinite(lr):
+            raise ValueError(f"lr must be finite, got {lr}")
+        if not 0.0 < decay <= 1.0:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+        if not (math.isfinite(sigma) and sigma > 0.0):
+            raise ValueError(f"sigma must be positive, got {sigma}")
+        bad = next((t for t, v in weights.items() if not math.isfinite(v)), None)
+        if bad is not None:
+            raise ValueError(f"weight for {bad!r} must be finite, got {weights[bad]}")
+        # everything parsed: only now change state
+        self.lr, self.decay, self.sigma = lr, decay, sigma
+        self._step = step
+        self._scale = 1.0
+        self._weights = weights
+        self._seen = {t: self._step for t in self._weights}
+
+    def export_state(self) -> Dict[str, Any]:
+        """Exact internal state (lazy scale included) for checkpoints; snapshot() is the portable form."""
+        return {**self.snapshot(), "raw": dict(self._weights), "seen": dict(self._seen), "scale": self._scale, "rng": self.rng.getstate()}
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        self.restore(state)
+        self._weights = dict(state["raw"])
+        self._seen = dict(state["seen"])
+        self._scale = float(state["scale"])
+        self.rng.setstate(state["rng"])
 
     def nav_vector(self, objects: Iterable[dict], drives: Dict[str, float]) -> Tuple[float, float]:
+        # (x,y) are relative coordinates: caller subtracts agent position beforehand
+        return self.nav_vector_at(objects, 0.0, 0.0, drives)
+
+    def nav_vector_at(self, objects: Iterable[dict], ax: float, ay: float, drives: Dict[str, float]) -> Tuple[float, float]:
+        """nav_vector for objects in absolute coordinates seen from (ax, ay)."""
         hunger = float(drives.get("hunger", 0.0) or 0.0)
         threat = float(drives.get("threat", 0.0) or 0.0)
         curiosity = float(drives.get("curiosity", 0.0) or 0.0)
 
-        # base affordance by tag modulated by drives (no discrete triggers)
-        def base_affordance(tag: str) -> float:
-            t = (tag or "").lower()
-            val = 0.0
-            if "food" in t:
-                val += 1.2 * hunger
-            if "hazard" in t or "danger" in t:
-                val -= 1.3 * threat
-            # unknown objects feed curiosity
-            if not t or t.startswith("obj"):
-                val += 0.8 * curiosity
-            return val
-
         vx, vy = 0.0, 0.0
         for o in objects:
             tag = str(o.get("tag", ""))
-            w = self.tag_weights[tag] + base_affordance(tag)
-            x, y = float(o.get("x", 0.0)), float(o.get("y", 0.0))
-            # caller provides agent position; we'll add later as relative vector
-            # here we assume caller subtracts agent position beforehand
-            # For convenience, allow absolute coordinates by passing agent (0,0)
-            # We treat (x,y) here as relative coordinates.
+            # base affordance by tag modulated by drives (no discrete triggers)
+            food, hazard, unknown = tag_affordance_codes(tag)
+            w = self.weight(tag) + food * hunger + hazard * threat + unknown * curiosity
+            x, y = float(o.get("x", 0.0)) - ax, float(o.get("y", 0.0)) - ay
             dist = math.hypot(x, y) + 1e-6
             fall = math.exp(-dist / self.sigma)
             ux, uy = x / dist, y / dist
             vx += w * fall * ux
             vy += w * fall * uy
 
+        return self._explore_noise(vx, vy, curiosity)
+
+    def nav_vector_field(self, field: NavField, x: float, y: float, drives: Dict[str, float]) -> Tuple[float, float]:
+        """Vectorized nav_vector over a NavField of absolute positions, seen from (x, y)."""
+        # learned + affordance weight per unique tag, then one NumPy pass over nearby objects
+        learned = np.fromiter((self.weight(t) for t in field.tags), dtype=np.float64, count=len(field.tags))
+        vx, vy = field.field(x, y, learned + field.affordances(drives))
+        return self._explore_noise(vx, vy, float(drives.get("curiosity", 0.0) or 0.0))
+
+    def _explore_noise(self, vx: float, vy: float, curiosity: float) -> Tuple[float, float]:
         # curiosity-driven exploration noise (zero-mean)
         if curiosity > 0.05:
             amp = 0.4 * curiosity
-            vx += (random.random() - 0.5) * amp
-            vy += (random.random() - 0.5) * amp
-
+            vx += (self.rng.random() - 0.5) * amp
+            vy += (self.rng.random() - 0.5) * amp
         return vx, vy
 
     def update(self, objects: Iterable[dict], reward: float) -> None:
-        # decay weights slightly
-        for k in list(self.tag_weights.keys()):
-            self.tag_weights[k] *= self.decay
+        # decay every weight slightly: O(1) via the global scale
+        self._scale *= self.decay
+        self._step += 1
         # distribute reward to visible tags
         tags = {str(o.get("tag", "")) for o in objects}
         for tag in tags:
-            self.tag_weights[tag] += self.lr * reward
             # clamp softly
-            self.tag_weights[tag] = max(-2.5, min(2.5, self.tag_weights[tag]))
+            w = max(-2.5, min(2.5, self.weight(tag) + self.lr * reward))
+            self._weights[tag] = w / self._scale
+            self._seen[tag] = self._step
+        if self._step % self.renorm_every == 0 or self._scale < 1e-100:
+            self.renormalize()
 
+    def renormalize(self) -> None:
+        """Fold the global scale into stored weights and drop negligible, stale tags."""
+        scale, horizon = self._scale, self._step - self.renorm_every
+        weights: Dict[str, float] = {}
+        for tag, u in self._weights.items():
+            w = u * scale
+            if abs(w) >= self.prune_below or self._seen.get(tag, 0) > horizon:
+                weights[tag] = w
+        self._seen = {t: self._seen.get(t, self._step) for t in weights}
+        self._weights = weights
+        self._scale = 1.0
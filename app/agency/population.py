@@ -0,0 +1,153 @@
+from __future__ import annotations
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from app.physio.heart_bank import HeartBank
+from .drives import DriveGains
+from .needs_planner import ACTIONS
+
+MOOD_LABELS = ("neutral", "anxious", "excited", "sad", "calm", "alert", "curious")
+
+
+def _signal(value: Any, n: int, dtype=float) -> np.ndarray | None:
+    """Broadcast a scalar/array signal to the population; None stays None."""
+    if value is None:
+        return None
+    arr = np.asarray(value, dtype=dtype)
+    return np.broadcast_to(arr, (n,))
+
+
+class Population:
+    """Struct-of-arrays drives/affect engine for many agents at once.
+
+    Mirrors DrivesModel.update, the DrivesModel action effects,
+    Agency._update_mood_and_appetite and (through a HeartBank) the heart
+    update as vectorized NumPy operations; each field is one float64 array
+    of length n.
+    """
+
+    def __init__(self, n: int, gains: DriveGains | None = None) -> None:
+        self.n = int(n)
+        self.gains = gains or DriveGains()
+        self.hunger = np.full(self.n, 0.2)
+        self.fatigue = np.full(self.n, 0.2)
+        self.curiosity = np.full(self.n, 0.5)
+        self.threat = np.zeros(self.n)
+        self.satiety = np.full(self.n, 0.6)
+        self.energy = np.full(self.n, 0.7)
+        self.appetite = np.zeros(self.n)
+        self.valence = np.zeros(self.n)
+        self.arousal = np.zeros(self.n)
+        self.mood = np.zeros(self.n, dtype=np.int8)  # index into MOOD_LABELS
+        self.heart = HeartBank(self.n)
+
+    def as_dict(self, i: int) -> Dict[str, Any]:
+        return {
+            "hunger": float(self.hunger[i]),
+            "fatigue": float(self.fatigue[i]),
+            "curiosity": float(self.curiosity[i]),
+            "threat": float(self.threat[i]),
+            "satiety": float(self.satiety[i]),
+            "energy": float(self.energy[i]),
+            "appetite": float(self.appetite[i]),
+            "valence": float(self.valence[i]),
+            "arousal": float(self.arousal[i]),
+            "mood": MOOD_LABELS[int(self.mood[i])],
+        }
+
+    def clamp(self) -> None:
+        for arr in (self.hunger, self.fatigue, self.curiosity, self.threat):
+            np.clip(arr, 0.0, 1.0, out=arr)
+
+    # --- Agency.sense / DrivesModel.update ---
+    def sense(self, threat: Any = None, stimulation: Any = None) -> None:
+        th = _signal(threat, self.n)
+        if th is not None:
+            np.maximum(self.threat, th, out=self.threat)
+        stim = _signal(stimulation, self.n, bool)
+        if stim is not None:
+            self.curiosity[:] = np.where(stim, np.minimum(1.0, self.curiosity + 0.05), self.curiosity)
+
+    def update(self, minutes: Any, signals: Dict[str, Any] | None = None) -> None:
+        signals = signals or {}
+        g = self.gains
+        m = _signal(minutes, self.n)
+        self.hunger += g.hunger_gain_per_min * m
+        self.fatigue += g.fatigue_gain_per_min * m
+        self.curiosity -= g.curiosity_decay_per_min * m
+        self.threat -= g.threat_decay_per_min * m
+
+        # External signals influence
+        stim = _signal(signals.get("stimulation"), self.n, bool)
+        if stim is not None:
+            self.curiosity[:] = np.where(stim, np.minimum(1.0, self.curiosity + 0.1), self.curiosity)
+        th = _signal(signals.get("threat"), self.n)
+        if th is not None:
+            np.maximum(self.threat, th, out=self.threat)
+        rest = _signal(signals.get("rest"), self.n, bool)
+        if rest is not None:
+            self.fatigue[:] = np.where(rest, np.maximum(0.0, self.fatigue - 0.2), self.fatigue)
+
+        self.clamp()
+
+    def step(self, minutes: Any, signals: Dict[str, Any] | None = None) -> np.ndarray:
+        """Vectorized Agency.step; returns the per-agent heart beat counts."""
+        signals = signals or {}
+        self.update(minutes, signals)
+        self._sync_homeostasis()
+        # heart responds to arousal/activity
+        rest = signals.get("rest")
+        _, beats = self.heart.update(
+            np.multiply(minutes, 60.0),
+            arousal=self.arousal,
+            activity=0.0 if signals.get("activity") is None else signals["activity"],
+            rest=False if rest is None else rest,
+        )
+        return beats
+
+    # --- action effects ---
+    def enact(self, actions: Sequence[str] | np.ndarray) -> None:
+        """Apply per-agent actions (names or ACTIONS indices), then sync like Agency.enact."""
+        codes = np.asarray(actions)
+        if codes.dtype.kind in "USO":
+            names, inverse = np.unique(codes, return_inverse=True)
+            lut = np.array([ACTIONS.index(str(a)) if str(a) in ACTIONS else -1 for a in names])
+            codes = lut[inverse]
+        eat, rest = codes == ACTIONS.index("eat"), codes == ACTIONS.index("rest")
+        explore, safety = codes == ACTIONS.index("explore"), codes == ACTIONS.index("seek_safety")
+        self.hunger[eat] = np.maximum(0.0, self.hunger[eat] - 0.5)
+        self.curiosity[eat] = np.minimum(1.0, self.curiosity[eat] + 0.05)
+        self.fatigue[rest] = np.maximum(0.0, self.fatigue[rest] - 0.5)
+        self.threat[rest] = np.maximum(0.0, self.threat[rest] - 0.1)
+        self.curiosity[explore] = np.minimum(1.0, self.curiosity[explore] + 0.2)
+        self.fatigue[explore] = np.minimum(1.0, self.fatigue[explore] + 0.05)
+        self.threat[safety] = np.maximum(0.0, self.threat[safety] - 0.5)
+        self.step(0.0)
+
+    # --- internals ---
+    def _sync_homeostasis(self) -> None:
+        np.clip(1.0 - self.hunger, 0.0, 1.0, out=self.satiety)
+        np.clip(1.0 - self.fatigue, 0.0, 1.0, out=self.energy)
+        self._update_mood_and_appetite()
+
+    def _update_mood_and_appetite(self) -> None:
+        # appetite tracks hunger but is suppressed by high threat
+        np.maximum(0.0, self.hunger * (1.0 - 0.5 * self.threat), out=self.appetite)
+        valence = (self.satiety - self.threat) + 0.2 * (self.curiosity - self.fatigue)
+        np.clip(valence, -1.0, 1.0, out=self.valence)
+        np.clip(0.5 * self.threat + 0.4 * self.curiosity + 0.1, 0.0, 1.0, out=self.arousal)
+        v, a = self.valence, self.arousal
+        # same precedence as Agency._label_from
+        self.mood[:] = np.select(
+            [
+                (a > 0.7) & (v < -0.2),
+                (a > 0.6) & (v > 0.3),
+                (v < -0.3) & (a < 0.5),
+                (v > 0.4) & (a < 0.5),
+                (a > 0.6) & (np.abs(v) < 0.2),
+                (v > 0.1) & (a > 0.4),
+            ],
+            [1, 2, 3, 4, 5, 6],
+            default=0,
+        )
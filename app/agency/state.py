@@ -0,0 +1,65 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+
+from models.types import AgencyState
+
+
+class DrivesState:
+    __slots__ = ("hunger", "fatigue", "curiosity", "threat")
+
+    def __init__(self, hunger: float = 0.2, fatigue: float = 0.2, curiosity: float = 0.5, threat: float = 0.0) -> None:
+        self.hunger = hunger
+        self.fatigue = fatigue
+        self.curiosity = curiosity
+        self.threat = threat
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"hunger": self.hunger, "fatigue": self.fatigue, "curiosity": self.curiosity, "threat": self.threat}
+
+
+class MoodState:
+    __slots__ = ("label", "valence", "arousal")
+
+    def __init__(self, label: str = "neutral", valence: float = 0.0, arousal: float = 0.0) -> None:
+        self.label = label
+        self.valence = valence
+        self.arousal = arousal
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"label": self.label, "valence": self.valence, "arousal": self.arousal}
+
+
+class AgentState:
+    """Hot-path mirror of models.types.AgencyState as plain __slots__ objects.
+
+    Agency mutates this on every step; as_dict() yields the same JSON shape as
+    AgencyState.model_dump(mode="json") and to_model() builds the pydantic
+    model when validation is actually wanted.
+    """
+
+    __slots__ = ("energy", "satiety", "drives", "context", "mood", "appetite", "weights", "last_thoughts")
+
+    def __init__(self) -> None:
+        self.energy = 0.7
+        self.satiety = 0.6
+        self.drives = DrivesState()
+        self.context: Dict[str, Any] = {}
+        self.mood = MoodState()
+        self.appetite = 0.0
+        self.weights: Dict[str, float] = {}
+        self.last_thoughts: List[str] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "energy": self.energy,
+            "satiety": self.satiety,
+            "drives": self.drives.as_dict(),
+            "context": dict(self.context),
+            "mood": self.mood.as_dict(),
+            "appetite": self.appetite,
+            "weights": dict(self.weights),
+            "last_thoughts": list(self.last_thoughts),
+        }
+
+    def to_model(self) -> AgencyState:
+        return AgencyState.model_validate(self.as_dict())
@@ -0,0 +1,72 @@
+from __future__ import annotations
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+# A thought is a (kind, fields) record; text is only produced by render().
+Thought = Tuple[str, Tuple[Any, ...]]
+
+
+def _decision_lines(f: Tuple[Any, ...]) -> List[str]:
+    hunger, fatigue, curiosity, threat, mood, valence, arousal, appetite, bpm, hrv, weights, action, priority, reason = f
+    return [
+        f"Assessing drives: hunger={hunger:.2f}, fatigue={fatigue:.2f}, curiosity={curiosity:.2f}, threat={threat:.2f}",
+        f"Mood: {mood} (valence={valence:.2f}, arousal={arousal:.2f})",
+        f"Appetite score: {appetite:.2f}",
+        f"Heart: {bpm:.1f} bpm (hrv={hrv:.2f})",
+        f"Action weights: " + ", ".join(f"{k}={v:.2f}" for k, v in sorted(weights.items(), key=lambda kv: -kv[1])),
+        f"Chosen: {action} (priority={priority:.2f}) because {reason}",
+    ]
+
+
+def _vision_lines(f: Tuple[Any, ...]) -> List[str]:
+    n, labels = f
+    return [f"Vision: {n} object(s) in view -> {', '.join(str(x) for x in labels)}"]
+
+
+RENDERERS = {"decision": _decision_lines, "vision": _vision_lines}
+
+
+class ThoughtLog:
+    """Bounded ring buffer of structured thought records.
+
+    Producers push plain tuples; text is rendered newest-first on demand and
+    cached per version, so formatting only happens when a client reads it.
+    """
+
+    def __init__(self, maxlen: int = 8, max_lines: int = 6) -> None:
+        self._records: deque[Thought] = deque(maxlen=maxlen)
+        self.max_lines = max_lines
+        self.version = 0
+        self._cache: Tuple[int, List[str]] = (-1, [])
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def push(self, kind: str, *fields: Any) -> None:
+        self._records.append((kind, fields))
+        self.version += 1
+
+    def export_state(self) -> List[Thought]:
+        """Raw records, oldest first, for checkpoints."""
+        return list(self._records)
+
+    def import_state(self, records: List[Thought]) -> None:
+        self._records.clear()
+        for kind, fields in records:
+            self.push(kind, *fields)
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [{"kind": k, "fields": list(f)} for k, f in self._records]
+
+    def render(self) -> List[str]:
+        version, lines = self._cache
+        if version == self.version:
+            return lines
+        lines = []
+        for kind, fields in reversed(self._records):
+            lines.extend(RENDERERS[kind](fields))
+            if len(lines) >= self.max_lines:
+                break
+        lines = lines[: self.max_lines]
+        self._cache = (self.version, lines)
+        return lines
@@ -1,10 +1,10 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Dict, Any
 import math
 
 
-@dataclass
+@dataclass(slots=True)
 class BodyState:
     # 2D world state (top-down)
     x: float = 250.0
@@ -24,10 +24,16 @@ class Body:
         self.room_w = width
         self.room_h = height
         self._activity: float = 0.0  # 0..1 estimate of recent movement
+        # bumped whenever the pose changes; keys the cached to_dict()
+        self.version = 0
+        self._dict: tuple[int, Dict[str, Any]] = (-1, {})
 
     def to_dict(self) -> Dict[str, Any]:
+        version, data = self._dict
+        if version == self.version:
+            return data
         s = self.state
-        return {
+        data = {
             "x": s.x,
             "y": s.y,
             "yaw": s.yaw,
@@ -36,15 +42,20 @@ class Body:
             "right_hand": s.right_hand,
             "room": {"w": self.room_w, "h": self.room_h},
         }
+        self._dict = (self.version, data)
+        return data
 
     def reset(self) -> None:
         self.state = BodyState()
+        self.version += 1
 
     def turn(self, delta: float) -> None:
         self.state.yaw = (self.state.yaw + delta) % (2 * math.pi)
+        self.version += 1
 
     def look(self, delta: float) -> None:
         self.state.head_yaw = max(-math.pi/2, min(math.pi/2, self.state.head_yaw + delta))
+        self.version += 1
 
     def move(self, forward: float, sideways: float = 0.0, dt: float = 0.2) -> None:
         # forward/sideways in [-1,1]; dt seconds
@@ -56,6 +67,7 @@ class Body:
         new_y = max(10, min(self.room_h - 10, s.y + dy))
         dist = math.hypot(new_x - s.x, new_y - s.y)
         s.x, s.y = new_x, new_y
+        self.version += 1
         # instant normalized speed relative to max speed
         inst = 0.0 if dt <= 0 else min(1.0, (dist / dt) / max(1e-3, s.speed))
         # EMA for activity
@@ -66,6 +78,7 @@ class Body:
             self.state.left_hand = max(0.0, min(1.0, float(left)))
         if right is not None:
             self.state.right_hand = max(0.0, min(1.0, float(right)))
+        self.version += 1
 
     def tick(self, dt: float) -> None:
         # natural decay of activity in absence of movement
@@ -74,3 +87,12 @@ class Body:
 
     def activity(self) -> float:
         return max(0.0, min(1.0, self._activity))
+
+    def export_state(self) -> Dict[str, Any]:
+        """Pose plus the unclamped activity estimate, for checkpoints."""
+        return {"state": asdict(self.state), "activity": self._activity}
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        self.state = BodyState(**state["state"])
+        self._activity = float(state["activity"])
+        self.version += 1
@@ -0,0 +1,148 @@
+from __future__ import annotations
+import math
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+
+WALL_MARGIN = 10.0  # same wall clearance as Body.move
+
+# forward half of the 3x3 neighbourhood: each unordered cell pair is visited once
+_HALF = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+_FULL = tuple((i, j) for i in (-1, 0, 1) for j in (-1, 0, 1))
+
+
+class BodyBank:
+    """Many 2D bodies stepped together: Body kinematics plus collision avoidance.
+
+    Poses, speeds and the activity estimate are float arrays. move() applies
+    Body.move to every body at once, then separates overlapping bodies and pushes
+    bodies out of static circular obstacles. Candidate pairs come from a uniform
+    grid broadphase (cell = collision reach), so cost grows with the number of
+    bodies, not their square.
+    """
+
+    def __init__(self, n: int, width: float = 500.0, height: float = 360.0, radius: float = 6.0, seed: int | None = 0) -> None:
+        self.n = int(n)
+        self.room_w = float(width)
+        self.room_h = float(height)
+        self.radius = float(radius)
+        rng = np.random.default_rng(seed)
+        self.x = rng.uniform(WALL_MARGIN, self.room_w - WALL_MARGIN, self.n)
+        self.y = rng.uniform(WALL_MARGIN, self.room_h - WALL_MARGIN, self.n)
+        self.yaw = np.zeros(self.n)
+        self.speed = np.full(self.n, 60.0)  # px per second
+        self.activity = np.zeros(self.n)  # 0..1, like Body._activity
+        self.set_obstacles(())
+        self.last_pairs = 0
+
+    def set_obstacles(self, objects: Sequence[dict], radius: float = 12.0) -> None:
+        """Static circular obstacles ({x, y[, r]}) that bodies cannot enter."""
+        self.ox = np.array([float(o.get("x", 0.0)) for o in objects])
+        self.oy = np.array([float(o.get("y", 0.0)) for o in objects])
+        self.orad = np.array([float(o.get("r", radius)) for o in objects])
+
+    # --- Body API, vectorized ---
+    def turn(self, delta: Any) -> None:
+        self.yaw = (self.yaw + delta) % (2 * math.pi)
+
+    def tick(self, dt: float) -> None:
+        # natural decay of activity in absence of movement
+        self.activity *= math.exp(-0.8 * max(0.0, dt))
+
+    def move(self, forward: Any, sideways: Any = 0.0, dt: float = 0.2, iterations: int = 1) -> None:
+        """Body.move for all bodies, then `iterations` rounds of collision resolution."""
+        x0, y0 = self.x.copy(), self.y.copy()
+        step = self.speed * dt
+        c, s = np.cos(self.yaw), np.sin(self.yaw)
+        self.x = x0 + (c * forward - s * sideways) * step
+        self.y = y0 + (s * forward + c * sideways) * step
+        self._clamp()
+        for _ in range(max(0, int(iterations))):
+            self._separate_bodies()
+            self._push_out_of_obstacles()
+            self._clamp()
+        dist = np.hypot(self.x - x0, self.y - y0)
+        inst = np.zeros(self.n) if dt <= 0 else np.minimum(1.0, (dist / dt) / np.maximum(1e-3, self.speed))
+        # EMA for activity
+        np.maximum(inst, self.activity * 0.7 + inst * 0.3, out=self.activity)
+
+    # --- internals ---
+    def _clamp(self) -> None:
+        np.clip(self.x, WALL_MARGIN, self.room_w - WALL_MARGIN, out=self.x)
+        np.clip(self.y, WALL_MARGIN, self.room_h - WALL_MARGIN, out=self.y)
+
+    def _separate_bodies(self) -> None:
+        reach = 2.0 * self.radius
+        i, j = _grid_pairs(self.x, self.y, self.x, self.y, reach, _HALF, same=True)
+        dx, dy = self.x[i] - self.x[j], self.y[i] - self.y[j]
+        d = np.hypot(dx, dy)
+        hit = d < reach
+        i, j, dx, dy, d = i[hit], j[hit], dx[hit], dy[hit], d[hit]
+        self.last_pairs = len(i)
+        if not len(i):
+            return
+        # coincident bodies separate along x
+        zero = d < 1e-9
+        dx, d = np.where(zero, 1.0, dx), np.where(zero, 1.0, d)
+        push = 0.5 * (reach - d) / d
+        px, py = dx * push, dy * push
+        self.x += np.bincount(i, px, self.n) - np.bincount(j, px, self.n)
+        self.y += np.bincount(i, py, self.n) - np.bincount(j, py, self.n)
+
+    def _push_out_of_obstacles(self) -> None:
+        if not len(self.ox):
+            return
+        reach = self.radius + float(self.orad.max())
+        b, o = _grid_pairs(self.x, self.y, self.ox, self.oy, reach, _FULL, same=False)
+        dx, dy = self.x[b] - self.ox[o], self.y[b] - self.oy[o]
+        d = np.hypot(dx, dy)
+        need = self.radius + self.orad[o]
+        hit = d < need
+        b, dx, dy, d, need = b[hit], dx[hit], dy[hit], d[hit], need[hit]
+        if not len(b):
+            return
+        zero = d < 1e-9
+        dx, d = np.where(zero, 1.0, dx), np.where(zero, 1.0, d)
+        push = (need - d) / d
+        self.x += np.bincount(b, dx * push, self.n)
+        self.y += np.bincount(b, dy * push, self.n)
+
+
+def _grid_pairs(qx: np.ndarray, qy: np.ndarray, tx: np.ndarray, ty: np.ndarray, cell: float, offsets, same: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate (query, target) index pairs whose grid cells are neighbours.
+
+    Targets are sorted by cell key once; for each neighbour offset every query
+    looks up its cell's [start, end) range and the ragged ranges are expanded
+    with a cumsum, all in NumPy. With `same=True` (queries == targets, half
+    offsets) each unordered pair appears exactly once.
+    """
+    tix, tiy = np.floor(tx / cell).astype(np.int64), np.floor(ty / cell).astype(np.int64)
+    qix, qiy = np.floor(qx / cell).astype(np.int64), np.floor(qy / cell).astype(np.int64)
+    lo_y = min(int(tiy.min(initial=0)), int(qiy.min(initial=0))) - 1
+    rows = max(int(tiy.max(initial=0)), int(qiy.max(initial=0))) - lo_y + 2  # column stride with guard rows
+    tkey = tix * rows + (tiy - lo_y)
+    order = np.argsort(tkey, kind="stable")
+    skey = tkey[order]
+    qkey = qix * rows + (qiy - lo_y)
+    out_q, out_t = [], []
+    for dx, dy in offsets:
+        k = qkey + dx * rows + dy
+        start = np.searchsorted(skey, k, "left")
+        end = np.searchsorted(skey, k, "right")
+        counts = end - start
+        total = int(counts.sum())
+        if not total:
+            continue
+        q = np.repeat(np.arange(len(qkey)), counts)
+        # position within each query's range: 0..count-1
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = order[np.repeat(start, counts) + within]
+        if same and dx == 0 and dy == 0:
+            keep = t > q
+            q, t = q[keep], t[keep]
+        out_q.append(q)
+        out_t.append(t)
+    if not out_q:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(out_q), np.concatenate(out_t)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import pickle
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("smartcore.checkpoint")
+
+MAGIC = b"ADAMCKPT"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHI")  # magic, format version, crc32 of the payload
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpoint file is missing, truncated or from another format."""
+
+
+def dumps(states: Dict[str, Dict[str, Any]]) -> bytes:
+    payload = zlib.compress(pickle.dumps(states, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, zlib.crc32(payload)) + payload
+
+
+def loads(data: bytes) -> Dict[str, Dict[str, Any]]:
+    if len(data) < _HEADER.size:
+        raise CheckpointError("checkpoint truncated")
+    magic, version, crc = _HEADER.unpack_from(data)
+    payload = data[_HEADER.size:]
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise CheckpointError(f"not a v{FORMAT_VERSION} checkpoint")
+    if zlib.crc32(payload) != crc:
+        raise CheckpointError("checkpoint checksum mismatch")
+    # only files written by this server are loaded (never client uploads)
+    return pickle.loads(zlib.decompress(payload))
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write to a temp file, fsync, then rename over the target."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Checkpointer:
+    """Saves and restores every hosted world through a host's export/restore API.
+
+    Exporting world state is a quick in-loop copy; pickling, compression and
+    the file write run in a worker thread so the simulation loop keeps its pace.
+    With `interval > 0`, start() also saves periodically in the background.
+    """
+
+    def __init__(self, path: str | Path, interval: float = 0.0) -> None:
+        self.path = Path(path)
+        self.interval = float(interval)
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.last: Dict[str, Any] = {}
+
+    async def save(self, host) -> Dict[str, Any]:
+        async with self._lock:
+            t0 = time.perf_counter()
+            states = await host.export_states()
+            t1 = time.perf_counter()
+            size = await asyncio.to_thread(self._write, states)
+            t2 = time.perf_counter()
+            self.last = {
+                "op": "save",
+                "worlds": len(states),
+                "bytes": size,
+                "export_ms": (t1 - t0) * 1e3,
+                "write_ms": (t2 - t1) * 1e3,
+                "at": time.time(),
+            }
+            return self.last
+
+    async def restore(self, host) -> Dict[str, Any]:
+        # under the save lock: a periodic save must not interleave with a restore
+        async with self._lock:
+            t0 = time.perf_counter()
+            try:
+                data = await asyncio.to_thread(self.path.read_bytes)
+            except FileNotFoundError:
+                raise CheckpointError(f"no checkpoint at {self.path}") from None
+            states = loads(data)
+            restored = await host.restore_states(states)
+            self.last = {"op": "restore", "worlds": restored, "bytes": len(data), "restore_ms": (time.perf_counter() - t0) * 1e3, "at": time.time()}
+            return self.last
+
+    def start(self, host) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(host))
+
+    def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def _write(self, states: Dict[str, Dict[str, Any]]) -> int:
+        data = dumps(states)
+        write_atomic(self.path, data)
+        return len(data)
+
+    async def _run(self, host) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save(host)
+            except Exception:
+                logger.exception("checkpoint_failed")
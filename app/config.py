@@ -11,7 +11,24 @@ class Settings(BaseSettings):
     memory_path: str = Field(default="data/memory.json", alias="MEMORY_PATH")
     enable_think_loop: bool = Field(default=True, alias="ENABLE_THINK_LOOP")
     think_interval_seconds: float = Field(default=7.0, alias="THINK_INTERVAL_SECONDS")
+    think_max_interval_seconds: float = Field(default=120.0, alias="THINK_MAX_INTERVAL_SECONDS")
+    think_backoff: float = Field(default=2.0, alias="THINK_BACKOFF")
+    think_jitter: float = Field(default=0.1, alias="THINK_JITTER")
+    think_busy_rps: float = Field(default=5.0, alias="THINK_BUSY_RPS")
     active_models: List[str] = Field(default_factory=lambda: ["gpt", "deepseek", "gemini", "copilot"], alias="ACTIVE_MODELS")
+    sim_hz: float = Field(default=20.0, alias="SIM_HZ")
+    sim_max_catchup_steps: int = Field(default=5, alias="SIM_MAX_CATCHUP_STEPS")
+    sim_headless: bool = Field(default=False, alias="SIM_HEADLESS")
+    broadcast_hz: float = Field(default=1.0, alias="BROADCAST_HZ")
+    shard_workers: int = Field(default=0, alias="SHARD_WORKERS")
+    session_idle_seconds: float = Field(default=3600.0, alias="SESSION_IDLE_SECONDS")
+    max_sessions: int = Field(default=1000, alias="MAX_SESSIONS")
+    checkpoint_path: str = Field(default="", alias="CHECKPOINT_PATH")
+    checkpoint_interval_seconds: float = Field(default=60.0, alias="CHECKPOINT_INTERVAL_SECONDS")
+    event_log_dir: str = Field(default="", alias="EVENT_LOG_DIR")
+    telemetry_dir: str = Field(default="", alias="TELEMETRY_DIR")
+    trace_dir: str = Field(default="data/traces", alias="TRACE_DIR")
+    render_workers: int = Field(default=1, alias="RENDER_WORKERS")
     openai_api_key: Optional[str] = Field(default=None, alias="OPENAI_API_KEY")
 
     model_config = {
@@ -1,13 +1,14 @@
 from __future__ import annotations
 import asyncio
 import logging
-from typing import Optional
+from typing import Awaitable, Callable, Hashable, Optional
 
 from models.types import InputEvent, ResponsePacket
 
-from .config import get_settings
+from .config import Settings, get_settings
 from .memory import MemoryStore
 from .orchestrator import Orchestrator
+from .think_scheduler import ThinkScheduler
 
 logger = logging.getLogger("smartcore.core")
 
@@ -15,13 +16,22 @@ logger = logging.getLogger("smartcore.core")
 class SmartCore:
     """High-level interface for processing events via orchestrator."""
 
-    def __init__(self, memory_path: Optional[str] = None):
-        settings = get_settings()
+    def __init__(self, memory_path: Optional[str] = None, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
         path = memory_path or settings.memory_path
         self.memory = MemoryStore(path)
-        self.orchestrator = Orchestrator(memory=self.memory)
+        self.orchestrator = Orchestrator(memory=self.memory, settings=settings)
         self._think_task: Optional[asyncio.Task] = None
         self.settings = settings
+        self.scheduler = ThinkScheduler(
+            base_interval=max(settings.think_interval_seconds, 2.0),
+            max_interval=settings.think_max_interval_seconds,
+            backoff=settings.think_backoff,
+            jitter=settings.think_jitter,
+            busy_rps=settings.think_busy_rps,
+        )
+        # optional async callable returning a hashable fingerprint of agency state
+        self.state_probe: Optional[Callable[[], Awaitable[Hashable]]] = None
 
     async def process_event(self, event: InputEvent, context: Optional[dict] = None) -> ResponsePacket:
         logger.info("processing", extra={"event": event.model_dump()})
@@ -34,10 +44,26 @@ class SmartCore:
             if not self._think_task:
                 self._think_task = loop.create_task(self._think_loop())
 
+    def note_activity(self) -> None:
+        """Record user traffic; heavy traffic pauses the think loop."""
+        self.scheduler.note_activity()
+
+    def think_stats(self) -> dict:
+        return self.scheduler.stats()
+
     async def _think_loop(self) -> None:
-        interval = max(self.settings.think_interval_seconds, 2.0)
         while True:
-            await asyncio.sleep(interval)
+            await asyncio.sleep(self.scheduler.next_delay())
+            fingerprint = None
+            if self.state_probe is not None:
+                try:
+                    fingerprint = await self.state_probe()
+                except Exception:
+                    logger.warning("state_probe_failed", exc_info=True)
+            run, reason = self.scheduler.should_think(fingerprint)
+            if not run:
+                logger.debug("think_skipped", extra={"reason": reason})
+                continue
             synthetic = InputEvent(type="system", value="self-query", source="core")
             await self.process_event(synthetic)
 
@@ -0,0 +1,115 @@
+from __future__ import annotations
+import base64
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+# world commands that change state; everything else is a read
+MUTATING = frozenset({"tick", "step", "sense", "vision", "body_cmd", "policy_restore", "planner", "advance"})
+
+
+def safe_name(session: str) -> str:
+    """Session id usable as a file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", session)[:64] or "_"
+
+
+class EventLog:
+    """Append-only JSON-lines log of the commands applied to one World.
+
+    The first line is a header with the session, RNG seed and (for worlds
+    that did not start fresh) a base64 checkpoint of the starting state; each
+    following line is `{"seq", "t", "msg"}`. Fixed clock steps are not logged
+    one by one: their count rides along on the next entry as
+    `"clock": {"dt", "steps"}` (run before its msg), and close() writes any
+    left over as a clock-only entry. Writes are buffered and flushed at most
+    every `flush_every` seconds; the host also calls flush() on a timer so a
+    session that goes quiet still gets its tail on disk.
+    """
+
+    def __init__(self, path: str | Path, session: str, seed: int, base: Dict[str, Any] | None = None, flush_every: float = 1.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self.flush_every = flush_every
+        self._last_flush = time.monotonic()
+        self._clock: list | None = None  # [(dt, drives), steps] not yet written
+        self.seq = 0
+        header: Dict[str, Any] = {"type": "header", "session": session, "seed": seed, "created": time.time()}
+        if base is not None:
+            from .checkpoint import dumps
+
+            header["base"] = base64.b64encode(dumps({session: base})).decode("ascii")
+        self._write(header)
+
+    @classmethod
+    def for_session(cls, directory: str | Path, session: str, seed: int, base: Dict[str, Any] | None = None) -> "EventLog":
+        return cls(Path(directory) / f"{safe_name(session)}.{int(time.time() * 1000)}.jsonl", session, seed, base)
+
+    def record(self, msg: Dict[str, Any]) -> None:
+        self._entry(msg)
+
+    def advanced(self, dt: float, drives: bool = False) -> None:
+        """Count one clock step; it is written with the next entry."""
+        if self._clock is not None and self._clock[0] != (dt, drives):
+            self._entry(None)
+        if self._clock is None:
+            self._clock = [(dt, drives), 0]
+        self._clock[1] += 1
+
+    def flush(self) -> None:
+        if not self._f.closed:
+            self._f.flush()
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            if self._clock is not None:
+                self._entry(None)
+            self._f.close()
+
+    def _entry(self, msg: Dict[str, Any] | None) -> None:
+        self.seq += 1
+        entry: Dict[str, Any] = {"seq": self.seq, "t": time.time()}
+        if self._clock is not None:
+            (dt, drives), steps = self._clock
+            entry["clock"] = {"dt": dt, "steps": steps, "drives": True} if drives else {"dt": dt, "steps": steps}
+            self._clock = None
+        if msg is not None:
+            entry["msg"] = msg
+        self._write(entry)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_every:
+            self._f.flush()
+            self._last_flush = now
+
+
+def read_log(path: str | Path) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Header plus a lazy iterator over the events (a torn last line is ignored)."""
+    f = open(path, encoding="utf-8")
+    header = json.loads(f.readline())
+    if header.get("type") != "header":
+        f.close()
+        raise ValueError(f"{path} is not an event log")
+
+    def events() -> Iterator[Dict[str, Any]]:
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+    return header, events()
+
+
+def base_state(header: Dict[str, Any]) -> Dict[str, Any] | None:
+    if "base" not in header:
+        return None
+    from .checkpoint import loads
+
+    return loads(base64.b64decode(header["base"]))[header["session"]]
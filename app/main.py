@@ -1,62 +1,179 @@
 from __future__ import annotations
 import logging
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-import asyncio, json, time, math
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, RedirectResponse
+from pydantic import BaseModel, Field
+from starlette.requests import HTTPConnection
+import asyncio, json, time
 from pathlib import Path
-from collections import deque
+from typing import TYPE_CHECKING
 
 from models.types import InputEvent, ResponsePacket
-from .agency.agency import Agency
-from .body.body import Body
-from .agency.policy import Policy
 
-from .config import get_settings
-from .core import SmartCore
+from .config import Settings, get_settings
+from .sim_clock import SlipStats
 
-logging.basicConfig(level="INFO", format="%(asctime)s %(levelname)s %(name)s %(message)s")
-logger = logging.getLogger("smartcore.api")
-
-settings = get_settings()
-core = SmartCore()
-core.start()
-agency = Agency()
-body = Body()
-policy = Policy()
+if TYPE_CHECKING:  # heavy components are imported on first use
+    from .core import SmartCore
 
-app = FastAPI(title=settings.app_name)
+logger = logging.getLogger("smartcore.api")
 
 
-@app.post("/orchestrate", response_model=ResponsePacket)
-async def orchestrate(event: InputEvent):
+class Runtime:
+    """Server components, built lazily on first use and torn down on shutdown."""
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.manager = ConnectionManager()
+        self.broadcast_slip = SlipStats(1.0 / max(settings.broadcast_hz, 1e-3))
+        self._core: SmartCore | None = None
+        self._host = None
+        self.recorders: dict = {}  # session -> SessionRecorder
+        self._render_jobs = None
+        self.checkpointer = None
+        if settings.checkpoint_path:
+            from .checkpoint import Checkpointer
+
+            self.checkpointer = Checkpointer(settings.checkpoint_path, settings.checkpoint_interval_seconds)
+
+    @property
+    def core(self) -> SmartCore:
+        if self._core is None:
+            from .core import SmartCore
+
+            self._core = SmartCore(settings=self.settings)
+            self._core.state_probe = self._agency_fingerprint
+        return self._core
+
+    @property
+    def host(self):
+        # sessions live in-process, or hashed across SHARD_WORKERS processes
+        if self._host is None:
+            from .shards import create_host
+
+            s = self.settings
+            self._host = create_host(
+                s.shard_workers, s.sim_hz, s.sim_max_catchup_steps, s.sim_headless, s.event_log_dir, s.telemetry_dir,
+                s.session_idle_seconds, s.max_sessions,
+            )
+            self._host.start()
+        return self._host
+
+    @property
+    def render_jobs(self):
+        if self._render_jobs is None:
+            from .recorder import RenderJobs
+
+            self._render_jobs = RenderJobs(self.settings.trace_dir, self.settings.render_workers)
+        return self._render_jobs
+
+    def note_activity(self) -> None:
+        # no think loop until the core exists, so nothing to pace yet
+        if self._core is not None:
+            self._core.note_activity()
+
+    async def startup(self) -> None:
+        if self.checkpointer is not None:
+            if self.checkpointer.path.exists():
+                try:
+                    stats = await self.checkpointer.restore(self.host)
+                    logger.info("checkpoint_restored", extra=stats)
+                except Exception:
+                    # a checkpoint that cannot be loaded must not keep the server down
+                    logger.exception("checkpoint_restore_failed")
+            self.checkpointer.start(self.host)
+        if self.settings.enable_think_loop:
+            self.core.start()
+
+    async def shutdown(self) -> None:
+        if self._core is not None:
+            self._core.shutdown()
+        for recorder in list(self.recorders.values()):
+            await recorder.stop()
+        self.recorders.clear()
+        if self._render_jobs is not None:
+            self._render_jobs.close()
+            self._render_jobs = None
+        if self.checkpointer is not None:
+            self.checkpointer.close()
+            if self._host is not None:
+                await self.checkpointer.save(self._host)
+        if self._host is not None:
+            self._host.close()
+            self._host = None
+
+    async def _agency_fingerprint(self):
+        # quantized drives + mood of the default session: the think loop skips when unchanged
+        state = (await self.host.call("default", {"type": "agency_state"}))["data"]
+        d = state["drives"]
+        return (round(d["hunger"], 2), round(d["fatigue"], 2), round(d["curiosity"], 2), round(d["threat"], 2), state["mood"]["label"])
+
+
+def _rt(conn: HTTPConnection) -> Runtime:
+    return conn.app.state.runtime
+
+
+router = APIRouter()
+
+
+@router.post("/orchestrate", response_model=ResponsePacket)
+async def orchestrate(event: InputEvent, request: Request, session: str = "default"):
+    rt = _rt(request)
+    rt.note_activity()
     try:
-        ctx = {
-            "weights": agency.state.weights,
-            "mood": agency.state.mood.model_dump(),
-            "heart": agency.heart.to_dict(),
-        }
-        response = await core.process_event(event, context=ctx)
+        ctx = (await rt.host.call(session, {"type": "context"}))["data"]
+        response = await rt.core.process_event(event, context=ctx)
         return response
     except Exception as exc:  # pragma: no cover
         logger.exception("processing_failed")
         raise HTTPException(status_code=500, detail=str(exc))
 
 
-@app.get("/memory")
-async def memory(tag: str | None = None, limit: int = 5):
+@router.get("/memory")
+async def memory(request: Request, tag: str | None = None, limit: int = 5):
+    core = _rt(request).core
     entries = core.memory.query_by_tag(tag, limit) if tag else core.memory.load()[-limit:]
     return [entry.model_dump(mode="json") for entry in entries]
 
 
-@app.get("/health")
-async def health():
-    return {"status": "ok", "models": settings.active_models}
+@router.get("/health")
+async def health(request: Request):
+    return {"status": "ok", "models": _rt(request).settings.active_models}
+
+
+@router.get("/core/think_stats")
+async def think_stats(request: Request):
+    return _rt(request).core.think_stats()
+
+
+@router.get("/sim/stats")
+async def sim_stats(request: Request):
+    rt = _rt(request)
+    return {"simulation": await rt.host.stats(), "broadcast": rt.broadcast_slip.as_dict()}
 
 
-@app.get("/agency/state")
-async def agency_state():
-    return agency.state.model_dump(mode="json")
+@router.get("/agency/state")
+async def agency_state(request: Request, session: str = "default"):
+    rt = _rt(request)
+    rt.note_activity()
+    return (await rt.host.call(session, {"type": "agency_state"}))["data"]
+
+
+@router.get("/agency/policy")
+async def policy_snapshot(request: Request, session: str = "default"):
+    """Learned navigation tag weights, restorable via POST."""
+    return (await _rt(request).host.call(session, {"type": "policy"}))["data"]
+
+
+@router.post("/agency/policy")
+async def policy_restore(snapshot: dict, request: Request, session: str = "default"):
+    host = _rt(request).host
+    # as a batch, so a rejected snapshot comes back as an error entry from any host
+    reply = await host.call(session, {"type": "batch", "commands": [{"type": "policy_restore", "data": snapshot}], "no_reply": True})
+    if reply is not None and reply["errors"]:
+        raise HTTPException(status_code=422, detail=reply["errors"][0]["error"])
+    return (await host.call(session, {"type": "policy"}))["data"]
 
 
 class StepInput(InputEvent):
@@ -64,24 +181,179 @@ class StepInput(InputEvent):
     food_available: bool | None = False
     threat: float | None = None
     stimulation: bool | None = False
+    # optional [{"at": minute, "threat": .., "stimulation": ..}]: fast-forward in closed form
+    schedule: list[dict] | None = None
+
+
+@router.post("/agency/step")
+async def agency_step(evt: StepInput, request: Request, session: str = "default"):
+    rt = _rt(request)
+    rt.note_activity()
+    msg = {
+        "type": "step",
+        "minutes": evt.minutes,
+        "food_available": bool(evt.food_available),
+        "threat": evt.threat,
+        "stimulation": bool(evt.stimulation),
+        "schedule": evt.schedule,
+    }
+    return (await rt.host.call(session, msg))["data"]
 
 
-@app.post("/agency/step")
-async def agency_step(evt: StepInput):
-    # Perceive environment
-    signals = {"threat": evt.threat, "stimulation": evt.stimulation}
-    agency.sense(signals)
-    agency.step(max(0.0, float(evt.minutes or 0.0)), signals)
-    plan = agency.decide({"food_available": bool(evt.food_available)})
-    agency.enact(plan)
-    return {
-        "state": agency.state.model_dump(mode="json"),
-        "plan": plan.model_dump(),
-        "mood": agency.state.mood.model_dump(),
-        "appetite": agency.state.appetite,
-        "weights": agency.state.weights,
-        "thoughts": agency.state.last_thoughts,
-    }
+@router.get("/agency/planner")
+async def planner_stats(request: Request, session: str = "default"):
+    """Lookahead planner settings and stats (nodes/sec, cache hit rate); null when greedy."""
+    return (await _rt(request).host.call(session, {"type": "planner"}))["data"]
+
+
+@router.post("/agency/planner")
+async def planner_config(config: dict, request: Request, session: str = "default"):
+    """Configure lookahead, e.g. {"lookahead": {"depth": 4, "beam": 8, "budget_ms": 2}}; {"lookahead": null} disables."""
+    host = _rt(request).host
+    # as a batch, so invalid settings come back as an error entry from any host (see policy_restore)
+    cmd = {"type": "planner", "lookahead": config.get("lookahead")}
+    reply = await host.call(session, {"type": "batch", "commands": [cmd], "no_reply": True})
+    if reply is not None and reply["errors"]:
+        raise HTTPException(status_code=422, detail=reply["errors"][0]["error"])
+    return (await host.call(session, {"type": "planner"}))["data"]
+
+
+@router.get("/telemetry")
+async def telemetry_metrics(request: Request, session: str = "default"):
+    """Metrics recorded for a session."""
+    return await _telemetry(request, session, {"type": "telemetry"})
+
+
+@router.get("/telemetry/{metric}")
+async def telemetry_range(
+    metric: str,
+    request: Request,
+    session: str = "default",
+    start: float | None = None,
+    end: float | None = None,
+    max_points: int = Query(default=1000, ge=1, le=100000),
+):
+    """min/max/mean series for [start, end] (unix seconds; default: the last hour).
+
+    The finest resolution (raw 1 s, 1 min, 1 h) that covers the window in at
+    most `max_points` points is used.
+    """
+    msg = {"type": "telemetry", "metric": metric, "start": start, "end": end, "max_points": max_points}
+    return await _telemetry(request, session, msg)
+
+
+async def _telemetry(request: Request, session: str, msg: dict):
+    data = (await _rt(request).host.call(session, msg))["data"]
+    if data is None:
+        raise HTTPException(status_code=400, detail="telemetry disabled (set TELEMETRY_DIR)")
+    return data
+
+
+def _checkpointer(rt: Runtime):
+    if rt.checkpointer is None:
+        raise HTTPException(status_code=400, detail="checkpointing disabled (set CHECKPOINT_PATH)")
+    return rt.checkpointer
+
+
+@router.post("/admin/checkpoint")
+async def admin_checkpoint(request: Request):
+    """Write a checkpoint of every hosted world now."""
+    rt = _rt(request)
+    return await _checkpointer(rt).save(rt.host)
+
+
+@router.post("/admin/restore")
+async def admin_restore(request: Request):
+    """Replace hosted worlds with the last checkpoint on disk."""
+    from .checkpoint import CheckpointError
+    from .shards import ShardError
+
+    rt = _rt(request)
+    try:
+        return await _checkpointer(rt).restore(rt.host)
+    except CheckpointError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except (ValueError, ShardError) as exc:
+        # a world state in the file could not be rebuilt; hosted worlds are unchanged
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+@router.post("/record/start")
+async def record_start(request: Request, session: str = "default", fps: float = Query(default=10.0, gt=0, le=60)):
+    """Start sampling a session's world state into a trace under TRACE_DIR."""
+    rt = _rt(request)
+    rec = rt.recorders.get(session)
+    if rec is None:
+        from .recorder import SessionRecorder
+
+        rec = rt.recorders[session] = SessionRecorder(rt.host, session, rt.settings.trace_dir, fps)
+        rec.start()
+    return rec.info()
+
+
+@router.post("/record/stop")
+async def record_stop(request: Request, session: str = "default"):
+    """Stop recording; the returned trace name can be passed to /render."""
+    rec = _rt(request).recorders.pop(session, None)
+    if rec is None:
+        raise HTTPException(status_code=404, detail=f"session {session!r} is not being recorded")
+    return await rec.stop()
+
+
+class RenderInput(BaseModel):
+    # at least one non-dot, so "." and ".." cannot name the trace directory's parents
+    trace: str = Field(pattern=r"^[A-Za-z0-9_.-]*[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+    format: str = Field(default="mp4", pattern=r"^(mp4|gif)$")
+
+
+@router.post("/render")
+async def render_submit(body: RenderInput, request: Request):
+    """Queue a trace for rendering; poll GET /render/{job} for progress."""
+    jobs = _rt(request).render_jobs
+    try:
+        return await asyncio.to_thread(jobs.submit, body.trace, body.format)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+def _render_job(request: Request, job: str) -> dict:
+    info = _rt(request).render_jobs.status(job)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"unknown render job {job!r}")
+    return info
+
+
+@router.get("/render/{job}")
+async def render_status(job: str, request: Request):
+    return _render_job(request, job)
+
+
+@router.get("/render/{job}/file")
+async def render_file(job: str, request: Request):
+    info = _render_job(request, job)
+    if info["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"render job is {info['status']}")
+    path = _rt(request).render_jobs.directory / "renders" / info["file"]
+    return FileResponse(path, media_type="video/mp4" if info["format"] == "mp4" else "image/gif", filename=info["file"])
+
+
+class WhatIfScenario(BaseModel):
+    # drive overrides; unset ones keep the agent's current value
+    hunger: float | None = None
+    fatigue: float | None = None
+    curiosity: float | None = None
+    threat: float | None = None
+    food_available: bool = False
+
+
+class WhatIfInput(BaseModel):
+    scenarios: list[WhatIfScenario] = Field(default_factory=list, max_length=10000)
+
+
+@router.post("/agency/whatif")
+async def agency_whatif(body: WhatIfInput, request: Request, session: str = "default"):
+    """Which action the agent would pick under each hypothetical scenario (state unchanged)."""
+    return (await _rt(request).host.call(session, {"type": "whatif", "scenarios": [sc.model_dump(exclude_none=True) for sc in body.scenarios]}))["data"]
 
 
 # ---- WebSocket live feed ----
@@ -106,99 +378,30 @@ class ConnectionManager:
                 self.disconnect(ws)
 
 
-manager = ConnectionManager()
-LAST_OBJECTS: list[dict] = []
-PREV_DRIVES = {"hunger": 0.0, "threat": 0.0, "fatigue": 0.0}
-TS = {
-    "bpm": deque(maxlen=180),
-    "threat": deque(maxlen=180),
-    "hunger": deque(maxlen=180),
-}
-
-
-def _nearest(tag: str) -> tuple[dict | None, float]:
-    if not LAST_OBJECTS:
-        return (None, float("inf"))
-    bx, by = body.state.x, body.state.y
-    best, bd = None, float("inf")
-    for o in LAST_OBJECTS:
-        if str(o.get("tag")) != tag:
-            continue
-        dx, dy = float(o.get("x", 0)) - bx, float(o.get("y", 0)) - by
-        d = math.hypot(dx, dy)
-        if d < bd:
-            best, bd = o, d
-    return best, bd
-
-
-def _emergent_move():
-    # build relative object coordinates
-    rel = []
-    bx, by = body.state.x, body.state.y
-    for o in LAST_OBJECTS:
-        rel.append({"tag": o.get("tag"), "x": float(o.get("x", 0.0)) - bx, "y": float(o.get("y", 0.0)) - by})
-    drives = {
-        "hunger": agency.state.drives.hunger,
-        "threat": agency.state.drives.threat,
-        "curiosity": agency.state.drives.curiosity,
-    }
-    vx, vy = policy.nav_vector(rel, drives)
-    if vx == 0 and vy == 0:
-        return
-    target = math.atan2(vy, vx)
-    _turn_towards(target)
-    # speed scales with energy and nav magnitude
-    mag = min(1.0, math.hypot(vx, vy))
-    speed_scale = 0.5 + 0.5 * agency.state.energy
-    body.move(forward=mag * speed_scale, dt=0.25)
-
-
-def _turn_towards(target_angle: float):
-    # rotate body yaw toward target
-    yaw = body.state.yaw
-    diff = math.atan2(math.sin(target_angle - yaw), math.cos(target_angle - yaw))
-    step = max(-0.3, min(0.3, diff))
-    body.turn(step)
-
-
-def _snapshot() -> dict:
-    return {
-        "ts": time.time(),
-        "state": agency.state.model_dump(mode="json"),
-        "mood": agency.state.mood.model_dump(),
-        "appetite": agency.state.appetite,
-        "weights": agency.state.weights,
-        "thoughts": agency.state.last_thoughts,
-        "body": body.to_dict(),
-        "heart": agency.heart.to_dict(),
-        "objects": LAST_OBJECTS,
-        "timeseries": {
-            "bpm": list(TS["bpm"]),
-            "threat": list(TS["threat"]),
-            "hunger": list(TS["hunger"]),
-        },
-    }
-
-
-@app.websocket("/ws")
-async def ws_endpoint(websocket: WebSocket):
+@router.websocket("/ws")
+async def ws_endpoint(websocket: WebSocket, session: str = "default"):
+    rt = _rt(websocket)
+    manager, host = rt.manager, rt.host
     await manager.connect(websocket)
 
+    period = 1.0 / max(rt.settings.broadcast_hz, 1e-3)
+    # without a simulation clock the broadcast loop advances the world itself
+    tick_msg = {"type": "get_state"} if rt.settings.sim_hz > 0 else {"type": "advance", "dt": period}
+
     async def sender_loop():
-        # periodic state broadcast to this client only
+        # periodic state broadcast to this client only, on deadlines so lateness doesn't accumulate
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
         while True:
-            await asyncio.sleep(1.0)
-            # advance body activity decay and heart rhythm
-            body.tick(1.0)
-            # emergent movement from policy & drives (no hard-coded conditions)
-            _emergent_move()
-            agency.heart.update(1.0, arousal=agency.state.mood.arousal, activity=body.activity())
-            # timeseries sample
-            TS["bpm"].append(agency.heart.state.bpm)
-            TS["threat"].append(agency.state.drives.threat)
-            TS["hunger"].append(agency.state.drives.hunger)
+            deadline += period
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            lag = loop.time() - deadline
+            rt.broadcast_slip.record(lag)
+            if lag > period:
+                deadline = loop.time()
+            reply = await host.call(session, tick_msg)
             try:
-                await websocket.send_text(json.dumps({"type": "state", "data": _snapshot()}, ensure_ascii=False))
+                await websocket.send_text(json.dumps(reply, ensure_ascii=False))
             except Exception:
                 break
 
@@ -206,80 +409,39 @@ async def ws_endpoint(websocket: WebSocket):
         # handle inbound commands
         while True:
             msg = await websocket.receive_text()
+            rt.note_activity()
             try:
                 data = json.loads(msg)
             except Exception:
                 await websocket.send_text(json.dumps({"type": "error", "error": "invalid_json"}))
                 continue
+            if isinstance(data, list):
+                # a JSON array is a batch: applied in order on the shard, one reply
+                data = {"type": "batch", "commands": data}
+            elif not isinstance(data, dict):
+                await websocket.send_text(json.dumps({"type": "error", "error": "invalid_message"}))
+                continue
+            elif data.get("no_reply") and data.get("type") not in ("batch", "ping", "orchestrate"):
+                # fire-and-forget single command
+                data = {"type": "batch", "commands": [data], "no_reply": True}
 
             mtype = data.get("type")
             if mtype == "ping":
                 await websocket.send_text(json.dumps({"type": "pong", "ts": time.time()}))
-            elif mtype == "get_state":
-                await websocket.send_text(json.dumps({"type": "state", "data": _snapshot()}, ensure_ascii=False))
-            elif mtype == "tick":
-                minutes = float(data.get("minutes", 1.0))
-                food = bool(data.get("food_available", False))
-                threat = data.get("threat")
-                stim = bool(data.get("stimulation", False))
-                # capture prev drives for reward
-                PREV_DRIVES.update({
-                    "hunger": agency.state.drives.hunger,
-                    "threat": agency.state.drives.threat,
-                    "fatigue": agency.state.drives.fatigue,
-                })
-                step_evt = StepInput(type="system", value="tick", source="ws", minutes=minutes, food_available=food, threat=threat, stimulation=stim)
-                # reuse REST logic
-                res = await agency_step(step_evt)  # type: ignore[arg-type]
-                # compute simple reward from drive deltas
-                new = res["state"]["drives"]
-                dh = PREV_DRIVES["hunger"] - float(new.get("hunger", 0.0))
-                dt = PREV_DRIVES["threat"] - float(new.get("threat", 0.0))
-                df = float(new.get("fatigue", 0.0)) - PREV_DRIVES["fatigue"]
-                reward = 1.0 * dh + 0.8 * dt - 0.2 * df
-                policy.update(LAST_OBJECTS, reward)
-                await websocket.send_text(json.dumps({"type": "step_result", "data": res}, ensure_ascii=False))
-            elif mtype == "sense":
-                # update drives without time advance
-                threat = data.get("threat")
-                stim = bool(data.get("stimulation", False))
-                agency.sense({"threat": threat, "stimulation": stim})
-                await websocket.send_text(json.dumps({"type": "state", "data": _snapshot()}, ensure_ascii=False))
             elif mtype == "orchestrate":
                 text = data.get("text") or ""
                 evt = InputEvent(type="text", value=str(text), source="ws")
                 try:
-                    ctx = {
-                        "weights": agency.state.weights,
-                        "mood": agency.state.mood.model_dump(),
-                        "heart": agency.heart.to_dict(),
-                    }
-                    resp = await core.process_event(evt, context=ctx)
+                    ctx = (await host.call(session, {"type": "context"}))["data"]
+                    resp = await rt.core.process_event(evt, context=ctx)
                     await websocket.send_text(json.dumps({"type": "orchestrate_result", "data": resp.model_dump(mode="json")}, ensure_ascii=False))
                 except Exception as exc:
                     await websocket.send_text(json.dumps({"type": "error", "error": str(exc)}))
-            elif mtype == "body_cmd":
-                cmd = data.get("cmd")
-                if cmd == "turn":
-                    body.turn(float(data.get("delta", 0.0)))
-                elif cmd == "look":
-                    body.look(float(data.get("delta", 0.0)))
-                elif cmd == "move":
-                    body.move(float(data.get("forward", 0.0)), float(data.get("sideways", 0.0)), float(data.get("dt", 0.2)))
-                elif cmd == "pose":
-                    body.pose(left=data.get("left"), right=data.get("right"))
-                elif cmd == "reset":
-                    body.reset()
-                await websocket.send_text(json.dumps({"type": "body_state", "data": body.to_dict()}, ensure_ascii=False))
-            elif mtype == "vision":
-                # objects: [{id, x, y, tag}] from UI; use as visual input
-                objects = data.get("objects") or []
-                agency.observe_vision(objects)
-                # keep server-side snapshot to enable auto navigation
-                LAST_OBJECTS[:] = list(objects)
-                await websocket.send_text(json.dumps({"type": "ack", "ok": True}))
             else:
-                await websocket.send_text(json.dumps({"type": "error", "error": "unknown_type"}))
+                # world commands (get_state, tick, sense, body_cmd, vision, batch) run on the owning shard
+                reply = await host.call(session, data)
+                if reply is not None:
+                    await websocket.send_text(json.dumps(reply, ensure_ascii=False))
 
     sender = asyncio.create_task(sender_loop())
     receiver = asyncio.create_task(receiver_loop())
@@ -296,10 +458,43 @@ async def ws_endpoint(websocket: WebSocket):
 # ---- Simple UI (static) ----
 
 _UI_DIR = Path(__file__).resolve().parents[1] / "ui"
-if _UI_DIR.exists():
-    app.mount("/ui", StaticFiles(directory=str(_UI_DIR), html=True), name="ui")
 
 
-@app.get("/")
+@router.get("/")
 async def root_redirect():
     return RedirectResponse(url="/ui/")
+
+
+# ---- Application factory ----
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level="INFO", format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    runtime: Runtime = app.state.runtime
+    await runtime.startup()
+    try:
+        yield
+    finally:
+        await runtime.shutdown()
+
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """Build the API. Memory, adapters, agents and shards are created on first use."""
+    settings = settings or get_settings()
+    app = FastAPI(title=settings.app_name, lifespan=_lifespan)
+    app.state.runtime = Runtime(settings)
+    app.include_router(router)
+    if _UI_DIR.exists():
+        from fastapi.staticfiles import StaticFiles
+
+        app.mount("/ui", StaticFiles(directory=str(_UI_DIR), html=True), name="ui")
+    return app
+
+
+def __getattr__(name: str):
+    # `uvicorn app.main:app` keeps working; the app is only built when asked for
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
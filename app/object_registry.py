@@ -0,0 +1,186 @@
+from __future__ import annotations
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+
+
+class ObjectRegistry:
+    """Perceived objects keyed by id, with a per-tag uniform-grid spatial hash.
+
+    Vision updates arrive as add/update/remove diffs (or a full replacement);
+    nearest-by-tag and radius queries only visit grid cells around the query
+    point, so per-tick cost follows what changed and what is nearby.
+    """
+
+    def __init__(self, cell_size: float = 256.0) -> None:
+        self.cell_size = float(cell_size)
+        self._objects: Dict[str, dict] = {}
+        self._cell_of: Dict[str, Cell] = {}
+        self._by_tag: Dict[str, Dict[Cell, Set[str]]] = {}
+        self._all: Dict[Cell, Set[str]] = {}
+        self._tag_counts: Dict[str, int] = {}
+        self.version = 0
+        # objects sent without an id get "_<n>"; never reused, even across clear()
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __contains__(self, oid: object) -> bool:
+        return str(oid) in self._objects
+
+    def get(self, oid: object) -> Optional[dict]:
+        return self._objects.get(str(oid))
+
+    def values(self) -> List[dict]:
+        return list(self._objects.values())
+
+    def tags(self) -> List[str]:
+        return list(self._tag_counts)
+
+    # --- mutation ---
+    def replace(self, objects: Iterable[dict]) -> None:
+        self.clear()
+        for o in objects:
+            self.upsert(o)
+
+    def clear(self) -> None:
+        self._objects.clear()
+        self._cell_of.clear()
+        self._by_tag.clear()
+        self._all.clear()
+        self._tag_counts.clear()
+        self.version += 1
+
+    def apply_diff(self, add: Iterable[dict] = (), update: Iterable[dict] = (), remove: Iterable[object] = ()) -> List[dict]:
+        """Apply a vision diff; returns the objects that were added or changed."""
+        changed = []
+        for oid in remove:
+            self.remove(oid)
+        for o in add:
+            changed.append(self.upsert(o))
+        for o in update:
+            prev = self._objects.get(str(o.get("id")))
+            # partial updates keep fields the client didn't resend
+            changed.append(self.upsert({**prev, **o} if prev else o))
+        return changed
+
+    def upsert(self, obj: dict) -> dict:
+        oid = str(obj["id"]) if "id" in obj else self._new_id()
+        if oid in self._objects:
+            self._unindex(oid)
+        o = dict(obj)
+        o.setdefault("id", oid)
+        self._objects[oid] = o
+        self._index(oid, o)
+        self.version += 1
+        return o
+
+    def remove(self, oid: object) -> Optional[dict]:
+        key = str(oid)
+        if key not in self._objects:
+            return None
+        self._unindex(key)
+        self.version += 1
+        return self._objects.pop(key)
+
+    # --- queries ---
+    def nearest(self, tag: str, x: float, y: float) -> Tuple[Optional[dict], float]:
+        cells = self._by_tag.get(tag)
+        if not cells:
+            return None, float("inf")
+        cx, cy = self._cell(x, y)
+        best, bd = None, float("inf")
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 >= len(cells):
+                # the rings would cover more cells than the tag occupies: scan those directly
+                candidates = (oid for ids in cells.values() for oid in ids)
+                return self._closest(candidates, x, y, best, bd)
+            for cell in self._ring(cx, cy, ring):
+                ids = cells.get(cell)
+                if ids:
+                    best, bd = self._closest(ids, x, y, best, bd)
+            # anything in ring+1 is at least ring*cell_size away
+            if best is not None and bd <= ring * self.cell_size:
+                return best, bd
+            ring += 1
+
+    def query_radius(self, x: float, y: float, radius: float, tag: str | None = None) -> List[dict]:
+        grid = self._all if tag is None else self._by_tag.get(tag, {})
+        if not grid:
+            return []
+        x0, y0 = self._cell(x - radius, y - radius)
+        x1, y1 = self._cell(x + radius, y + radius)
+        r2 = radius * radius
+        out = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(grid):
+            cells = grid.values()
+        else:
+            cells = [grid[c] for c in ((i, j) for i in range(x0, x1 + 1) for j in range(y0, y1 + 1)) if c in grid]
+        for ids in cells:
+            for oid in ids:
+                o = self._objects[oid]
+                dx, dy = float(o.get("x", 0.0)) - x, float(o.get("y", 0.0)) - y
+                if dx * dx + dy * dy <= r2:
+                    out.append(o)
+        return out
+
+    # --- internals ---
+    def _new_id(self) -> str:
+        while True:
+            oid = f"_{self.next_id}"
+            self.next_id += 1
+            if oid not in self._objects:
+                return oid
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _index(self, oid: str, o: dict) -> None:
+        cell = self._cell(float(o.get("x", 0.0)), float(o.get("y", 0.0)))
+        tag = str(o.get("tag"))
+        self._cell_of[oid] = cell
+        self._by_tag.setdefault(tag, {}).setdefault(cell, set()).add(oid)
+        self._all.setdefault(cell, set()).add(oid)
+        self._tag_counts[tag] = self._tag_counts.get(tag, 0) + 1
+
+    def _unindex(self, oid: str) -> None:
+        cell = self._cell_of.pop(oid)
+        tag = str(self._objects[oid].get("tag"))
+        _discard(self._by_tag[tag], cell, oid)
+        if not self._by_tag[tag]:
+            del self._by_tag[tag]
+        _discard(self._all, cell, oid)
+        self._tag_counts[tag] -= 1
+        if not self._tag_counts[tag]:
+            del self._tag_counts[tag]
+
+    def _closest(self, ids: Iterable[str], x: float, y: float, best: Optional[dict], bd: float) -> Tuple[Optional[dict], float]:
+        for oid in ids:
+            o = self._objects[oid]
+            d = math.hypot(float(o.get("x", 0.0)) - x, float(o.get("y", 0.0)) - y)
+            if d < bd:
+                best, bd = o, d
+        return best, bd
+
+    @staticmethod
+    def _ring(cx: int, cy: int, r: int) -> Iterable[Cell]:
+        if r == 0:
+            yield cx, cy
+            return
+        for i in range(-r, r + 1):
+            yield cx + i, cy - r
+            yield cx + i, cy + r
+        for j in range(-r + 1, r):
+            yield cx - r, cy + j
+            yield cx + r, cy + j
+
+
+def _discard(grid: Dict[Cell, Set[str]], cell: Cell, oid: str) -> None:
+    ids = grid.get(cell)
+    if ids is not None:
+        ids.discard(oid)
+        if not ids:
+            del grid[cell]
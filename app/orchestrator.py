@@ -1,39 +1,46 @@
 from __future__ import annotations
 import asyncio
+import importlib
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from models.types import InputEvent, ModelResponse, ResponsePacket
 
 from .adapters.base import BaseAdapter, AdapterError
-from .adapters.gpt import GPTAdapter
-from .adapters.deepseek import DeepSeekAdapter
-from .adapters.gemini import GeminiAdapter
-from .adapters.copilot import CopilotAdapter
 from .pipelines.dialectic_engine import DialecticEngine
 from .pipelines.internal_monologue import InternalMonologue
 from .pipelines.bias_detector import BiasDetector
 from .pipelines.conflict_analyzer import ConflictAnalyzer
 from .pipelines.response_synthesizer import ResponseSynthesizer
 from .memory import MemoryStore
-from .config import get_settings
+from .config import Settings, get_settings
 
 logger = logging.getLogger("smartcore.orchestrator")
 
 
-ADAPTER_REGISTRY: Dict[str, BaseAdapter] = {
-    "gpt": GPTAdapter(),
-    "deepseek": DeepSeekAdapter(),
-    "gemini": GeminiAdapter(),
-    "copilot": CopilotAdapter(),
+# name -> "module:Class"; adapters are imported and built on first use
+ADAPTER_PATHS: Dict[str, str] = {
+    "gpt": "app.adapters.gpt:GPTAdapter",
+    "deepseek": "app.adapters.deepseek:DeepSeekAdapter",
+    "gemini": "app.adapters.gemini:GeminiAdapter",
+    "copilot": "app.adapters.copilot:CopilotAdapter",
 }
+ADAPTER_REGISTRY: Dict[str, BaseAdapter] = {}
+
+
+def get_adapter(name: str) -> Optional[BaseAdapter]:
+    adapter = ADAPTER_REGISTRY.get(name)
+    if adapter is None and name in ADAPTER_PATHS:
+        module, cls = ADAPTER_PATHS[name].split(":")
+        adapter = ADAPTER_REGISTRY[name] = getattr(importlib.import_module(module), cls)()
+    return adapter
 
 
 class Orchestrator:
     """Coordinates the multi-model cognitive workflow."""
 
-    def __init__(self, memory: MemoryStore):
-        self.settings = get_settings()
+    def __init__(self, memory: MemoryStore, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
         self.memory = memory
         self.dialectic = DialecticEngine()
         self.monologue = InternalMonologue(depth=2)
@@ -68,7 +75,7 @@ class Orchestrator:
         tasks = []
         context = {"prompt": prompt}
         for name in self.settings.active_models:
-            adapter = ADAPTER_REGISTRY.get(name)
+            adapter = get_adapter(name)
             if not adapter:
                 continue
             tasks.append(self._call_adapter(adapter, prompt, context))
@@ -1,10 +1,10 @@
 from __future__ import annotations
 import math
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class HeartState:
     bpm: float = 70.0
     hrv: float = 0.5  # 0..1 (higher is calmer/more variability)
@@ -25,8 +25,12 @@ class Heart:
 
     def __init__(self) -> None:
         self.state = HeartState()
+        self.version = 0  # bumped by update/fast_forward
+        self._dict: Tuple[int, Dict[str, Any]] = (-1, {})
 
-    def update(self, dt_seconds: float, *, arousal: float = 0.0, activity: float = 0.0, rest: bool = False) -> None:
+    k = 2.0  # responsiveness of the first-order lag (1/s)
+
+    def update(self, dt_seconds: float, *, arousal: float = 0.0, activity: float = 0.0, rest: bool = False) -> int:
         s = self.state
         arousal = max(0.0, min(1.0, float(arousal)))
         activity = max(0.0, min(1.0, float(activity)))
@@ -34,22 +38,85 @@ class Heart:
         target = s.baseline + arousal * 40.0 + activity * 60.0 - (20.0 if rest else 0.0)
         target = max(s.min_bpm, min(s.max_bpm, target))
         # Smooth approach (first-order lag)
-        k = 2.0  # responsiveness
-        alpha = 1.0 - math.exp(-k * max(0.0, dt_seconds))
+        alpha = 1.0 - math.exp(-self.k * max(0.0, dt_seconds))
         s.bpm = s.bpm + (target - s.bpm) * alpha
         # HRV: lower under stress, higher at rest
         stress = max(arousal, activity)
         s.hrv = max(0.05, min(1.0, 0.8 - 0.6 * stress + (0.2 if rest else 0.0)))
 
-        # Beat timing
+        # Beat timing: whole periods elapsed in this window, O(1) in dt
         period = 60.0 / max(1.0, s.bpm)
-        s._phase_s += dt_seconds
-        s.beat = False
-        while s._phase_s >= period:
-            s._phase_s -= period
-            s.beat = True  # at least one beat occurred in this update window
+        beats, s._phase_s = divmod(s._phase_s + max(0.0, dt_seconds), period)
+        s.beat = beats >= 1  # at least one beat occurred in this update window
+        self.version += 1
+        return int(beats)
 
-    def to_dict(self) -> Dict[str, Any]:
+    def fast_forward(self, dt_seconds: float, *, arousal: float = 0.0, arousal_rate: float = 0.0, activity: float = 0.0, rest: bool = False) -> Dict[str, float]:
+        """Advance the continuous model in closed form.
+
+        The target bpm may ramp linearly (`arousal_rate` per second, e.g. while
+        threat decays); bpm follows the exact first-order-lag solution and beats
+        are counted from its integral, so cost is independent of dt.
+        """
+        s = self.state
+        dt_seconds = max(0.0, float(dt_seconds))
+        activity = max(0.0, min(1.0, float(activity)))
+        b0 = s.bpm
+        cycles = s._phase_s * max(1.0, b0) / 60.0
+        integral = 0.0
+        for t0, t1, T0, slope in self._target_pieces(dt_seconds, arousal, arousal_rate, activity, rest):
+            s.bpm, area = self._lag(s.bpm, T0, slope, t1 - t0)
+            integral += area
+        cycles += integral / 60.0
+        beats = math.floor(cycles)
+        s._phase_s = (cycles - beats) * 60.0 / max(1.0, s.bpm)
+        s.beat = beats >= 1
+        end_arousal = max(0.0, min(1.0, arousal + arousal_rate * dt_seconds))
+        stress = max(end_arousal, activity)
+        s.hrv = max(0.05, min(1.0, 0.8 - 0.6 * stress + (0.2 if rest else 0.0)))
+        self.version += 1
+        return {
+            "beats": float(beats),
+            "mean_bpm": integral / dt_seconds if dt_seconds > 0 else b0,
+            "start_bpm": b0,
+            "end_bpm": s.bpm,
+        }
+
+    def _target_pieces(self, duration: float, arousal: float, arousal_rate: float, activity: float, rest: bool) -> List[Tuple[float, float, float, float]]:
+        """Split [0, duration] where the linear target bpm hits its clamps."""
         s = self.state
-        return {"bpm": round(s.bpm, 1), "hrv": round(s.hrv, 3), "beat": s.beat}
+        base = s.baseline + arousal * 40.0 + activity * 60.0 - (20.0 if rest else 0.0)
+        slope = arousal_rate * 40.0
+        cuts = {0.0, duration}
+        if slope:
+            for bound in (s.min_bpm, s.max_bpm):
+                t = (bound - base) / slope
+                if 0.0 < t < duration:
+                    cuts.add(t)
+        pts = sorted(cuts)
+        pieces = []
+        for t0, t1 in zip(pts, pts[1:]):
+            mid = base + slope * 0.5 * (t0 + t1)
+            if mid <= s.min_bpm or mid >= s.max_bpm:
+                pieces.append((t0, t1, max(s.min_bpm, min(s.max_bpm, mid)), 0.0))
+            else:
+                pieces.append((t0, t1, base + slope * t0, slope))
+        return pieces
+
+    def _lag(self, b0: float, target0: float, slope: float, d: float) -> Tuple[float, float]:
+        """bpm after d seconds tracking target0 + slope*t, and the bpm integral."""
+        k = self.k
+        c = b0 - target0 + slope / k
+        e = math.exp(-k * d)
+        end = target0 + slope * d - slope / k + c * e
+        area = target0 * d + 0.5 * slope * d * d - slope * d / k + c * (1.0 - e) / k
+        return end, area
+
+    def to_dict(self) -> Dict[str, Any]:
+        version, data = self._dict
+        if version != self.version:
+            s = self.state
+            data = {"bpm": round(s.bpm, 1), "hrv": round(s.hrv, 3), "beat": s.beat}
+            self._dict = (self.version, data)
+        return data
 
@@ -0,0 +1,57 @@
+from __future__ import annotations
+import math
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from .heart import Heart, HeartState
+
+
+class HeartBank:
+    """Heart.update for N agents at once, as float arrays.
+
+    Same first-order bpm lag, hrv rule and O(1) beat-phase divmod as Heart;
+    update() returns a boolean beat mask and per-agent beat counts.
+    """
+
+    k = Heart.k
+
+    def __init__(self, n: int, state: HeartState | None = None) -> None:
+        s = state or HeartState()
+        self.n = int(n)
+        self.bpm = np.full(self.n, s.bpm)
+        self.hrv = np.full(self.n, s.hrv)
+        self.baseline = np.full(self.n, s.baseline)
+        self.min_bpm = np.full(self.n, s.min_bpm)
+        self.max_bpm = np.full(self.n, s.max_bpm)
+        self.phase = np.full(self.n, s._phase_s)
+        self.beat = np.zeros(self.n, dtype=bool)
+
+    def update(self, dt_seconds: Any, *, arousal: Any = 0.0, activity: Any = 0.0, rest: Any = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Advance every heart by dt (scalar or per-agent); returns (beat mask, beat counts)."""
+        arousal = np.clip(arousal, 0.0, 1.0)
+        activity = np.clip(activity, 0.0, 1.0)
+        rest = np.asarray(rest, dtype=bool)
+        # Target bpm responds to arousal/activity
+        target = self.baseline + arousal * 40.0 + activity * 60.0 - np.where(rest, 20.0, 0.0)
+        target = np.clip(target, self.min_bpm, self.max_bpm)
+        # Smooth approach (first-order lag); scalar dt keeps Heart's exact math.exp
+        if np.ndim(dt_seconds) == 0:
+            dt = max(0.0, float(dt_seconds))
+            alpha = 1.0 - math.exp(-self.k * dt)
+        else:
+            dt = np.maximum(0.0, np.asarray(dt_seconds, dtype=np.float64))
+            alpha = 1.0 - np.exp(-self.k * dt)
+        self.bpm += (target - self.bpm) * alpha
+        # HRV: lower under stress, higher at rest
+        stress = np.maximum(arousal, activity)
+        self.hrv[:] = np.clip(0.8 - 0.6 * stress + np.where(rest, 0.2, 0.0), 0.05, 1.0)
+        # Beat timing: whole periods elapsed in this window
+        period = 60.0 / np.maximum(1.0, self.bpm)
+        beats, self.phase = np.divmod(self.phase + dt, period)
+        np.greater_equal(beats, 1, out=self.beat)
+        return self.beat, beats.astype(np.int64)
+
+    def as_dict(self, i: int) -> Dict[str, Any]:
+        """Heart.to_dict() for agent i."""
+        return {"bpm": round(float(self.bpm[i]), 1), "hrv": round(float(self.hrv[i]), 3), "beat": bool(self.beat[i])}
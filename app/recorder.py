@@ -0,0 +1,195 @@
+from __future__ import annotations
+import asyncio
+import logging
+import multiprocessing as mp
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+from .event_log import safe_name
+
+logger = logging.getLogger("smartcore.recorder")
+
+
+class SessionRecorder:
+    """Samples one session's world state at `fps` into an on-disk Trace.
+
+    Snapshots come from the host like any /ws client's; rows are appended to
+    the trace directory every `flush_every` seconds from a worker thread, so
+    memory stays bounded however long the recording runs. At most one write
+    is in flight: the next flush (including stop()'s) waits for it first.
+    If sampling fails the recording ends and `error` says why.
+    """
+
+    def __init__(self, host, session: str, directory: str | Path, fps: float = 10.0, flush_every: float = 2.0) -> None:
+        self.host = host
+        self.session = session
+        self.fps = max(0.1, float(fps))
+        self.flush_every = flush_every
+        self.name = f"{safe_name(session)}-{int(time.time() * 1000)}"
+        self.path = Path(directory) / self.name
+        self.trace = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Optional[asyncio.Future] = None
+        self.error: Optional[str] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            self._task.add_done_callback(self._ended)
+
+    async def stop(self) -> Dict[str, Any]:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass  # a failure is already in self.error
+        self._task = None
+        await self._flush()
+        return self.info()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "trace": self.name,
+            "session": self.session,
+            "fps": self.fps,
+            "frames": len(self.trace) if self.trace is not None else 0,
+            "recording": self._task is not None and not self._task.done(),
+            "error": self.error,
+        }
+
+    async def _run(self) -> None:
+        from .render import Trace
+
+        period = 1.0 / self.fps
+        next_t = last_flush = time.monotonic()
+        while True:
+            snap = (await self.host.call(self.session, {"type": "get_state"}))["data"]
+            if self.trace is None:
+                room = snap["body"]["room"]
+                self.trace = Trace(self.fps, (room["w"], room["h"]))
+            self.trace.capture_snapshot(snap)
+            now = time.monotonic()
+            if now - last_flush >= self.flush_every:
+                await self._flush()
+                last_flush = now
+            next_t += period
+            await asyncio.sleep(max(0.0, next_t - time.monotonic()))
+
+    def _ended(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        exc = task.exception()
+        self.error = f"{type(exc).__name__}: {exc}"
+        logger.error("recording_failed", exc_info=exc, extra={"session": self.session, "error": self.error})
+
+    async def _flush(self) -> None:
+        """Append what was captured since the last flush, after any write still in flight."""
+        # shielded: cancelling _run must not abandon a half-written batch,
+        # and stop() finds it in _pending until it has finished
+        if self._pending is not None:
+            await asyncio.shield(self._pending)
+        if self.trace is None:
+            return
+        from .render import Trace
+
+        pending = self._pending = asyncio.ensure_future(asyncio.to_thread(Trace.write_batch, self.path, self.trace.take()))
+        pending.add_done_callback(self._written)
+        await asyncio.shield(pending)
+
+    def _written(self, fut: asyncio.Future) -> None:
+        if self._pending is fut:
+            self._pending = None
+
+
+_progress = None  # set in render worker processes
+
+
+def _init_render_worker(progress) -> None:
+    global _progress
+    _progress = progress
+
+
+def _render_job(job: str, trace_path: str, out: str) -> str:
+    from .render import Trace, render_trace
+
+    trace = Trace.load(trace_path)
+    path = render_trace(trace, Path(out), workers=0, progress=lambda done, total: _progress.put((job, done, total)))
+    return str(path)
+
+
+class RenderJobs:
+    """Renders recorded traces to MP4/GIF in a background process pool.
+
+    submit() returns immediately with a job id; workers report progress over a
+    queue that a reader thread folds into the job table, so status() never
+    waits on rendering and the event loop is never blocked. Only the newest
+    `keep_finished` finished jobs stay in the table.
+    """
+
+    def __init__(self, directory: str | Path, workers: int = 1, keep_finished: int = 100) -> None:
+        self.directory = Path(directory)
+        self.workers = max(1, int(workers))
+        self.keep_finished = max(0, int(keep_finished))
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._finished: Deque[str] = deque()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._progress = None
+
+    def submit(self, trace: str, fmt: str = "mp4") -> Dict[str, Any]:
+        from .render import Trace
+
+        src = self.directory / trace
+        total = Trace.frame_count(src)
+        job = uuid.uuid4().hex[:12]
+        out = self.directory / "renders" / f"{trace}.{job}.{fmt}"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        self.jobs[job] = {"job": job, "trace": trace, "format": fmt, "status": "queued", "frames": 0, "total": total, "progress": 0.0, "file": None, "error": None}
+        fut = self._ensure_pool().submit(_render_job, job, str(src), str(out))
+        fut.add_done_callback(lambda f: self._finish(job, f))
+        return dict(self.jobs[job])
+
+    def status(self, job: str) -> Optional[Dict[str, Any]]:
+        info = self.jobs.get(job)
+        return dict(info) if info is not None else None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._progress.put(None)
+        self._pool = None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            ctx = mp.get_context("spawn")
+            self._progress = ctx.Queue()
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=ctx, initializer=_init_render_worker, initargs=(self._progress,))
+            threading.Thread(target=self._read_progress, args=(self._progress,), name="render-progress", daemon=True).start()
+        return self._pool
+
+    def _read_progress(self, q) -> None:
+        while (item := q.get()) is not None:
+            job, done, total = item
+            info = self.jobs.get(job)
+            if info is not None and info["status"] in ("queued", "running"):
+                info.update(status="running", frames=done, total=total, progress=done / max(1, total))
+
+    def _finish(self, job: str, fut: Future) -> None:
+        info = self.jobs[job]
+        if fut.cancelled():
+            info.update(status="cancelled")
+        elif fut.exception() is not None:
+            info.update(status="failed", error=f"{type(fut.exception()).__name__}: {fut.exception()}")
+            logger.error("render_failed", extra={"job": job, "error": info["error"]})
+        else:
+            # the encoder may have fallen back from MP4 to GIF
+            path = Path(fut.result())
+            info.update(status="done", frames=info["total"], progress=1.0, file=path.name, format=path.suffix.lstrip("."))
+        self._finished.append(job)
+        while len(self._finished) > self.keep_finished:
+            self.jobs.pop(self._finished.popleft(), None)
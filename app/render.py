@@ -0,0 +1,530 @@
+from __future__ import annotations
+import json
+import math
+import os
+import queue
+import threading
+import multiprocessing as mp
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import imageio
+import numpy as np
+from PIL import GifImagePlugin, Image, ImageDraw, ImageFont
+
+from .checkpoint import write_atomic
+
+FRAME_SIZE = (900, 540)
+TRACE_FORMAT = 1
+
+# one recorded step; strings (mood label, thoughts) and object sets index Trace tables
+FRAME = np.dtype([
+    ("x", "f8"), ("y", "f8"), ("yaw", "f8"), ("head_yaw", "f8"), ("left_hand", "f8"), ("right_hand", "f8"),
+    ("valence", "f8"), ("arousal", "f8"), ("appetite", "f8"), ("bpm", "f8"), ("hrv", "f8"),
+    ("hunger", "f8"), ("fatigue", "f8"), ("curiosity", "f8"), ("threat", "f8"),
+    ("mood", "u2"), ("thoughts", "u4"), ("scene", "u4"),
+])
+
+
+def world_to_screen(x: float, y: float, origin: Tuple[int, int], scale: float) -> Tuple[int, int]:
+    ox, oy = origin
+    return int(ox + x * scale), int(oy + y * scale)
+
+
+class _Table:
+    """Interned values referenced by index from FRAME rows.
+
+    Entries handed to disk by take() are dropped from memory (indexes keep
+    counting from `base`), and the value -> index map is a bounded LRU, so a
+    long recording holds only recent entries. A value evicted from the map
+    is stored again under a new index, which is harmless.
+    """
+
+    def __init__(self, max_ids: int = 4096) -> None:
+        self.values: List[Any] = []
+        self.base = 0
+        self.max_ids = max_ids
+        self._ids: "OrderedDict[Any, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.base + len(self.values)
+
+    def __getitem__(self, i: int) -> Any:
+        return self.values[int(i) - self.base]
+
+    def index(self, key: Any, value: Any) -> int:
+        i = self._ids.get(key)
+        if i is not None:
+            self._ids.move_to_end(key)
+            return i
+        i = self._ids[key] = len(self)
+        self.values.append(value)
+        if len(self._ids) > self.max_ids:
+            self._ids.popitem(last=False)
+        return i
+
+    def take(self) -> List[Tuple[int, Any]]:
+        out = list(enumerate(self.values, self.base))
+        self.base, self.values = len(self), []
+        return out
+
+
+TABLES = ("labels", "thoughts", "scenes")
+
+
+class Trace:
+    """Compact record of an agent's run: one FRAME row per video frame.
+
+    Everything the renderer needs is captured, so frames can be drawn later,
+    in any order and in other processes. Repeated strings and object sets
+    ("scenes": position and tag of each object, the only fields drawn) are
+    stored once in tables and referenced by index. On disk a trace is a
+    directory holding `meta.json` (fps and room, written once),
+    `frames.bin` (raw FRAME rows) and `tables.jsonl` (new table entries);
+    both of the latter are append-only.
+    """
+
+    def __init__(self, fps: float, room: Tuple[float, float], objects: List[dict] | None = None) -> None:
+        self.fps = fps
+        self.room_w, self.room_h = room
+        self.labels = _Table()
+        self.thoughts = _Table()
+        self.scenes = _Table()
+        self._frames = np.empty(0, dtype=FRAME)
+        self._rows: List[tuple] = []
+        # scene used by capture(); snapshots bring their own objects
+        self._scene = self._intern_scene(objects) if objects is not None else 0
+        self.flushed = 0  # rows already handed out by take()
+        self._meta_written = False
+
+    def __len__(self) -> int:
+        return self.flushed + len(self._frames) + len(self._rows)
+
+    @property
+    def frames(self) -> np.ndarray:
+        if self._rows:
+            self._frames = np.concatenate([self._frames, np.array(self._rows, dtype=FRAME)])
+            self._rows = []
+        return self._frames
+
+    def capture(self, body, agency) -> None:
+        """Append the state of a live Body and Agency (objects: the constructor's scene)."""
+        b, st, dr = body.state, agency.state, agency.state.drives
+        thoughts = tuple(agency.thoughts.render()[:3])
+        self._rows.append((
+            b.x, b.y, b.yaw, b.head_yaw, b.left_hand, b.right_hand,
+            st.mood.valence, st.mood.arousal, st.appetite, agency.heart.state.bpm, agency.heart.state.hrv,
+            dr.hunger, dr.fatigue, dr.curiosity, dr.threat,
+            self.labels.index(st.mood.label, st.mood.label), self.thoughts.index(thoughts, thoughts), self._scene,
+        ))
+
+    def capture_snapshot(self, snap: Dict[str, Any]) -> None:
+        """Append one World.snapshot() (as sent over /ws)."""
+        b, mood, heart, dr = snap["body"], snap["mood"], snap["heart"], snap["state"]["drives"]
+        thoughts = tuple(snap["thoughts"][:3])
+        self._rows.append((
+            b["x"], b["y"], b["yaw"], b["head_yaw"], b["left_hand"], b["right_hand"],
+            mood["valence"], mood["arousal"], snap["appetite"], heart["bpm"], heart["hrv"],
+            dr["hunger"], dr["fatigue"], dr["curiosity"], dr["threat"],
+            self.labels.index(mood["label"], mood["label"]), self.thoughts.index(thoughts, thoughts),
+            self._intern_scene(snap.get("objects") or []),
+        ))
+
+    def _intern_scene(self, objects: List[dict]) -> int:
+        scene = [{"x": float(o.get("x", 0.0)), "y": float(o.get("y", 0.0)), "tag": str(o.get("tag", ""))} for o in objects]
+        return self.scenes.index(tuple((o["x"], o["y"], o["tag"]) for o in scene), scene)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.frames  # pack pending rows before pickling
+        return self.__dict__.copy()
+
+    # --- on disk ---
+    def take(self) -> Dict[str, Any]:
+        """Rows and table entries captured since the last take(), dropped from memory.
+
+        Cheap and synchronous, so a recorder can call it on the event loop and
+        hand the batch to write_batch() in a thread.
+        """
+        rows = self.frames
+        self._frames = np.empty(0, dtype=FRAME)
+        self.flushed += len(rows)
+        batch: Dict[str, Any] = {"frames": rows, "tables": [(name, i, v) for name in TABLES for i, v in getattr(self, name).take()]}
+        if not self._meta_written:
+            batch["meta"] = {"format": TRACE_FORMAT, "fps": self.fps, "room": [self.room_w, self.room_h]}
+            self._meta_written = True
+        return batch
+
+    @staticmethod
+    def write_batch(path: str | Path, batch: Dict[str, Any]) -> int:
+        """Append a take() batch to the trace directory; tables land before the rows that use them."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        if "meta" in batch:
+            write_atomic(path / "meta.json", json.dumps(batch["meta"]).encode("utf-8"))
+        for name, data in (("tables.jsonl", "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch["tables"]).encode("utf-8")), ("frames.bin", batch["frames"].tobytes())):
+            if data:
+                with open(path / name, "ab") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+        return len(batch["frames"])
+
+    def flush_to(self, path: str | Path) -> int:
+        """take() and write_batch() in one call; returns the rows written."""
+        return self.write_batch(path, self.take())
+
+    @staticmethod
+    def frame_count(path: str | Path) -> int:
+        """Rows in a trace directory without loading it (FileNotFoundError if it is not one)."""
+        path = Path(path)
+        if not (path / "meta.json").is_file():
+            raise FileNotFoundError(f"no trace at {path}")
+        raw = path / "frames.bin"
+        return raw.stat().st_size // FRAME.itemsize if raw.exists() else 0
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Trace":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not a version {TRACE_FORMAT} trace")
+        trace = cls(meta["fps"], tuple(meta["room"]))
+        tables = path / "tables.jsonl"
+        if tables.exists():
+            with open(tables, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        name, i, value = json.loads(line)
+                    except ValueError:
+                        break  # torn last line
+                    table = getattr(trace, name)
+                    if i != len(table):
+                        break
+                    table.values.append(tuple(value) if name == "thoughts" else value)
+        raw = path / "frames.bin"
+        n = raw.stat().st_size // FRAME.itemsize if raw.exists() else 0
+        # rows past the last table write would reference missing entries
+        frames = np.fromfile(raw, dtype=FRAME, count=n) if n else np.empty(0, dtype=FRAME)
+        ok = (frames["mood"] < len(trace.labels)) & (frames["thoughts"] < len(trace.thoughts)) & (frames["scene"] < len(trace.scenes))
+        trace._frames = frames[: int(np.argmin(ok)) if not ok.all() else len(frames)]
+        return trace
+
+
+# (series, y offset from the bottom, vmin, vmax, colour); sparklines are 260x40 px
+SPARKS = (("bpm", 120, 50, 160, (255,107,107)), ("threat", 70, 0, 1, (247,209,95)))
+SPARK_W, SPARK_H = 260, 40
+SPARK_WINDOW = 260  # samples shown: one per horizontal pixel
+
+
+FONT = ImageFont.load_default()
+
+
+@lru_cache(maxsize=2048)
+def _text_mask(text: str) -> Image.Image:
+    # rasterizing text dominates frame cost; panel lines repeat across many frames
+    _, _, w, h = FONT.getbbox(text)
+    mask = Image.new("L", (max(1, w), max(1, h)))
+    ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=FONT)
+    return mask
+
+
+class FrameRenderer:
+    """Draws Trace frames onto one reused canvas.
+
+    The static layer (background, room, objects, panel heading, sparkline
+    boxes) is drawn once per scene; each frame pastes it back and draws only the agent,
+    the text and the sparklines. Text lines are rasterized once and reused
+    as paste masks. Sparklines show the last SPARK_WINDOW
+    samples from ring buffers of screen y values that take one new sample per
+    consecutive frame, so cost per frame does not grow with the trace.
+    """
+
+    pad = 20
+    max_bases = 8  # cached static layers (~1.4 MB each)
+    fg = (230,233,239)
+    muted = (154,165,177)
+
+    def __init__(self, trace: Trace, size: Tuple[int, int] = FRAME_SIZE) -> None:
+        self.trace = trace
+        W, H = self.size = size
+        pad = self.pad
+        self.scale = min((W*0.55 - 2*pad) / trace.room_w, (H - 2*pad) / trace.room_h)
+        self.origin = (pad, pad)
+        self.right_x = int(W*0.58)
+        self._bases: "OrderedDict[int, Image.Image]" = OrderedDict()
+        self.canvas = Image.new("RGB", size)
+        self.draw = ImageDraw.Draw(self.canvas)
+        self._spark = {name: deque(maxlen=SPARK_WINDOW) for name, *_ in SPARKS}
+        self._last = -2
+
+    def base(self, scene: int) -> Image.Image:
+        img = self._bases.get(scene)
+        if img is None:
+            img = self._bases[scene] = self._static_layer(self.trace.scenes[scene])
+            if len(self._bases) > self.max_bases:
+                self._bases.popitem(last=False)
+        else:
+            self._bases.move_to_end(scene)
+        return img
+
+    def _static_layer(self, objects: List[dict]) -> Image.Image:
+        W, H = self.size
+        img = Image.new("RGB", self.size)
+        d = ImageDraw.Draw(img)
+        origin, scale = self.origin, self.scale
+
+        # Background
+        d.rectangle([0,0,W,H], fill=(11,16,32))
+
+        # Room
+        d.rectangle([origin[0], origin[1], origin[0] + self.trace.room_w*scale, origin[1] + self.trace.room_h*scale], outline=(31,41,71), width=2)
+
+        # Objects
+        for o in objects:
+            cx, cy = world_to_screen(o['x'], o['y'], origin, scale)
+            color = (108,192,255)
+            tag = str(o.get('tag',''))
+            if tag == 'food':
+                color = (125,245,157)
+            elif tag == 'hazard':
+                color = (255,107,107)
+            d.ellipse([cx-6, cy-6, cx+6, cy+6], fill=color)
+
+        # Thoughts heading sits below the four text lines
+        d.text((self.right_x, self.pad + 4*22 + 10), "Thoughts:", fill=self.muted)
+
+        # Sparkline boxes
+        for _, dy, *_ in SPARKS:
+            d.rectangle([self.right_x, H-dy, self.right_x+SPARK_W, H-dy+SPARK_H], outline=(31,41,71), width=1)
+        return img
+
+    def render(self, i: int) -> Image.Image:
+        """Frame i; the returned image is overwritten by the next call."""
+        d, f = self.draw, self.trace.frames[i]
+        self.canvas.paste(self.base(int(f['scene'])))
+
+        # Agent
+        bx, by = world_to_screen(float(f['x']), float(f['y']), self.origin, self.scale)
+        d.ellipse([bx-10, by-10, bx+10, by+10], fill=(125,245,157))
+        # Facing
+        yaw = float(f['yaw'])
+        d.line([bx, by, bx + 18*math.cos(yaw), by + 18*math.sin(yaw)], fill=(125,245,157), width=2)
+        gaze = yaw + float(f['head_yaw'])
+        d.line([bx, by, bx + 24*math.cos(gaze), by + 24*math.sin(gaze)], fill=(255,228,138), width=2)
+
+        # Hands
+        d.line([bx, by, bx-14, by-20*float(f['left_hand'])], fill=(122,208,122), width=2)
+        d.line([bx, by, bx+14, by-20*float(f['right_hand'])], fill=(122,208,122), width=2)
+
+        # Right panel text
+        x, y = self.right_x, self.pad
+        for line in (
+            f"Mood: {self.trace.labels[f['mood']]} | v={f['valence']:.2f}, a={f['arousal']:.2f}",
+            f"Appetite: {f['appetite']:.2f}",
+            f"Heart: {f['bpm']:.0f} bpm | hrv={f['hrv']:.2f}",
+            f"Drives: H={f['hunger']:.2f} F={f['fatigue']:.2f} C={f['curiosity']:.2f} T={f['threat']:.2f}",
+        ):
+            self._text(x, y, line, self.fg)
+            y += 22
+        # Thoughts (last 3)
+        y += 10 + 18
+        for t in self.trace.thoughts[f['thoughts']]:
+            self._text(x, y, f"- {t[:70]}", self.fg); y += 18
+
+        # Sparklines
+        self._advance_sparks(i)
+        for name, dy, *_, color in SPARKS:
+            ys = self._spark[name]
+            n = len(ys)
+            if n < 2:
+                continue
+            xs = x + np.arange(n) * (SPARK_W / (n-1))
+            d.line(np.column_stack((xs, ys)).ravel().tolist(), fill=color, width=2)
+        self._last = i
+        return self.canvas
+
+    def _text(self, x: int, y: int, text: str, fill) -> None:
+        mask = _text_mask(text)
+        self.canvas.paste(fill, (x, y, x + mask.width, y + mask.height), mask)
+
+    def _advance_sparks(self, i: int) -> None:
+        H = self.size[1]
+        frames = self.trace.frames
+        # consecutive frame: push one sample; otherwise refill the window
+        step = i == self._last + 1
+        rows = frames[i:i+1] if step else frames[max(0, i-SPARK_WINDOW+1):i+1]
+        for name, dy, vmin, vmax, _ in SPARKS:
+            t = (np.clip(rows[name], vmin, vmax) - vmin) / (vmax - vmin + 1e-6)
+            ring = self._spark[name]
+            if not step:
+                ring.clear()
+            ring.extend((H - dy + SPARK_H - t*SPARK_H).tolist())
+
+
+def draw_frame(img: Image.Image, trace: Trace, i: int):
+    """Draw frame i of `trace` onto img (one-off; use FrameRenderer for sequences)."""
+    img.paste(FrameRenderer(trace, img.size).render(i))
+
+
+class _GifStream:
+    """GIF encoder that writes each frame as it arrives (own palette per frame)."""
+
+    def __init__(self, out: Path, fps: int) -> None:
+        self._f = open(out, "wb")
+        self._ms = int(round(1000.0 / fps))
+        self._started = False
+
+    def append_data(self, frame: np.ndarray) -> None:
+        q = Image.fromarray(frame).quantize(256)
+        if not self._started:
+            header, _ = GifImagePlugin.getheader(q, None, {"loop": 0})
+            self._f.write(b"".join(header))
+            self._started = True
+        self._f.write(b"".join(GifImagePlugin.getdata(q, duration=self._ms, include_color_table=True)))
+
+    def close(self) -> None:
+        if self._started:
+            self._f.write(b";")
+        self._f.close()
+
+
+class FrameWriter:
+    """Streams frames to an MP4 (ffmpeg) or GIF file as they are drawn.
+
+    Encoding runs on a background thread behind a bounded queue holding at
+    most `max_memory` bytes of frames, so a slow encoder blocks the producer
+    instead of frames piling up. If the MP4 encoder is unavailable the first
+    frame falls back to GIF; `path` is the file actually written.
+    """
+
+    def __init__(self, out: Path, fps: int, size: Tuple[int, int], max_memory: int = 64 << 20) -> None:
+        frame_bytes = size[0] * size[1] * 3
+        if max_memory < frame_bytes:
+            raise ValueError(f"max_memory must hold at least one {size[0]}x{size[1]} frame ({frame_bytes} bytes)")
+        self.path = Path(out)
+        self.fps = fps
+        self.frames = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_memory // frame_bytes)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._encode, name="frame-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, img) -> None:
+        if self._error is not None:
+            raise RuntimeError("frame encoder failed") from self._error
+        self._queue.put(np.asarray(img))
+        self.frames += 1
+
+    def close(self) -> Path:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("frame encoder failed") from self._error
+        return self.path
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _open(self, first: np.ndarray):
+        if self.path.suffix.lower() == ".mp4":
+            w = None
+            try:
+                w = imageio.get_writer(self.path, fps=self.fps, codec="libx264", quality=8)
+                w.append_data(first)
+                return w
+            except Exception:
+                # no usable encoder: drop the partial mp4 and fall back to GIF
+                if w is not None:
+                    try:
+                        w.close()
+                    except Exception:
+                        pass
+                self.path.unlink(missing_ok=True)
+                self.path = self.path.with_suffix(".gif")
+        w = _GifStream(self.path, self.fps)
+        w.append_data(first)
+        return w
+
+    def _encode(self) -> None:
+        w = None
+        try:
+            while (frame := self._queue.get()) is not None:
+                if w is None:
+                    w = self._open(frame)
+                else:
+                    w.append_data(frame)
+        except BaseException as exc:
+            self._error = exc
+            # keep draining so the producer never blocks on a dead encoder
+            while self._queue.get() is not None:
+                pass
+        finally:
+            if w is not None:
+                w.close()
+
+
+_worker_renderer: FrameRenderer | None = None
+
+
+def _init_worker(trace: Trace) -> None:
+    global _worker_renderer
+    _worker_renderer = FrameRenderer(trace)
+
+
+def _render_chunk(start: int, stop: int, renderer: FrameRenderer | None = None) -> List[np.ndarray]:
+    renderer = renderer or _worker_renderer
+    return [np.asarray(renderer.render(i)) for i in range(start, stop)]
+
+
+def render_trace(
+    trace: Trace,
+    out: Path,
+    workers: int | None = None,
+    max_memory: int = 64 << 20,
+    chunk: int = 8,
+    progress: Callable[[int, int], None] | None = None,
+) -> Path:
+    """Draw every frame of `trace` and stream them, in order, to `out`; returns the file written.
+
+    With workers > 0 frames are drawn by a process pool that receives the
+    trace once; chunks are submitted only while the frames in flight fit in
+    half of `max_memory` (the encoder queue gets the other half).
+    `progress(done, total)` is called about every 1% of frames.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else int(workers)
+    frame_bytes = FRAME_SIZE[0] * FRAME_SIZE[1] * 3
+    if max_memory < 2 * frame_bytes:
+        raise ValueError(f"max_memory must hold at least two {FRAME_SIZE[0]}x{FRAME_SIZE[1]} frames ({2 * frame_bytes} bytes)")
+    chunk = max(1, min(chunk, (max_memory // 2) // frame_bytes))
+    total = len(trace)
+    every = max(1, total // 100)
+    with FrameWriter(out, trace.fps, FRAME_SIZE, max_memory // 2) as writer:
+
+        def emit(frames: List[np.ndarray]) -> None:
+            for frame in frames:
+                writer.write(frame)
+                if progress is not None and (writer.frames % every == 0 or writer.frames == total):
+                    progress(writer.frames, total)
+
+        if workers <= 0:
+            renderer = FrameRenderer(trace)
+            for i in range(total):
+                emit([np.asarray(renderer.render(i))])
+        else:
+            in_flight = max(1, (max_memory // 2) // (chunk * frame_bytes))
+            with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn"), initializer=_init_worker, initargs=(trace,)) as pool:
+                pending: deque = deque()
+                for s in range(0, total, chunk):
+                    if len(pending) >= in_flight:
+                        emit(pending.popleft().result())
+                    pending.append(pool.submit(_render_chunk, s, min(s + chunk, total)))
+                while pending:
+                    emit(pending.popleft().result())
+    # closing the writer settles the MP4 -> GIF fallback
+    return writer.path
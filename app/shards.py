@@ -0,0 +1,353 @@
+from __future__ import annotations
+import asyncio
+import itertools
+import logging
+import multiprocessing as mp
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from .event_log import EventLog
+from .sim_clock import FixedStepClock
+from .telemetry import TelemetryStore
+from .world import World
+
+logger = logging.getLogger("smartcore.shards")
+
+LOG_FLUSH_SECONDS = 1.0  # how often hosted event logs are flushed
+
+
+class ShardError(RuntimeError):
+    """Raised when a shard worker fails to handle a routed message."""
+
+
+def shard_index(session: str, shards: int) -> int:
+    """Stable session -> shard mapping (independent of PYTHONHASHSEED)."""
+    return zlib.crc32(session.encode("utf-8")) % max(1, shards)
+
+
+class LocalHost:
+    """Hosts every session's World in the current process.
+
+    With `sim_hz > 0` every hosted world is advanced on a fixed-step clock,
+    independently of how often clients ask for state, and event logs are
+    flushed every LOG_FLUSH_SECONDS. Worlds not addressed
+    for `idle_timeout` seconds are dropped, and past `max_sessions` the least
+    recently used one makes room for a new session (0 disables either).
+    """
+
+    def __init__(self, sim_hz: float = 0.0, max_catchup: int = 5, headless: bool = False, event_log_dir: str = "", telemetry_dir: str = "", idle_timeout: float = 0.0, max_sessions: int = 0) -> None:
+        self.worlds: Dict[str, World] = {}
+        self.event_log_dir = event_log_dir
+        self.telemetry: Optional[TelemetryStore] = TelemetryStore(telemetry_dir) if telemetry_dir else None
+        self.clock: Optional[FixedStepClock] = FixedStepClock(sim_hz, max_catchup, headless) if sim_hz > 0 else None
+        self.idle_timeout = float(idle_timeout)
+        self.max_sessions = int(max_sessions)
+        self.evicted = 0
+        self._used: Dict[str, float] = {}  # session -> last use, least recent first
+        self._next_log_flush = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def world(self, session: str) -> World:
+        now = time.monotonic()
+        self.evict_idle(now)
+        w = self.worlds.get(session)
+        if w is None:
+            if self.max_sessions > 0 and len(self.worlds) >= self.max_sessions:
+                self._evict(next(iter(self._used)))
+            w = self.worlds[session] = World(session)
+            self._attach_log(w)
+        self._touch(session, now)
+        return w
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """Drop worlds idle for longer than idle_timeout; returns how many."""
+        if self.idle_timeout <= 0:
+            return 0
+        now = time.monotonic() if now is None else now
+        idle = []
+        for session, t in self._used.items():
+            if now - t <= self.idle_timeout:
+                break
+            idle.append(session)
+        for session in idle:
+            self._evict(session)
+        return len(idle)
+
+    def _touch(self, session: str, now: float) -> None:
+        self._used.pop(session, None)
+        self._used[session] = now
+
+    def _evict(self, session: str) -> None:
+        self._used.pop(session, None)
+        w = self.worlds.pop(session, None)
+        if w is not None and w.log is not None:
+            w.log.close()
+        self.evicted += 1
+        logger.info("session_evicted", extra={"session": session})
+
+    def start(self) -> None:
+        if (self.clock is not None or self.event_log_dir) and self._task is None:
+            if self.clock is not None:
+                self.clock.start()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        for w in self.worlds.values():
+            if w.log is not None:
+                w.log.close()
+        if self.telemetry is not None:
+            self.telemetry.flush()
+
+    async def call(self, session: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        return self.world(session).handle(message)
+
+    async def stats(self) -> list[Dict[str, Any]]:
+        return [self.sim_stats()]
+
+    async def export_states(self) -> Dict[str, Dict[str, Any]]:
+        return self.export()
+
+    async def restore_states(self, states: Dict[str, Dict[str, Any]]) -> int:
+        return self.restore(states)
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        return {session: w.export_state() for session, w in self.worlds.items()}
+
+    def restore(self, states: Dict[str, Dict[str, Any]]) -> int:
+        """Replace hosted worlds with checkpointed ones; returns how many were restored.
+
+        Every state is rebuilt before any world is replaced, so a bad one
+        (ValueError) leaves the hosted worlds untouched.
+        """
+        worlds = {session: World.from_state(state) for session, state in states.items()}
+        now = time.monotonic()
+        for session, w in worlds.items():
+            old = self.worlds.get(session)
+            if old is not None and old.log is not None:
+                old.log.close()
+            self.worlds[session] = w
+            self._touch(session, now)
+            self._attach_log(w, base=states[session])
+        return len(worlds)
+
+    def _attach_log(self, w: World, base: Dict[str, Any] | None = None) -> None:
+        w.telemetry = self.telemetry
+        if self.event_log_dir:
+            w.log = EventLog.for_session(self.event_log_dir, w.session, w.seed, base)
+
+    def shard_call(self, message: Dict[str, Any]) -> Any:
+        """Shard-level (session-less) operations: stats, export, restore."""
+        op = message.get("op", "stats")
+        if op == "export":
+            return self.export()
+        if op == "restore":
+            return self.restore(message.get("worlds") or {})
+        return self.sim_stats()
+
+    def sim_stats(self) -> Dict[str, Any]:
+        stats = self.clock.stats() if self.clock is not None else {"hz": 0.0}
+        stats["worlds"] = len(self.worlds)
+        stats["evicted"] = self.evicted
+        return stats
+
+    def simulate_due(self) -> int:
+        """Run every fixed step that has come due; returns the step count."""
+        steps = self.clock.due() if self.clock is not None else 0
+        dt = self.clock.dt if self.clock is not None else 0.0
+        if steps:
+            self.evict_idle()
+        for _ in range(steps):
+            for w in self.worlds.values():
+                w.advance(dt)
+        return steps
+
+    def flush_logs(self, now: float | None = None) -> None:
+        """Flush every event log once LOG_FLUSH_SECONDS have passed since the last time."""
+        if not self.event_log_dir:
+            return
+        now = time.monotonic() if now is None else now
+        if now < self._next_log_flush:
+            return
+        self._next_log_flush = now + LOG_FLUSH_SECONDS
+        for w in self.worlds.values():
+            if w.log is not None:
+                w.log.flush()
+
+    def wait_time(self) -> Optional[float]:
+        """Seconds until simulate_due or flush_logs has work again (None: never)."""
+        waits = []
+        if self.clock is not None:
+            waits.append(self.clock.time_to_next())
+        if self.event_log_dir:
+            waits.append(max(0.0, self._next_log_flush - time.monotonic()))
+        return min(waits) if waits else None
+
+    async def _run(self) -> None:
+        while True:
+            self.simulate_due()
+            self.flush_logs()
+            # headless: time_to_next() is 0, yield so I/O still gets served
+            await asyncio.sleep(self.wait_time())
+
+
+def _serve(conn, sim_hz: float = 0.0, max_catchup: int = 5, headless: bool = False, event_log_dir: str = "", telemetry_dir: str = "", idle_timeout: float = 0.0, max_sessions: int = 0) -> None:
+    """Shard worker entry point: apply routed messages to locally hosted worlds.
+
+    Between messages the worker runs its own fixed-step simulation clock
+    and flushes its event logs.
+    """
+    host = LocalHost(sim_hz, max_catchup, headless, event_log_dir, telemetry_dir, idle_timeout, max_sessions)
+    if host.clock is not None:
+        host.clock.start()
+    while True:
+        # every iteration, so a steady stream of messages cannot starve the clock
+        host.simulate_due()
+        host.flush_logs()
+        try:
+            if not conn.poll(host.wait_time()):
+                continue
+            item = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if item is None:
+            break
+        rid, session, message = item
+        try:
+            # session None addresses the shard itself
+            reply = host.shard_call(message) if session is None else host.world(session).handle(message)
+            conn.send((rid, True, reply))
+        except Exception as exc:
+            conn.send((rid, False, f"{type(exc).__name__}: {exc}"))
+    host.close()
+
+
+class ShardPool:
+    """Hashes sessions across worker processes connected by duplex pipes.
+
+    Requests are pipelined: call() sends (id, session, message) to the owning
+    shard and awaits a future that a per-shard reader thread resolves. If a
+    worker exits, its pending and later requests fail with ShardError.
+    """
+
+    def __init__(self, workers: int, sim_hz: float = 0.0, max_catchup: int = 5, headless: bool = False, event_log_dir: str = "", telemetry_dir: str = "", idle_timeout: float = 0.0, max_sessions: int = 0) -> None:
+        self.workers = max(1, int(workers))
+        # the session cap is split across shards
+        per_shard = -(-int(max_sessions) // self.workers) if max_sessions > 0 else 0
+        self._sim_args = (sim_hz, max_catchup, headless, event_log_dir, telemetry_dir, idle_timeout, per_shard)
+        self._ctx = mp.get_context("spawn")
+        self._conns: list = []
+        self._procs: list = []
+        self._send_locks = [threading.Lock() for _ in range(self.workers)]
+        self._pending: Dict[int, Tuple[int, asyncio.Future]] = {}  # rid -> (shard, future)
+        self._dead: list[bool] = []
+        self._ids = itertools.count()
+
+    def start(self) -> None:
+        if self._procs:
+            return
+        self._dead = [False] * self.workers
+        for i in range(self.workers):
+            parent, child = self._ctx.Pipe(duplex=True)
+            proc = self._ctx.Process(target=_serve, args=(child, *self._sim_args), name=f"smartcore-shard-{i}", daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+            threading.Thread(target=self._reader, args=(i, parent), name=f"shard-reader-{i}", daemon=True).start()
+        logger.info("shards_started", extra={"workers": self.workers})
+
+    def close(self) -> None:
+        for conn, lock in zip(self._conns, self._send_locks):
+            try:
+                with lock:
+                    conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=2.0)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._procs = [], []
+
+    def shard_of(self, session: str) -> int:
+        return shard_index(session, self.workers)
+
+    async def call(self, session: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request(self.shard_of(session), session, message)
+
+    async def stats(self) -> list[Dict[str, Any]]:
+        return list(await asyncio.gather(*(self._request(i, None, {}) for i in range(self.workers))))
+
+    async def export_states(self) -> Dict[str, Dict[str, Any]]:
+        states: Dict[str, Dict[str, Any]] = {}
+        for part in await asyncio.gather(*(self._request(i, None, {"op": "export"}) for i in range(self.workers))):
+            states.update(part)
+        return states
+
+    async def restore_states(self, states: Dict[str, Dict[str, Any]]) -> int:
+        # a checkpoint may come from a different worker count: re-hash every session
+        parts: list[Dict[str, Any]] = [{} for _ in range(self.workers)]
+        for session, state in states.items():
+            parts[self.shard_of(session)][session] = state
+        counts = await asyncio.gather(*(self._request(i, None, {"op": "restore", "worlds": p}) for i, p in enumerate(parts) if p))
+        return sum(counts)
+
+    async def _request(self, idx: int, session: Optional[str], message: Dict[str, Any]) -> Dict[str, Any]:
+        if not self._procs:
+            raise ShardError("shard pool is not running")
+        fut = asyncio.get_running_loop().create_future()
+        rid = next(self._ids)
+        self._pending[rid] = (idx, fut)
+        # checked after registering: the reader marks a shard dead before failing its pending requests
+        if self._dead[idx] or not self._procs[idx].is_alive():
+            self._pending.pop(rid, None)
+            raise ShardError(f"shard {idx} is not running")
+        try:
+            with self._send_locks[idx]:
+                self._conns[idx].send((rid, session, message))
+        except (OSError, BrokenPipeError) as exc:
+            self._pending.pop(rid, None)
+            raise ShardError(f"shard {idx} is not running") from exc
+        except Exception:
+            self._pending.pop(rid, None)
+            raise
+        return await fut
+
+    def _reader(self, idx: int, conn) -> None:
+        while True:
+            try:
+                rid, ok, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+            entry = self._pending.pop(rid, None)
+            if entry is not None:
+                fut = entry[1]
+                fut.get_loop().call_soon_threadsafe(_resolve, fut, ok, payload)
+        # the worker exited (or the pool closed): nothing will answer this shard's requests
+        self._dead[idx] = True
+        for rid, (shard, fut) in list(self._pending.items()):
+            if shard == idx and self._pending.pop(rid, None) is not None:
+                fut.get_loop().call_soon_threadsafe(_resolve, fut, False, f"shard {idx} exited")
+
+
+def _resolve(fut: asyncio.Future, ok: bool, payload: Any) -> None:
+    if fut.done():
+        return
+    if ok:
+        fut.set_result(payload)
+    else:
+        fut.set_exception(ShardError(payload))
+
+
+def create_host(workers: int, sim_hz: float = 0.0, max_catchup: int = 5, headless: bool = False, event_log_dir: str = "", telemetry_dir: str = "", idle_timeout: float = 0.0, max_sessions: int = 0):
+    """In-process host when workers <= 0, otherwise a sharded process pool."""
+    if workers > 0:
+        return ShardPool(workers, sim_hz, max_catchup, headless, event_log_dir, telemetry_dir, idle_timeout, max_sessions)
+    return LocalHost(sim_hz, max_catchup, headless, event_log_dir, telemetry_dir, idle_timeout, max_sessions)
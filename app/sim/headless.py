@@ -0,0 +1,179 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.agency.needs_planner import ACTIONS
+from app.world import World
+
+COLUMNS = ("t", "x", "y", "yaw", "hunger", "fatigue", "curiosity", "threat", "bpm", "activity", "action")
+
+DEFAULT_OBJECTS = [
+    {"id": "food1", "x": 120.0, "y": 90.0, "tag": "food"},
+    {"id": "haz1", "x": 420.0, "y": 280.0, "tag": "hazard"},
+    {"id": "o1", "x": 260.0, "y": 60.0, "tag": ""},
+]
+
+
+@dataclass
+class Scenario:
+    """Scripted headless run: initial objects plus timed signal/vision events.
+
+    Each schedule entry is `{"at": seconds, ...}` with any of `threat`,
+    `stimulation`, `food_available`, a full `objects` list or an
+    `add`/`update`/`remove` vision diff. `params` overrides tunables by dotted
+    name: `gains.<field>`, `policy.<attr>` or `planner.<coefficient>`.
+    """
+
+    objects: List[dict] = field(default_factory=lambda: [dict(o) for o in DEFAULT_OBJECTS])
+    schedule: List[dict] = field(default_factory=list)
+    seconds: float = 60.0
+    dt: float = 0.1
+    seed: int = 7
+    decide_every: float = 1.0  # seconds between decide/enact/reward ticks
+    record_every: int = 1  # keep every Nth step in the trajectory
+    params: Dict[str, float] = field(default_factory=dict)
+    hungry_above: float = 0.6  # hunger level counted as "hungry" in metrics
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Scenario":
+        known = {k: data[k] for k in cls.__dataclass_fields__ if k in data}
+        return cls(**known)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Scenario":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+@dataclass
+class RunResult:
+    trajectory: np.ndarray  # (rows, len(COLUMNS)) float32
+    steps: int
+    elapsed: float
+    metrics: Dict[str, float] = field(default_factory=dict)
+    stopped: bool = False  # halted early by a metric limit
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, trajectory=self.trajectory, columns=np.array(COLUMNS))
+        return path
+
+
+class HeadlessRunner:
+    """Steps one World (agency, body, policy) as fast as possible, deterministically.
+
+    All randomness comes from the World's seeded Policy RNG, so runs with the
+    same scenario reproduce exactly even when many run side by side.
+    """
+
+    def __init__(self, scenario: Scenario) -> None:
+        self.scenario = scenario
+        self.world = World("headless", seed=scenario.seed)
+        self.world.vision(scenario.objects)
+        apply_params(self.world, scenario.params)
+        self.food_available = False
+        self.t = 0.0
+        self.metrics = {"time_hungry": 0.0, "threat_exposure": 0.0, "distance": 0.0}
+
+    def run(self, limits: Dict[str, float] | None = None) -> RunResult:
+        """Run the scenario; stops early once any metric exceeds its entry in `limits`."""
+        sc, world = self.scenario, self.world
+        steps = int(round(sc.seconds / sc.dt))
+        every = max(1, int(sc.record_every))
+        traj = np.zeros(((steps + every - 1) // every, len(COLUMNS)), dtype=np.float32)
+        events = sorted(sc.schedule, key=lambda e: float(e.get("at", 0.0)))
+        next_evt = 0
+        decide_steps = max(1, int(round(sc.decide_every / sc.dt)))
+        action = len(ACTIONS) - 1  # think
+
+        limits = limits or {}
+        m = self.metrics
+        drives, body = world.agency.drives, world.body
+        stopped = False
+        t0 = time.perf_counter()
+        for i in range(steps):
+            self.t = i * sc.dt
+            while next_evt < len(events) and float(events[next_evt].get("at", 0.0)) <= self.t:
+                self.apply_event(events[next_evt])
+                next_evt += 1
+            px, py = body.state.x, body.state.y
+            world.advance(sc.dt, drives=True)
+            m["distance"] += math.hypot(body.state.x - px, body.state.y - py)
+            m["threat_exposure"] += drives.threat * sc.dt
+            if drives.hunger > sc.hungry_above:
+                m["time_hungry"] += sc.dt
+            if i % decide_steps == 0:
+                res = world.tick(0.0, self.food_available)
+                action = ACTIONS.index(res["plan"]["action"]) if res["plan"]["action"] in ACTIONS else -1
+            if i % every == 0:
+                self._record(traj[i // every], action)
+            if limits and any(m[k] > v for k, v in limits.items()):
+                stopped, steps, traj = True, i + 1, traj[: i // every + 1]
+                break
+        elapsed = time.perf_counter() - t0
+        return RunResult(trajectory=traj, steps=steps, elapsed=elapsed, metrics=dict(m), stopped=stopped)
+
+    def apply_event(self, evt: Dict[str, Any]) -> None:
+        world = self.world
+        if "food_available" in evt:
+            self.food_available = bool(evt["food_available"])
+        if "threat" in evt or "stimulation" in evt:
+            world.sense(evt.get("threat"), bool(evt.get("stimulation", False)))
+        if "objects" in evt:
+            world.vision(evt["objects"])
+        elif any(k in evt for k in ("add", "update", "remove")):
+            world.vision(add=evt.get("add"), update=evt.get("update"), remove=evt.get("remove"))
+
+    def _record(self, row: np.ndarray, action: int) -> None:
+        b, a = self.world.body.state, self.world.agency
+        d = a.drives
+        row[:] = (self.t, b.x, b.y, b.yaw, d.hunger, d.fatigue, d.curiosity, d.threat, a.heart.state.bpm, self.world.body.activity(), action)
+
+
+def apply_params(world: World, params: Dict[str, float]) -> None:
+    targets = {"gains": world.agency.drives.gains, "policy": world.policy, "planner": world.agency.planner}
+    for name, value in params.items():
+        group, _, attr = name.partition(".")
+        target = targets.get(group)
+        if target is None or not hasattr(target, attr):
+            raise ValueError(f"unknown parameter: {name}")
+        setattr(target, attr, float(value))
+    # the world's nav field (and query radius) follows policy.sigma on its next move
+
+
+def run_scenario(scenario: Scenario, limits: Dict[str, float] | None = None) -> RunResult:
+    return HeadlessRunner(scenario).run(limits)
+
+
+def main(argv: List[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Run a deterministic headless simulation and report steps/s")
+    p.add_argument("scenario", nargs="?", help="Scenario JSON (objects, schedule, seconds, dt, seed)")
+    p.add_argument("--out", help="Write the trajectory to this .npz file")
+    p.add_argument("--seconds", type=float)
+    p.add_argument("--dt", type=float)
+    p.add_argument("--seed", type=int)
+    args = p.parse_args(argv)
+
+    scenario = Scenario.load(args.scenario) if args.scenario else Scenario()
+    for name in ("seconds", "dt", "seed"):
+        if getattr(args, name) is not None:
+            setattr(scenario, name, getattr(args, name))
+    result = run_scenario(scenario)
+    print(f"{result.steps} steps in {result.elapsed:.3f}s -> {result.steps_per_second:,.0f} steps/s")
+    if args.out:
+        print(f"Saved trajectory to {result.save(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
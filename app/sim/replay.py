@@ -0,0 +1,112 @@
+from __future__ import annotations
+import argparse
+import bisect
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from app.event_log import base_state, read_log
+from app.world import World
+
+
+class Replayer:
+    """Re-applies an event log to a fresh World as fast as it can.
+
+    The world starts from the log's seed (or its base checkpoint) and every
+    recorded command goes through World.apply without building replies (after
+    the clock steps logged with it), so a replay reproduces the original state
+    exactly. Every `snapshot_every` events
+    the world state is kept in memory, letting seek() jump to any event by
+    restoring the nearest earlier snapshot and replaying only the remainder.
+    """
+
+    def __init__(self, path: str | Path, snapshot_every: int = 2000) -> None:
+        self.path = Path(path)
+        self.header, events = read_log(self.path)
+        self.events: List[Dict[str, Any]] = list(events)
+        self.snapshot_every = max(1, int(snapshot_every))
+        self._snapshots: List[Tuple[int, Dict[str, Any]]] = []  # (events applied, state)
+        self.world = self._initial_world()
+        self.position = 0  # number of events applied to self.world
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def run(self, to: int | None = None) -> Dict[str, Any]:
+        """Replay forward up to event index `to` (default: the whole log); returns speed stats."""
+        end = len(self.events) if to is None else max(0, min(int(to), len(self.events)))
+        if end < self.position:
+            return self.seek(end)
+        start = self.position
+        t0 = time.perf_counter()
+        apply, advance, events, world = self.world.apply, self.world.advance, self.events, self.world
+        for i in range(start, end):
+            if i % self.snapshot_every == 0 and (not self._snapshots or self._snapshots[-1][0] < i):
+                self._snapshots.append((i, world.export_state()))
+            event = events[i]
+            clock = event.get("clock")
+            if clock is not None:
+                dt, drives = clock["dt"], clock.get("drives", False)
+                for _ in range(clock["steps"]):
+                    advance(dt, drives)
+            if "msg" in event:
+                apply(event["msg"])
+        self.position = end
+        elapsed = time.perf_counter() - t0
+        return self._stats(start, end, elapsed)
+
+    def seek(self, index: int) -> Dict[str, Any]:
+        """Put the world at the state after `index` events, via the nearest snapshot."""
+        index = max(0, min(int(index), len(self.events)))
+        k = bisect.bisect_right([s[0] for s in self._snapshots], index) - 1
+        pos = self._snapshots[k][0] if k >= 0 else 0
+        # restore when going backwards, or when a snapshot lies ahead of the current position
+        if index < self.position or pos > self.position:
+            if k >= 0:
+                self.world, self.position = World.from_state(self._snapshots[k][1]), pos
+            else:
+                self.world, self.position = self._initial_world(), 0
+        return self.run(index)
+
+    def _initial_world(self) -> World:
+        base = base_state(self.header)
+        return World.from_state(base) if base is not None else World(self.header["session"], seed=self.header["seed"])
+
+    def _stats(self, start: int, end: int, elapsed: float) -> Dict[str, Any]:
+        span = 0.0
+        if end > start:
+            first = self.events[start - 1]["t"] if start > 0 else self.header.get("created", self.events[0]["t"])
+            span = self.events[end - 1]["t"] - first
+        return {
+            "events": end - start,
+            "position": self.position,
+            "elapsed": elapsed,
+            "events_per_sec": (end - start) / elapsed if elapsed > 0 else float("inf"),
+            "recorded_seconds": span,
+            "speedup": span / elapsed if elapsed > 0 else float("inf"),
+        }
+
+
+def main(argv: List[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Deterministically replay a world event log")
+    p.add_argument("log", help="Event log (.jsonl) written with EVENT_LOG_DIR")
+    p.add_argument("--to", type=int, default=None, help="Stop after this many events")
+    p.add_argument("--snapshot-every", type=int, default=2000)
+    p.add_argument("--out", help="Write the final world snapshot as JSON")
+    args = p.parse_args(argv)
+
+    rp = Replayer(args.log, args.snapshot_every)
+    stats = rp.run(args.to)
+    print(
+        f"{stats['events']} events in {stats['elapsed']:.3f}s "
+        f"({stats['events_per_sec']:,.0f} ev/s, {stats['speedup']:,.0f}x real time)"
+    )
+    if args.out:
+        snap = rp.world.snapshot()
+        Path(args.out).write_text(json.dumps(snap, ensure_ascii=False), encoding="utf-8")
+        print(f"Saved final state to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
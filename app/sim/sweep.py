@@ -0,0 +1,198 @@
+from __future__ import annotations
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app.sim.headless import Scenario, run_scenario
+
+METRICS = ("time_hungry", "threat_exposure", "distance")
+
+
+def grid(space: Dict[str, List[float]]) -> Iterator[Dict[str, float]]:
+    """Cartesian product of per-parameter value lists."""
+    names = sorted(space)
+    for values in itertools.product(*(space[n] for n in names)):
+        yield dict(zip(names, values))
+
+
+def random_search(space: Dict[str, Tuple[float, float]], samples: int, seed: int = 0) -> Iterator[Dict[str, float]]:
+    """Uniform samples from per-parameter [lo, hi] ranges (reproducible by seed)."""
+    rng = random.Random(seed)
+    names = sorted(space)
+    for _ in range(samples):
+        yield {n: rng.uniform(float(space[n][0]), float(space[n][1])) for n in names}
+
+
+@dataclass
+class SweepSpec:
+    """A sweep: base scenario x parameter configs x replicate seeds.
+
+    `grid` lists values per dotted parameter name (see Scenario.params); `space`
+    with `samples` draws random configs instead. The objective is a weighted sum
+    of metrics (lower is better); `limits` abort individual runs early and
+    `patience` stops the sweep after that many finished runs (config x seed)
+    without improvement.
+    """
+
+    scenario: Dict[str, Any] = field(default_factory=dict)
+    grid: Dict[str, List[float]] = field(default_factory=dict)
+    space: Dict[str, List[float]] = field(default_factory=dict)
+    samples: int = 0
+    sample_seed: int = 0
+    seeds: List[int] = field(default_factory=lambda: [0])
+    objective: Dict[str, float] = field(default_factory=lambda: {"time_hungry": 1.0, "threat_exposure": 1.0})
+    limits: Dict[str, float] = field(default_factory=dict)
+    patience: int = 0
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SweepSpec":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(**{k: data[k] for k in cls.__dataclass_fields__ if k in data})
+
+    def configs(self) -> List[Dict[str, float]]:
+        if self.space and self.samples:
+            return list(random_search({k: tuple(v) for k, v in self.space.items()}, self.samples, self.sample_seed))
+        return list(grid(self.grid)) if self.grid else [{}]
+
+    def score(self, metrics: Dict[str, float]) -> float:
+        return sum(w * float(metrics.get(k, 0.0)) for k, w in self.objective.items())
+
+
+def run_key(params: Dict[str, float], seed: int) -> str:
+    """Stable identity of one run, used to resume from the results table."""
+    return json.dumps({"params": params, "seed": seed}, sort_keys=True)
+
+
+def _run_one(scenario: Dict[str, Any], params: Dict[str, float], seed: int, limits: Dict[str, float]) -> Dict[str, Any]:
+    sc = Scenario.from_dict({**scenario, "params": {**scenario.get("params", {}), **params}, "seed": seed})
+    sc.record_every = max(sc.record_every, int(round(sc.seconds / sc.dt)))  # metrics only; skip the trajectory
+    res = run_scenario(sc, limits)
+    return {**res.metrics, "steps": res.steps, "elapsed": res.elapsed, "stopped": int(res.stopped)}
+
+
+class Sweep:
+    """Runs a SweepSpec across a process pool, appending one CSV row per run.
+
+    The CSV doubles as the checkpoint: rerunning with the same output file skips
+    runs whose key is already recorded, so an interrupted sweep picks up where it
+    left off. `workers=0` runs inline.
+    """
+
+    def __init__(self, spec: SweepSpec, out: str | Path, workers: int | None = None) -> None:
+        self.spec = spec
+        self.out = Path(out)
+        self.workers = (os.cpu_count() or 1) if workers is None else int(workers)
+        self.param_names = sorted({k for c in spec.configs() for k in c})
+        self.columns = ["key", "seed", *self.param_names, *METRICS, "score", "steps", "elapsed", "stopped"]
+        self.best: Dict[str, Any] | None = None
+        self.completed = 0
+        self.skipped = 0
+        self._since_best = 0
+
+    def done_keys(self) -> set:
+        if not self.out.exists():
+            return set()
+        with self.out.open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            self._track(row)
+        return {row["key"] for row in rows}
+
+    def pending(self, done: set) -> List[Tuple[Dict[str, float], int]]:
+        runs = [(c, s) for c in self.spec.configs() for s in self.spec.seeds]
+        return [(c, s) for c, s in runs if run_key(c, s) not in done]
+
+    def run(self) -> Dict[str, Any] | None:
+        done = self.done_keys()
+        self.skipped = len(done)
+        todo = self.pending(done)
+        self.out.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.out.exists() or self.out.stat().st_size == 0
+        with self.out.open("a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns)
+            if new_file:
+                writer.writeheader()
+            if self.workers <= 0:
+                for params, seed in todo:
+                    self._write(writer, f, params, seed, _run_one(self.spec.scenario, params, seed, self.spec.limits))
+                    if self._patience_exhausted():
+                        break
+            else:
+                self._run_pool(writer, f, todo)
+        return self.best
+
+    def _run_pool(self, writer: csv.DictWriter, f, todo: List[Tuple[Dict[str, float], int]]) -> None:
+        queue = iter(todo)
+        inflight: Dict[Any, Tuple[Dict[str, float], int]] = {}
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn")) as pool:
+            def submit() -> bool:
+                nxt = next(queue, None)
+                if nxt is None:
+                    return False
+                inflight[pool.submit(_run_one, self.spec.scenario, nxt[0], nxt[1], self.spec.limits)] = nxt
+                return True
+
+            # keep a couple of runs queued per worker so results stream steadily
+            for _ in range(self.workers * 2):
+                if not submit():
+                    break
+            while inflight:
+                finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    params, seed = inflight.pop(fut)
+                    self._write(writer, f, params, seed, fut.result())
+                if self._patience_exhausted():
+                    for fut in inflight:
+                        fut.cancel()
+                    break
+                for _ in finished:
+                    submit()
+
+    def _write(self, writer: csv.DictWriter, f, params: Dict[str, float], seed: int, result: Dict[str, Any]) -> None:
+        row = {"key": run_key(params, seed), "seed": seed, **params, **result, "score": self.spec.score(result)}
+        writer.writerow({k: row.get(k, "") for k in self.columns})
+        f.flush()
+        self.completed += 1
+        self._track(row)
+
+    def _track(self, row: Dict[str, Any]) -> None:
+        if int(row.get("stopped") or 0):
+            return
+        score = float(row["score"])
+        if self.best is None or score < float(self.best["score"]):
+            self.best = dict(row)
+            self._since_best = 0
+        else:
+            self._since_best += 1
+
+    def _patience_exhausted(self) -> bool:
+        return bool(self.spec.patience) and self._since_best >= self.spec.patience
+
+
+def main(argv: List[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Seeded Monte-Carlo parameter sweep over headless simulations")
+    p.add_argument("spec", help="Sweep JSON (scenario, grid|space+samples, seeds, objective, limits, patience)")
+    p.add_argument("--out", default="data/sweep.csv", help="Results table; reused as the resume checkpoint")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores, 0 = inline)")
+    args = p.parse_args(argv)
+
+    sweep = Sweep(SweepSpec.load(args.spec), args.out, args.workers)
+    t0 = time.perf_counter()
+    best = sweep.run()
+    dt = time.perf_counter() - t0
+    print(f"{sweep.completed} runs in {dt:.1f}s ({sweep.skipped} resumed from {args.out})")
+    if best is not None:
+        print("best:", json.dumps({k: best[k] for k in ("key", "score", *METRICS)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import time
+from typing import Any, Callable, Dict
+
+
+class SlipStats:
+    """Running record of how late scheduled work actually ran."""
+
+    def __init__(self, period: float) -> None:
+        self.period = period
+        self.count = 0
+        self.late = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    def record(self, lag: float) -> None:
+        lag = max(0.0, lag)
+        self.count += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag > 0.5 * self.period:
+            self.late += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "wakeups": self.count,
+            "late_wakeups": self.late,
+            "mean_lag_ms": round(1000.0 * self.total_lag / self.count, 3) if self.count else 0.0,
+            "max_lag_ms": round(1000.0 * self.max_lag, 3),
+        }
+
+
+class FixedStepClock:
+    """Fixed-timestep accumulator decoupling simulation rate from wall-clock jitter.
+
+    due() returns how many `dt` steps to run now. When the loop falls behind by
+    more than `max_catchup` steps the excess is dropped (and counted) rather than
+    spiralling. In headless mode wall time is ignored and every call returns a
+    full batch, so the simulation runs as fast as the CPU allows.
+    """
+
+    def __init__(self, hz: float, max_catchup: int = 5, headless: bool = False, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.hz = float(hz)
+        self.dt = 1.0 / self.hz
+        self.max_catchup = max(1, int(max_catchup))
+        self.headless = headless
+        self._clock = clock
+        self._acc = 0.0
+        self._last: float | None = None
+        self._started: float | None = None
+        self.steps = 0
+        self.dropped_steps = 0
+        self.slip = SlipStats(self.dt)
+
+    def start(self) -> None:
+        self._last = self._started = self._clock()
+        self._acc = 0.0
+
+    def due(self) -> int:
+        if self._last is None:
+            self.start()
+        now = self._clock()
+        if self.headless:
+            self._last = now
+            self.steps += self.max_catchup
+            return self.max_catchup
+        self._acc += now - self._last
+        self._last = now
+        steps = int(self._acc // self.dt)
+        if steps <= 0:
+            return 0
+        # how long the first pending step waited past its boundary
+        self.slip.record(self._acc - self.dt)
+        if steps > self.max_catchup:
+            self.dropped_steps += steps - self.max_catchup
+            steps = self.max_catchup
+            self._acc = self._acc % self.dt
+        else:
+            self._acc -= steps * self.dt
+        self.steps += steps
+        return steps
+
+    def time_to_next(self) -> float:
+        if self.headless or self._last is None:
+            return 0.0
+        return max(0.0, self.dt - self._acc - (self._clock() - self._last))
+
+    def stats(self) -> Dict[str, Any]:
+        wall = (self._clock() - self._started) if self._started is not None else 0.0
+        sim = self.steps * self.dt
+        return {
+            "hz": self.hz,
+            "headless": self.headless,
+            "steps": self.steps,
+            "dropped_steps": self.dropped_steps,
+            "sim_seconds": round(sim, 3),
+            "wall_seconds": round(wall, 3),
+            "realtime_factor": round(sim / wall, 3) if wall > 0 else 0.0,
+            **self.slip.as_dict(),
+        }
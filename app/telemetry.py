@@ -0,0 +1,179 @@
+from __future__ import annotations
+import hashlib
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .event_log import safe_name
+
+# (name, seconds per point, capacity): 1 h of 1 s samples, 7 days of minutes, 1 year of hours
+RESOLUTIONS: Tuple[Tuple[str, float, int], ...] = (("raw", 1.0, 3600), ("1m", 60.0, 10080), ("1h", 3600.0, 8760))
+ROW = np.dtype([("t", "<f8"), ("min", "<f4"), ("max", "<f4"), ("mean", "<f4"), ("n", "<u4")])
+# rollup bucket still being filled, one per resolution (n = 0: none)
+OPEN = np.dtype([("start", "<f8"), ("min", "<f4"), ("max", "<f4"), ("sum", "<f8"), ("n", "<u4")])
+
+
+def dir_name(name: str) -> str:
+    """Readable, collision-free directory name: sanitized prefix plus a hash of the exact name."""
+    return f"{safe_name(name)[:48]}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _mapped(path: Path | None, dtype: np.dtype, n: int) -> np.ndarray:
+    """n zeroed records, or a memory map of `path` (reset if its size does not match)."""
+    if path is None:
+        return np.zeros(n, dtype=dtype)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fresh = not path.exists() or path.stat().st_size != n * dtype.itemsize
+    return np.memmap(path, dtype=dtype, mode="w+" if fresh else "r+", shape=(n,))
+
+
+class Ring:
+    """Fixed-capacity ring of ROW records, memory-mapped when given a path.
+
+    Rows carry their own timestamps (0 = empty), so the write position is
+    recovered on reopen without a separate header.
+    """
+
+    def __init__(self, capacity: int, path: Path | None = None) -> None:
+        self.capacity = int(capacity)
+        self.rows = _mapped(path, ROW, self.capacity)
+        t = self.rows["t"]
+        self.head = int((np.argmax(t) + 1) % self.capacity) if t.any() else 0
+
+    def append(self, t: float, lo: float, hi: float, mean: float, n: int) -> None:
+        self.rows[self.head] = (t, lo, hi, mean, n)
+        self.head = (self.head + 1) % self.capacity
+
+    def covers(self, start: float) -> bool:
+        """True unless samples at or after `start` may already have been overwritten."""
+        t = self.rows["t"]
+        return not t[self.head] > 0 or float(t.min()) <= start
+
+    def range(self, start: float, end: float) -> np.ndarray:
+        t = self.rows["t"]
+        sel = self.rows[(t > 0) & (t >= start) & (t <= end)]
+        return sel[np.argsort(sel["t"], kind="stable")]
+
+    def flush(self) -> None:
+        if isinstance(self.rows, np.memmap):
+            self.rows.flush()
+
+
+class Series:
+    """One metric at every resolution; rollups keep min/max/mean per bucket.
+
+    Open rollup buckets are kept in `open.bin` next to the rings, so a
+    restart resumes them instead of writing a second row for the same bucket.
+    """
+
+    def __init__(self, directory: Path | None, resolutions=RESOLUTIONS) -> None:
+        self.resolutions = resolutions
+        self.rings = {name: Ring(cap, None if directory is None else directory / f"{name}.ring") for name, _, cap in resolutions}
+        self.open = _mapped(None if directory is None else directory / "open.bin", OPEN, len(resolutions))
+
+    def record(self, t: float, v: float) -> None:
+        o = self.open
+        for k, (name, step, _) in enumerate(self.resolutions):
+            if step <= 1.0:
+                self.rings[name].append(t, v, v, v, 1)
+                continue
+            start = math.floor(t / step) * step
+            if o["n"][k] and o["start"][k] != start:
+                self.rings[name].append(o["start"][k], o["min"][k], o["max"][k], o["sum"][k] / o["n"][k], int(o["n"][k]))
+                o["n"][k] = 0
+            if not o["n"][k]:
+                o[k] = (start, v, v, v, 1)
+            else:
+                o[k] = (start, min(o["min"][k], v), max(o["max"][k], v), o["sum"][k] + v, o["n"][k] + 1)
+
+    def pick(self, start: float, end: float, max_points: int) -> str:
+        """Finest resolution that still covers `start` and fits in max_points."""
+        span = max(0.0, end - start)
+        for name, step, _ in self.resolutions:
+            if span / step <= max_points and self.rings[name].covers(start):
+                return name
+        # nothing covers the whole window: the coarsest still has the most history
+        return self.resolutions[-1][0]
+
+    def query(self, start: float, end: float, max_points: int = 1000) -> Dict[str, Any]:
+        name = self.pick(start, end, max_points)
+        rows = self.rings[name].range(start, end)
+        k = [r[0] for r in self.resolutions].index(name)
+        b = self.open[k]
+        if b["n"] and start <= b["start"] <= end:
+            # include the bucket still being filled
+            rows = np.concatenate([rows, np.array([(b["start"], b["min"], b["max"], b["sum"] / b["n"], b["n"])], dtype=ROW)])
+        return {
+            "resolution": name,
+            "t": rows["t"].tolist(),
+            "min": rows["min"].tolist(),
+            "max": rows["max"].tolist(),
+            "mean": rows["mean"].tolist(),
+        }
+
+    def flush(self) -> None:
+        for ring in self.rings.values():
+            ring.flush()
+        if isinstance(self.open, np.memmap):
+            self.open.flush()
+
+
+class TelemetryStore:
+    """Per-session, per-metric multi-resolution series.
+
+    With a directory every ring is a memory-mapped file under
+    `<dir>/<session>/<metric>/<resolution>.ring` and survives restarts, the
+    directory names coming from dir_name() and each metric directory
+    holding its exact name in `name`; without one the rings live in memory.
+    Reads never create series: unknown metrics query as empty.
+    """
+
+    def __init__(self, directory: str | Path | None = None, resolutions=RESOLUTIONS) -> None:
+        self.directory = Path(directory) if directory else None
+        self.resolutions = resolutions
+        self._series: Dict[Tuple[str, str], Series] = {}
+
+    def path(self, session: str, metric: str) -> Path | None:
+        return None if self.directory is None else self.directory / dir_name(session) / dir_name(metric)
+
+    def series(self, session: str, metric: str, create: bool = True) -> Series | None:
+        key = (session, metric)
+        s = self._series.get(key)
+        if s is None:
+            d = self.path(session, metric)
+            exists = d is not None and (d / "name").is_file()
+            if not create and not exists:
+                return None
+            s = self._series[key] = Series(d, self.resolutions)
+            if d is not None and not exists:
+                (d / "name").write_text(metric, encoding="utf-8")
+        return s
+
+    def record(self, session: str, metric: str, value: float, t: float | None = None) -> None:
+        self.series(session, metric).record(time.time() if t is None else t, float(value))
+
+    def record_many(self, session: str, values: Dict[str, float], t: float | None = None) -> None:
+        t = time.time() if t is None else t
+        for metric, value in values.items():
+            self.series(session, metric).record(t, float(value))
+
+    def metrics(self, session: str) -> List[str]:
+        names = {m for s, m in self._series if s == session}
+        if self.directory is not None and (self.directory / dir_name(session)).is_dir():
+            names.update(p.read_text(encoding="utf-8") for p in (self.directory / dir_name(session)).glob("*/name"))
+        return sorted(names)
+
+    def query(self, session: str, metric: str, start: Optional[float] = None, end: Optional[float] = None, max_points: int = 1000) -> Dict[str, Any]:
+        end = time.time() if end is None else float(end)
+        start = end - 3600.0 if start is None else float(start)
+        s = self.series(session, metric, create=False)
+        if s is None:
+            return {"metric": metric, "start": start, "end": end, "resolution": self.resolutions[0][0], "t": [], "min": [], "max": [], "mean": []}
+        return {"metric": metric, "start": start, "end": end, **s.query(start, end, max(1, int(max_points)))}
+
+    def flush(self) -> None:
+        for s in self._series.values():
+            s.flush()
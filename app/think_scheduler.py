@@ -0,0 +1,101 @@
+from __future__ import annotations
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ThinkScheduler:
+    """Adaptive, change-driven pacing for the SmartCore think loop.
+
+    - backs off exponentially while nobody talks to the server and the
+      state fingerprint stays the same; any change resets to the base rate
+    - skips a tick when the fingerprint has not changed since the last thought
+    - pauses (skips) while user traffic exceeds `busy_rps`
+    - jitters every delay so several workers don't think in lockstep
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        max_interval: float = 120.0,
+        backoff: float = 2.0,
+        jitter: float = 0.1,
+        busy_rps: float = 5.0,
+        window_seconds: float = 10.0,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base_interval = max(base_interval, 0.0)
+        self.max_interval = max(max_interval, self.base_interval)
+        self.backoff = max(backoff, 1.0)
+        self.jitter = max(0.0, min(jitter, 1.0))
+        self.busy_rps = busy_rps
+        self.window_seconds = window_seconds
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._hits: deque[float] = deque()
+        self._activity_since_tick = False
+        self._idle_streak = 0
+        self._last_fingerprint: Hashable = None
+        self._has_thought = False
+        self.ticks_run = 0
+        self.ticks_skipped: Dict[str, int] = {"unchanged": 0, "busy": 0}
+
+    def note_activity(self) -> None:
+        now = self._clock()
+        self._hits.append(now)
+        self._activity_since_tick = True
+        self._trim(now)
+
+    def request_rate(self) -> float:
+        self._trim(self._clock())
+        return len(self._hits) / self.window_seconds if self.window_seconds > 0 else 0.0
+
+    def busy(self) -> bool:
+        return self.busy_rps > 0 and self.request_rate() >= self.busy_rps
+
+    def next_delay(self) -> float:
+        delay = min(self.base_interval * self.backoff ** self._idle_streak, self.max_interval)
+        if self.jitter:
+            delay *= 1.0 + self._rng.uniform(-self.jitter, self.jitter)
+        return delay
+
+    def should_think(self, fingerprint: Hashable = None) -> tuple[bool, str]:
+        """Decide whether this tick runs; updates backoff and skip counters."""
+        active, self._activity_since_tick = self._activity_since_tick, False
+        if self.busy():
+            # user traffic wins; come back at the base rate
+            self._idle_streak = 0
+            self.ticks_skipped["busy"] += 1
+            return False, "busy"
+        if fingerprint is None:
+            # no state probe: only user activity counts as change
+            changed = active or not self._has_thought
+        else:
+            changed = not self._has_thought or fingerprint != self._last_fingerprint
+        if not changed:
+            self._idle_streak = 0 if active else self._idle_streak + 1
+            self.ticks_skipped["unchanged"] += 1
+            return False, "unchanged"
+        self._idle_streak = 0
+        self._last_fingerprint = fingerprint
+        self._has_thought = True
+        self.ticks_run += 1
+        return True, "changed"
+
+    def stats(self) -> Dict[str, Any]:
+        skipped = sum(self.ticks_skipped.values())
+        return {
+            "ticks_run": self.ticks_run,
+            "ticks_skipped": skipped,
+            "skipped_by_reason": dict(self.ticks_skipped),
+            "idle_streak": self._idle_streak,
+            "current_interval": min(self.base_interval * self.backoff ** self._idle_streak, self.max_interval),
+            "request_rate": round(self.request_rate(), 3),
+        }
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._hits and self._hits[0] < cutoff:
+            self._hits.popleft()
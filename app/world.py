@@ -0,0 +1,475 @@
+from __future__ import annotations
+import math, random, time
+from collections import deque
+from dataclasses import asdict
+from typing import Any, Dict
+
+from .agency.agency import Agency
+from .agency.nav_field import NavField
+from .agency.needs_planner import ACTIONS
+from .agency.policy import Policy
+from .agency.drives import DriveGains
+from .body.body import Body
+from .physio.heart import HeartState
+from .event_log import MUTATING, EventLog
+from .object_registry import ObjectRegistry
+from .telemetry import TelemetryStore
+
+
+# seconds of full-speed movement per simulated second, and max turn rate (rad/s);
+# these keep motion independent of the simulation step size
+MOVE_TIME_SCALE = 0.25
+TURN_RATE = 0.3
+SAMPLE_INTERVAL_S = 1.0
+# scenes at least this large use the vectorized nav field
+NAV_FIELD_MIN_OBJECTS = 64
+# objects farther than this contribute < 1e-4 of their weight to the nav field
+NAV_EPS = 1e-4
+# export_state() layout; 1 was unversioned, with the body's activity as a top-level key
+STATE_VERSION = 2
+
+
+def _upgrade_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring an exported world state to STATE_VERSION (ValueError if it is newer)."""
+    version = state.get("version", 1)
+    if version == 1:
+        state = {**state, "version": 2, "body": {"state": state["body"], "activity": state["activity"]}}
+        version = 2
+    if version != STATE_VERSION:
+        raise ValueError(f"unsupported world state version {version!r}")
+    return state
+
+
+class World:
+    """One agent session: agency, body, policy and the objects it perceives.
+
+    All world-mutating commands go through handle(), which takes the same
+    message dicts the WebSocket receives and returns the reply message. This
+    keeps the world usable in-process or behind a shard process boundary.
+    """
+
+    def __init__(self, session: str = "default", seed: int | None = None) -> None:
+        self.session = session
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.agency = Agency()
+        self.body = Body()
+        self.policy = Policy(rng=random.Random(self.seed))
+        self.objects = ObjectRegistry()
+        self.prev_drives = {"hunger": 0.0, "threat": 0.0, "fatigue": 0.0}
+        self.ts = {
+            "bpm": deque(maxlen=180),
+            "threat": deque(maxlen=180),
+            "hunger": deque(maxlen=180),
+        }
+        self._sample_acc = 0.0
+        self._ts_version = 0
+        self._snap: tuple[tuple, Dict[str, Any]] = ((), {})
+        self._last_step: Dict[str, Any] = {}
+        self._last_whatif: Dict[str, Any] = {}
+        self.log: EventLog | None = None  # attached by the host when event logging is on
+        self.telemetry: TelemetryStore | None = None  # attached by the host when TELEMETRY_DIR is set
+        self._last_telemetry: Dict[str, Any] | None = None
+        # the whole scene as arrays, kept in step with the registry by vision()
+        self.nav = NavField(sigma=self.policy.sigma, eps=NAV_EPS)
+
+    @property
+    def nav_radius(self) -> float:
+        return self.nav.cutoff
+
+    # --- commands ---
+    def step(self, minutes: float = 1.0, food_available: bool = False, threat: float | None = None, stimulation: bool = False, schedule: list[dict] | None = None) -> Dict[str, Any]:
+        agency = self.agency
+        # Perceive environment
+        signals = {"threat": threat, "stimulation": stimulation}
+        agency.sense(signals)
+        extra: Dict[str, Any] = {}
+        if schedule is not None:
+            # long spans with scheduled signals: closed-form advance
+            agency.drives.update(0.0, signals)
+            extra["fast_forward"] = agency.fast_forward(max(0.0, float(minutes or 0.0)), schedule)
+        else:
+            agency.step(max(0.0, float(minutes or 0.0)), signals)
+        plan = agency.decide({"food_available": bool(food_available)})
+        agency.enact(plan)
+        return {
+            **extra,
+            "state": agency.dump_state(),
+            "plan": plan.model_dump(),
+            "mood": agency.state.mood.as_dict(),
+            "appetite": agency.state.appetite,
+            "weights": agency.state.weights,
+            "thoughts": agency.thoughts.render(),
+        }
+
+    def tick(self, minutes: float = 1.0, food_available: bool = False, threat: float | None = None, stimulation: bool = False, schedule: list[dict] | None = None) -> Dict[str, Any]:
+        drives = self.agency.state.drives
+        # capture prev drives for reward
+        self.prev_drives.update({"hunger": drives.hunger, "threat": drives.threat, "fatigue": drives.fatigue})
+        res = self.step(minutes, food_available, threat, stimulation, schedule)
+        # compute simple reward from drive deltas
+        new = res["state"]["drives"]
+        dh = self.prev_drives["hunger"] - float(new.get("hunger", 0.0))
+        dt = self.prev_drives["threat"] - float(new.get("threat", 0.0))
+        df = float(new.get("fatigue", 0.0)) - self.prev_drives["fatigue"]
+        reward = 1.0 * dh + 0.8 * dt - 0.2 * df
+        self.policy.update([{"tag": t} for t in self.objects.tags()], reward)
+        return res
+
+    def whatif(self, scenarios: list[dict]) -> Dict[str, Any]:
+        """Score hypothetical drive/affordance scenarios in one batch; the agent is not changed.
+
+        Each scenario may override hunger/fatigue/curiosity/threat (defaults: current
+        drives) and food_available.
+        """
+        current = self.agency.drives.as_dict()
+        drives = {k: [float(s.get(k, v)) for s in scenarios] for k, v in current.items()}
+        food = [bool(s.get("food_available", False)) for s in scenarios]
+        actions, scores = self.agency.planner.decide_batch(drives, food)
+        return {"actions": list(ACTIONS), "chosen": actions, "scores": scores.round(6).tolist()}
+
+    def telemetry_query(self, q: Dict[str, Any]) -> Dict[str, Any] | None:
+        """Range query on this session's telemetry; without a metric, lists the recorded ones."""
+        if self.telemetry is None:
+            return None
+        if not q.get("metric"):
+            return {"metrics": self.telemetry.metrics(self.session)}
+        return self.telemetry.query(self.session, str(q["metric"]), q.get("start"), q.get("end"), int(q.get("max_points") or 1000))
+
+    def sense(self, threat: float | None = None, stimulation: bool = False) -> None:
+        # update drives without time advance
+        self.agency.sense({"threat": threat, "stimulation": stimulation})
+
+    def vision(self, objects: list[dict] | None = None, add: list[dict] | None = None, update: list[dict] | None = None, remove: list | None = None) -> None:
+        """Full object list (replaces the scene) or an add/update/remove diff keyed by id."""
+        if objects is not None:
+            # objects: [{id, x, y, tag}] from UI; use as visual input
+            self.agency.observe_vision(objects)
+            # keep server-side registry to enable auto navigation
+            self.objects.replace(objects)
+            self._rebuild_nav()
+            return
+        changed = self.objects.apply_diff(add or (), update or (), remove or ())
+        for oid in remove or ():
+            self.nav.remove(oid)
+        for o in changed:
+            self.nav.upsert(o)
+        self.agency.observe_vision(changed, count=len(self.objects))
+
+    def _rebuild_nav(self) -> None:
+        self.nav = NavField(self.objects.values(), sigma=self.policy.sigma, eps=NAV_EPS)
+
+    def body_cmd(self, data: Dict[str, Any]) -> None:
+        body = self.body
+        cmd = data.get("cmd")
+        if cmd == "turn":
+            body.turn(float(data.get("delta", 0.0)))
+        elif cmd == "look":
+            body.look(float(data.get("delta", 0.0)))
+        elif cmd == "move":
+            body.move(float(data.get("forward", 0.0)), float(data.get("sideways", 0.0)), float(data.get("dt", 0.2)))
+        elif cmd == "pose":
+            body.pose(left=data.get("left"), right=data.get("right"))
+        elif cmd == "reset":
+            body.reset()
+
+    def advance(self, dt: float = 1.0, drives: bool = False) -> None:
+        """Advance body activity decay, emergent movement and heart rhythm.
+
+        With `drives=True` the agency's drives also progress by dt (headless runs);
+        the live server advances drives only through tick/step commands.
+        """
+        if self.log is not None:
+            self.log.advanced(dt, drives)
+        agency, body = self.agency, self.body
+        body.tick(dt)
+        # emergent movement from policy & drives (no hard-coded conditions)
+        self._emergent_move(dt)
+        if drives:
+            agency.step(dt / 60.0, {"activity": body.activity()})
+        else:
+            agency.heart.update(dt, arousal=agency.state.mood.arousal, activity=body.activity())
+        # timeseries sample once per simulated second, whatever the step size
+        self._sample_acc += dt
+        if self._sample_acc + 1e-9 < SAMPLE_INTERVAL_S:
+            return
+        self._sample_acc = max(0.0, self._sample_acc - SAMPLE_INTERVAL_S)
+        self.ts["bpm"].append(agency.heart.state.bpm)
+        self.ts["threat"].append(agency.state.drives.threat)
+        self.ts["hunger"].append(agency.state.drives.hunger)
+        self._ts_version += 1
+        if self.telemetry is not None:
+            d = agency.state.drives
+            self.telemetry.record_many(self.session, {
+                "bpm": agency.heart.state.bpm,
+                "threat": d.threat,
+                "hunger": d.hunger,
+                "fatigue": d.fatigue,
+                "curiosity": d.curiosity,
+                "activity": body.activity(),
+            })
+
+    # --- queries ---
+    def nearest(self, tag: str) -> tuple[dict | None, float]:
+        return self.objects.nearest(tag, self.body.state.x, self.body.state.y)
+
+    def context(self) -> Dict[str, Any]:
+        """Affective context handed to the orchestrator."""
+        return {
+            "weights": self.agency.state.weights,
+            "mood": self.agency.state.mood.as_dict(),
+            "heart": self.agency.heart.to_dict(),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full state for clients; rebuilt only when a component version changed."""
+        agency = self.agency
+        key = (agency.version, self.body.version, agency.heart.version, self.objects.version, self._ts_version)
+        cached_key, data = self._snap
+        if cached_key != key:
+            state = agency.dump_state()
+            data = {
+                "state": state,
+                "mood": state["mood"],
+                "appetite": state["appetite"],
+                "weights": state["weights"],
+                "thoughts": state["last_thoughts"],
+                "body": self.body.to_dict(),
+                "heart": agency.heart.to_dict(),
+                "objects": self.objects.values(),
+                "timeseries": {
+                    "bpm": list(self.ts["bpm"]),
+                    "threat": list(self.ts["threat"]),
+                    "hunger": list(self.ts["hunger"]),
+                },
+            }
+            self._snap = (key, data)
+        return {"ts": time.time(), **data}
+
+    # --- persistence ---
+    def export_state(self) -> Dict[str, Any]:
+        """Everything needed to resume this world, as plain picklable values."""
+        agency, d = self.agency, self.agency.drives
+        return {
+            "version": STATE_VERSION,
+            "session": self.session,
+            "seed": self.seed,
+            "drives": (d.hunger, d.fatigue, d.curiosity, d.threat),
+            "gains": asdict(d.gains),
+            "context": dict(agency.state.context),
+            "weights": dict(agency.state.weights),
+            "thoughts": agency.thoughts.export_state(),
+            "heart": asdict(agency.heart.state),
+            "body": self.body.export_state(),
+            "policy": self.policy.export_state(),
+            "objects": self.objects.values(),
+            "next_object_id": self.objects.next_id,
+            "prev_drives": dict(self.prev_drives),
+            "ts": {k: list(v) for k, v in self.ts.items()},
+            "sample_acc": self._sample_acc,
+            "lookahead": agency.lookahead.settings() if agency.lookahead else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "World":
+        """Rebuild an exported world; ValueError if the state is malformed or from a newer version."""
+        try:
+            return cls._from_state(_upgrade_state(state))
+        except KeyError as exc:
+            raise ValueError(f"world state is missing {exc}") from None
+
+    @classmethod
+    def _from_state(cls, state: Dict[str, Any]) -> "World":
+        w = cls(state["session"], seed=state["seed"])
+        agency, d = w.agency, w.agency.drives
+        d.hunger, d.fatigue, d.curiosity, d.threat = state["drives"]
+        d.gains = DriveGains(**state["gains"])
+        agency.state.context = dict(state["context"])
+        agency.state.weights = dict(state["weights"])
+        agency.thoughts.import_state(state["thoughts"])
+        agency.heart.state = HeartState(**state["heart"])
+        w.body.import_state(state["body"])
+        w.policy.import_state(state["policy"])
+        w.objects.replace(state["objects"])
+        w.objects.next_id = state.get("next_object_id", 0)
+        w._rebuild_nav()
+        w.prev_drives = dict(state["prev_drives"])
+        for k, values in state["ts"].items():
+            w.ts[k].extend(values)
+        w._sample_acc = state["sample_acc"]
+        agency.set_lookahead(state.get("lookahead"))
+        agency._sync_state()
+        return w
+
+    # --- message dispatch ---
+    def handle(self, data: Dict[str, Any]) -> Dict[str, Any] | None:
+        if data.get("type") == "batch":
+            return self.handle_batch(data.get("commands") or [], no_reply=bool(data.get("no_reply")))
+        return self.reply(self.apply(data))
+
+    def apply(self, data: Dict[str, Any]) -> str:
+        """Apply one command and return the kind of reply it calls for."""
+        kind = self._apply(data)
+        mtype = data.get("type")
+        # advance is counted per step by the log; a bare "planner" query changes nothing
+        if self.log is not None and kind != "error" and mtype in MUTATING and mtype != "advance":
+            if mtype != "planner" or "lookahead" in data:
+                self._log_command(data)
+        return kind
+
+    def _log_command(self, data: Dict[str, Any]) -> None:
+        msg = dict(data)
+        la = self.agency.lookahead
+        if la is not None and msg.get("type") in ("tick", "step"):
+            # lookahead depth depends on wall-clock budget: pin it so replay decides the same
+            msg["lookahead_depth"] = la.stats["last_depth"]
+        self.log.record(msg)
+
+    def _apply(self, data: Dict[str, Any]) -> str:
+        mtype = data.get("type")
+        if mtype == "get_state":
+            return "state"
+        if mtype in ("agency_state", "context", "policy"):
+            return mtype
+        if mtype == "policy_restore":
+            self.policy.restore(data.get("data") or {})
+            return "policy"
+        if mtype in ("tick", "step"):
+            if self.agency.lookahead is not None and "lookahead_depth" in data:
+                self.agency.lookahead.replay_depth = int(data["lookahead_depth"])
+            run = self.tick if mtype == "tick" else self.step
+            self._last_step = run(
+                float(data.get("minutes", 1.0) or 0.0),
+                bool(data.get("food_available", False)),
+                data.get("threat"),
+                bool(data.get("stimulation", False)),
+                data.get("schedule"),
+            )
+            return "step_result"
+        if mtype == "planner":
+            if "lookahead" in data:
+                self.agency.set_lookahead(data["lookahead"])
+            return "planner"
+        if mtype == "whatif":
+            scenarios = data.get("scenarios")
+            self._last_whatif = self.whatif(scenarios if isinstance(scenarios, list) else [])
+            return "whatif"
+        if mtype == "telemetry":
+            self._last_telemetry = self.telemetry_query(data)
+            return "telemetry"
+        if mtype == "sense":
+            self.sense(data.get("threat"), bool(data.get("stimulation", False)))
+            return "state"
+        if mtype == "advance":
+            dt, drives = float(data.get("dt", 1.0)), bool(data.get("drives", False))
+            for _ in range(max(1, int(data.get("steps", 1)))):
+                self.advance(dt, drives)
+            return "state"
+        if mtype == "body_cmd":
+            self.body_cmd(data)
+            return "body_state"
+        if mtype == "vision":
+            if "objects" in data or not any(k in data for k in ("add", "update", "remove")):
+                self.vision(data.get("objects") or [])
+            else:
+                self.vision(add=data.get("add"), update=data.get("update"), remove=data.get("remove"))
+            return "ack"
+        return "error"
+
+    def reply(self, kind: str) -> Dict[str, Any]:
+        if kind == "state":
+            return {"type": "state", "data": self.snapshot()}
+        if kind == "agency_state":
+            return {"type": "agency_state", "data": self.agency.dump_state()}
+        if kind == "context":
+            return {"type": "context", "data": self.context()}
+        if kind == "policy":
+            return {"type": "policy", "data": self.policy.snapshot()}
+        if kind == "step_result":
+            return {"type": "step_result", "data": self._last_step}
+        if kind == "planner":
+            la = self.agency.lookahead
+            return {"type": "planner", "data": {"lookahead": la.report() if la else None}}
+        if kind == "whatif":
+            return {"type": "whatif_result", "data": self._last_whatif}
+        if kind == "telemetry":
+            return {"type": "telemetry", "data": self._last_telemetry}
+        if kind == "body_state":
+            return {"type": "body_state", "data": self.body.to_dict()}
+        if kind == "ack":
+            return {"type": "ack", "ok": True}
+        return {"type": "error", "error": "unknown_type"}
+
+    def handle_batch(self, commands: list, no_reply: bool = False) -> Dict[str, Any] | None:
+        """Apply commands in order with no interleaving, then send one coalesced reply.
+
+        A batch is not all-or-nothing: a failing command is reported in
+        `errors` (with its index) and skipped, while the commands around it
+        still apply; `applied` counts the ones that did. Only the final views the batch asked for are serialized: one snapshot
+        covers any number of get_state/sense/body_cmd/vision commands. Commands
+        flagged `no_reply` (or the whole batch) contribute nothing to the reply;
+        errors are always reported.
+        """
+        kinds: set[str] = set()
+        errors: list[dict] = []
+        for i, cmd in enumerate(commands):
+            if not isinstance(cmd, dict):
+                errors.append({"index": i, "error": "invalid_command"})
+                continue
+            try:
+                kind = self.apply(cmd)
+            except (TypeError, ValueError) as exc:
+                errors.append({"index": i, "error": str(exc)})
+                continue
+            if kind == "error":
+                errors.append({"index": i, "error": "unknown_type"})
+            elif not cmd.get("no_reply"):
+                kinds.add(kind)
+        if no_reply and not errors:
+            return None
+        data: Dict[str, Any] = {}
+        if not no_reply:
+            if "state" in kinds:
+                data["state"] = self.snapshot()
+            elif "body_state" in kinds:
+                data["body"] = self.body.to_dict()
+            if "step_result" in kinds:
+                data["step"] = self._last_step
+            if "whatif" in kinds:
+                data["whatif"] = self._last_whatif
+            if "agency_state" in kinds:
+                data["agency_state"] = self.agency.dump_state()
+            if "context" in kinds:
+                data["context"] = self.context()
+        return {"type": "batch_result", "count": len(commands), "applied": len(commands) - len(errors), "errors": errors, "data": data}
+
+    def _emergent_move(self, dt: float = 1.0) -> None:
+        agency, body = self.agency, self.body
+        bx, by = body.state.x, body.state.y
+        drives = {
+            "hunger": agency.state.drives.hunger,
+            "threat": agency.state.drives.threat,
+            "curiosity": agency.state.drives.curiosity,
+        }
+        if self.nav.sigma != self.policy.sigma:
+            self._rebuild_nav()  # a restored policy changed the falloff
+        if len(self.nav) >= NAV_FIELD_MIN_OBJECTS:
+            # the field's grid already limits the sum to objects near the agent
+            vx, vy = self.policy.nav_vector_field(self.nav, bx, by, drives)
+        else:
+            # small scene: a scalar pass over the objects within the falloff cutoff
+            vx, vy = self.policy.nav_vector_at(self.objects.query_radius(bx, by, self.nav_radius), bx, by, drives)
+        if vx == 0 and vy == 0:
+            return
+        target = math.atan2(vy, vx)
+        self._turn_towards(target, TURN_RATE * dt)
+        # speed scales with energy and nav magnitude
+        mag = min(1.0, math.hypot(vx, vy))
+        speed_scale = 0.5 + 0.5 * agency.state.energy
+        body.move(forward=mag * speed_scale, dt=MOVE_TIME_SCALE * dt)
+
+    def _turn_towards(self, target_angle: float, max_step: float = TURN_RATE) -> None:
+        # rotate body yaw toward target
+        yaw = self.body.state.yaw
+        diff = math.atan2(math.sin(target_angle - yaw), math.cos(target_angle - yaw))
+        step = max(-max_step, min(max_step, diff))
+        self.body.turn(step)
@@ -2,4 +2,4 @@ from __future__ import annotations
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8001, reload=False)
+    uvicorn.run("app.main:create_app", factory=True, host="0.0.0.0", port=8001, reload=False)
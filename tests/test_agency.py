@@ -19,3 +19,21 @@ def test_agency_prioritizes_safety_over_food():
     a.drives.threat = 0.9
     plan: ActionPlan = a.decide({"food_available": True})
     assert plan.action == "seek_safety"
+
+
+def test_score_batch_matches_scalar_scores():
+    import random
+    from app.agency.needs_planner import ACTIONS, NeedsPlanner
+
+    planner, rng = NeedsPlanner(), random.Random(0)
+    rows = [{k: rng.random() for k in ("hunger", "fatigue", "curiosity", "threat")} for _ in range(200)]
+    food = [rng.random() < 0.5 for _ in rows]
+    drives = {k: [r[k] for r in rows] for k in rows[0]}
+    chosen, scores = planner.decide_batch(drives, food)
+    for r, f, c, s in zip(rows, food, chosen, scores):
+        ref = planner.score(r, {"food_available": f})
+        assert [ref[a] for a in ACTIONS] == list(s)
+        assert c == planner.decide(r, {"food_available": f})[0]
+    empty = {k: [] for k in drives}
+    assert planner.score_batch(empty, []).shape == (0, len(ACTIONS))
+    assert planner.decide_batch(empty, [])[0] == []
@@ -0,0 +1,88 @@
+from __future__ import annotations
+import pytest
+from fastapi.testclient import TestClient
+
+from app.checkpoint import CheckpointError, dumps, loads, write_atomic
+from app.config import Settings
+from app.main import create_app
+from app.world import World
+
+
+def _busy_world() -> World:
+    w = World("s", seed=5)
+    w.vision([{"id": "f", "x": 100, "y": 80, "tag": "food"}, {"id": "h", "x": 400, "y": 300, "tag": "hazard"}])
+    for _ in range(3):
+        w.tick(5.0, food_available=True, threat=0.3)
+        for _ in range(20):
+            w.advance(0.1, drives=True)
+    return w
+
+
+def test_world_roundtrip_resumes_identically():
+    a = _busy_world()
+    b = World.from_state(loads(dumps({"s": a.export_state()}))["s"])
+    for w in (a, b):
+        for _ in range(50):
+            w.advance(0.1, drives=True)
+        w.tick(1.0)
+    sa, sb = a.snapshot(), b.snapshot()
+    sa.pop("ts"), sb.pop("ts")
+    assert sa == sb
+    assert a.policy.snapshot() == b.policy.snapshot()
+
+
+def test_state_is_versioned_and_unversioned_states_upgrade():
+    a = _busy_world()
+    state = a.export_state()
+    assert state["version"] == 2
+    # the unversioned layout kept the body's activity at the top level
+    legacy = {k: v for k, v in state.items() if k != "version"}
+    legacy["body"], legacy["activity"] = state["body"]["state"], state["body"]["activity"]
+    b = World.from_state(legacy)
+    assert b.body.to_dict() == a.body.to_dict() and b.body.activity() == a.body.activity()
+    assert b.agency.thoughts.export_state() == a.agency.thoughts.export_state()
+    with pytest.raises(ValueError):
+        World.from_state({**state, "version": 99})
+    with pytest.raises(ValueError):
+        World.from_state({k: v for k, v in state.items() if k != "policy"})
+
+
+def test_corrupt_checkpoint_is_rejected():
+    data = bytearray(dumps({}))
+    data[-1] ^= 0xFF
+    with pytest.raises(CheckpointError):
+        loads(bytes(data))
+
+
+def test_admin_checkpoint_and_restart_restore(tmp_path):
+    memory_path = tmp_path / "memory.json"
+    memory_path.write_text("[]", encoding="utf-8")
+    settings = Settings(MEMORY_PATH=str(memory_path), ENABLE_THINK_LOOP=False, SIM_HZ=0, CHECKPOINT_PATH=str(tmp_path / "ckpt.bin"))
+
+    with TestClient(create_app(settings)) as client:
+        assert client.post("/agency/step", json={"type": "text", "value": "", "source": "test", "minutes": 30}).status_code == 200
+        saved = client.get("/agency/state").json()["drives"]
+        assert client.post("/admin/checkpoint").json()["worlds"] == 1
+        client.post("/agency/step", json={"type": "text", "value": "", "source": "test", "minutes": 30})
+        assert client.get("/agency/state").json()["drives"] != saved
+        assert client.post("/admin/restore").json()["worlds"] == 1
+        assert client.get("/agency/state").json()["drives"] == saved
+        client.post("/agency/step", json={"type": "text", "value": "", "source": "test", "minutes": 10})
+        final = client.get("/agency/state").json()["drives"]
+
+    # shutdown saved a final checkpoint; a fresh server starts from it
+    with TestClient(create_app(settings)) as client:
+        assert client.get("/agency/state").json()["drives"] == final
+
+
+def test_unloadable_world_state_is_skipped(tmp_path):
+    memory_path = tmp_path / "memory.json"
+    memory_path.write_text("[]", encoding="utf-8")
+    ckpt = tmp_path / "ckpt.bin"
+    settings = Settings(MEMORY_PATH=str(memory_path), ENABLE_THINK_LOOP=False, SIM_HZ=0, CHECKPOINT_PATH=str(ckpt))
+    write_atomic(ckpt, dumps({"default": {"version": 99}}))
+    # startup logs the failure and serves fresh worlds
+    with TestClient(create_app(settings)) as client:
+        assert client.get("/agency/state").status_code == 200
+        write_atomic(ckpt, dumps({"default": {"version": 99}}))
+        assert client.post("/admin/restore").status_code == 422
@@ -0,0 +1,42 @@
+from __future__ import annotations
+import numpy as np
+
+from app.body.body import Body
+from app.body.crowd import BodyBank, _grid_pairs
+
+
+def test_single_body_matches_body_move():
+    body, bank = Body(), BodyBank(1)
+    bank.x[:], bank.y[:] = body.state.x, body.state.y
+    for fwd, turn in [(1.0, 0.3), (0.5, -1.0), (1.0, 2.0), (0.0, 0.0)]:
+        body.turn(turn)
+        bank.turn(turn)
+        body.tick(0.1)
+        bank.tick(0.1)
+        body.move(fwd, dt=0.2)
+        bank.move(fwd, dt=0.2)
+        assert np.isclose(bank.x[0], body.state.x) and np.isclose(bank.y[0], body.state.y)
+        assert np.isclose(bank.activity[0], body.activity())
+
+
+def test_bodies_and_obstacles_are_separated():
+    bank = BodyBank(3, radius=5.0)
+    bank.x[:] = [100.0, 104.0, 200.0]
+    bank.y[:] = [100.0, 100.0, 100.0]
+    bank.set_obstacles([{"x": 203.0, "y": 100.0, "r": 10.0}])
+    bank.move(0.0)
+    assert bank.x[1] - bank.x[0] >= 10.0 - 1e-9
+    assert abs(bank.x[2] - 203.0) >= 15.0 - 1e-9
+
+
+def test_grid_pairs_match_brute_force():
+    rng = np.random.default_rng(1)
+    x, y = rng.uniform(0, 200, 300), rng.uniform(0, 200, 300)
+    from app.body.crowd import _HALF
+
+    i, j = _grid_pairs(x, y, x, y, 12.0, _HALF, same=True)
+    d = np.hypot(x[i] - x[j], y[i] - y[j])
+    got = {tuple(sorted(p)) for p in zip(i[d < 12.0], j[d < 12.0])}
+    dd = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+    want = {(a, b) for a, b in zip(*np.nonzero(dd < 12.0)) if a < b}
+    assert got == want and len(i) == len(set(zip(i, j)))
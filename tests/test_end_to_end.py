@@ -1,29 +1,73 @@
 from __future__ import annotations
-import os
-from importlib import reload
 
 from fastapi.testclient import TestClient
 
+from app.config import Settings
+from app.main import create_app
 
-def test_api_pipeline(monkeypatch, tmp_path):
+
+def _settings(tmp_path) -> Settings:
     memory_path = tmp_path / "memory.json"
     memory_path.write_text("[]", encoding="utf-8")
-    monkeypatch.setenv("MEMORY_PATH", str(memory_path))
-    monkeypatch.setenv("ENABLE_THINK_LOOP", "false")
+    return Settings(MEMORY_PATH=str(memory_path), ENABLE_THINK_LOOP=False)
+
+
+def test_api_pipeline(tmp_path):
+    app = create_app(_settings(tmp_path))
+
+    with TestClient(app) as client:
+        payload = {"type": "text", "value": "Should AI replace human judges?", "source": "user"}
+        resp = client.post("/orchestrate", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["intent"] in {"inform", "mediate_contradiction", "highlight_conflict"}
+        assert "bias_report" in data
+
+        memory_resp = client.get("/memory")
+        assert memory_resp.status_code == 200
+        assert isinstance(memory_resp.json(), list)
+
+
+def test_create_app_builds_components_lazily(tmp_path):
+    app = create_app(_settings(tmp_path))
+    runtime = app.state.runtime
+
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        assert runtime._core is None and runtime._host is None
+        assert client.get("/agency/state").status_code == 200
+        assert runtime._host is not None and runtime._core is None
+    assert runtime._host is None
+
+
+def test_whatif_scores_scenarios_without_changing_state(tmp_path):
+    with TestClient(create_app(_settings(tmp_path))) as client:
+        before = client.get("/agency/state").json()["drives"]
+        resp = client.post("/agency/whatif", json={"scenarios": [{"threat": 0.9}, {"hunger": 0.9, "food_available": True}, {}]})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["chosen"][:2] == ["seek_safety", "eat"]
+        assert len(data["scores"]) == 3 and len(data["scores"][0]) == len(data["actions"])
+        empty = client.post("/agency/whatif", json={"scenarios": []})
+        assert empty.status_code == 200 and empty.json()["chosen"] == [] and empty.json()["scores"] == []
+        assert client.post("/agency/whatif", json={"scenarios": [{"threat": "high"}]}).status_code == 422
+        assert client.get("/agency/state").json()["drives"] == before
 
-    from app import config, main
 
-    reload(config)
-    reload(main)
+def test_policy_restore_rejects_invalid_snapshot(tmp_path):
+    with TestClient(create_app(_settings(tmp_path))) as client:
+        snap = client.get("/agency/policy").json()
+        for bad in ({"decay": 0}, {"lr": 0.1, "step": "x"}, {"weights": [1, 2]}, {"weights": {"food": "x"}}):
+            assert client.post("/agency/policy", json={**snap, **bad}).status_code == 422
+            assert client.get("/agency/policy").json() == snap
+        restored = client.post("/agency/policy", json={**snap, "weights": {"food": 0.5}})
+        assert restored.status_code == 200 and restored.json()["weights"] == {"food": 0.5}
 
-    client = TestClient(main.app)
-    payload = {"type": "text", "value": "Should AI replace human judges?", "source": "user"}
-    resp = client.post("/orchestrate", json=payload)
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["intent"] in {"inform", "mediate_contradiction", "highlight_conflict"}
-    assert "bias_report" in data
 
-    memory_resp = client.get("/memory")
-    assert memory_resp.status_code == 200
-    assert isinstance(memory_resp.json(), list)
+def test_planner_config_rejects_invalid_settings(tmp_path):
+    with TestClient(create_app(_settings(tmp_path))) as client:
+        for bad in ({"depth": 3, "beam": 0}, {"depth": 3, "quantum": 0}, {"depth": "abc"}):
+            assert client.post("/agency/planner", json={"lookahead": bad}).status_code == 422
+        assert client.get("/agency/planner").json()["lookahead"] is None
+        assert client.post("/agency/step", json={"type": "text", "value": "", "source": "test", "minutes": 1}).status_code == 200
+        assert client.post("/agency/planner", json={"lookahead": {"depth": 2}}).json()["lookahead"]["depth"] == 2
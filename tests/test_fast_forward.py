@@ -0,0 +1,43 @@
+from __future__ import annotations
+import math
+
+from app.agency.agency import Agency
+from app.physio.heart import Heart
+
+
+def _integrate(agency: Agency, minutes: float, dt_s: float = 0.1) -> int:
+    """Reference: many tiny drive/heart steps."""
+    beats = 0
+    for _ in range(int(round(minutes * 60.0 / dt_s))):
+        agency.drives.update(dt_s / 60.0, {})
+        agency._sync_state()
+        beats += agency.heart.update(dt_s, arousal=agency.state.mood.arousal)
+    return beats
+
+
+def test_heart_update_counts_beats_without_looping():
+    h = Heart()
+    beats = h.update(3600.0 * 24, arousal=0.0)
+    assert h.state.beat and abs(beats - 70 * 60 * 24) <= 1
+    assert 0.0 <= h.state._phase_s < 60.0 / h.state.bpm
+
+
+def test_fast_forward_matches_fine_integration():
+    ff, ref = Agency(), Agency()
+    for a in (ff, ref):
+        a.drives.threat, a.drives.curiosity = 0.9, 0.6
+    stats = ff.fast_forward(15.0)
+    beats = _integrate(ref, 15.0)
+    for k in ("hunger", "fatigue", "curiosity", "threat"):
+        assert math.isclose(getattr(ff.drives, k), getattr(ref.drives, k), abs_tol=1e-6)
+    assert abs(stats["beats"] - beats) <= 0.002 * beats + 2
+    assert math.isclose(ff.heart.state.bpm, ref.heart.state.bpm, rel_tol=1e-3)
+    assert ff.state.mood.label == ref.state.mood.label
+
+
+def test_fast_forward_applies_scheduled_signals():
+    a = Agency()
+    stats = a.fast_forward(60 * 24 * 7, [{"at": 600.0, "threat": 0.8}, {"at": 10.0, "stimulation": True}])
+    assert stats["events"] == 2 and stats["beats"] > 0
+    assert a.drives.hunger == 1.0 and a.drives.threat == 0.0
+    assert 50.0 <= stats["mean_bpm"] <= 160.0
@@ -0,0 +1,32 @@
+from __future__ import annotations
+import numpy as np
+
+from app.sim.headless import COLUMNS, Scenario, run_scenario
+
+
+def _scenario(seed: int) -> Scenario:
+    return Scenario(
+        seconds=20.0,
+        dt=0.1,
+        seed=seed,
+        schedule=[
+            {"at": 5.0, "threat": 0.8},
+            {"at": 8.0, "food_available": True, "add": [{"id": "food2", "x": 300.0, "y": 200.0, "tag": "food"}]},
+            {"at": 12.0, "stimulation": True, "remove": ["haz1"]},
+        ],
+    )
+
+
+def test_same_seed_reproduces_trajectory(tmp_path):
+    a, b = run_scenario(_scenario(3)), run_scenario(_scenario(3))
+    assert a.trajectory.shape == (200, len(COLUMNS))
+    assert np.array_equal(a.trajectory, b.trajectory)
+    path = a.save(tmp_path / "traj.npz")
+    with np.load(path) as data:
+        assert np.array_equal(data["trajectory"], a.trajectory)
+        assert tuple(data["columns"]) == COLUMNS
+
+
+def test_different_seeds_diverge():
+    a, b = run_scenario(_scenario(3)), run_scenario(_scenario(4))
+    assert not np.array_equal(a.trajectory[:, 1:3], b.trajectory[:, 1:3])
@@ -0,0 +1,30 @@
+from __future__ import annotations
+import random
+
+import numpy as np
+
+from app.physio.heart import Heart
+from app.physio.heart_bank import HeartBank
+
+
+def test_heart_bank_matches_scalar_hearts():
+    rng = random.Random(3)
+    n = 32
+    hearts, bank = [Heart() for _ in range(n)], HeartBank(n)
+    for _ in range(200):
+        dt = rng.choice([0.05, 0.2, 1.0, 7.5])
+        arousal = [rng.random() for _ in range(n)]
+        activity = [rng.random() * 1.2 - 0.1 for _ in range(n)]
+        rest = [rng.random() < 0.2 for _ in range(n)]
+        mask, beats = bank.update(dt, arousal=np.array(arousal), activity=np.array(activity), rest=np.array(rest))
+        for i, h in enumerate(hearts):
+            b = h.update(dt, arousal=arousal[i], activity=activity[i], rest=rest[i])
+            assert beats[i] == b and mask[i] == h.state.beat
+            assert bank.bpm[i] == h.state.bpm and bank.hrv[i] == h.state.hrv
+            assert abs(bank.phase[i] - h.state._phase_s) < 1e-9
+
+
+def test_heart_bank_accepts_per_agent_dt():
+    bank = HeartBank(3)
+    _, beats = bank.update(np.array([0.0, 60.0, 3600.0]))
+    assert beats[0] == 0 and 60 <= beats[1] <= 71 and beats[2] > 4000
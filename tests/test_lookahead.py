@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from app.agency.agency import Agency
+from app.agency.lookahead import transition
+from app.agency.needs_planner import ACTIONS
+from app.world import World
+
+
+def test_lookahead_plans_and_reuses_transpositions():
+    a = Agency()
+    a.set_lookahead({"depth": 4, "beam": 8, "budget_ms": 1000})
+    a.drives.hunger, a.drives.threat = 0.9, 0.0
+    assert a.decide({"food_available": True}).action == "eat"
+    a.drives.hunger = 0.9  # same state again: expansions come from the table
+    a.decide({"food_available": True})
+    stats = a.lookahead.report()
+    assert stats["last_depth"] == 4 and stats["hits"] > 0 and 0 < stats["hit_rate"] <= 1
+    assert stats["nodes_per_sec"] > 0
+
+
+def test_lookahead_budget_falls_back_to_greedy():
+    a = Agency()
+    a.set_lookahead({"depth": 50, "beam": 64, "budget_ms": 0})
+    a.drives.threat = 0.9
+    plan = a.decide({})
+    assert plan.action == "seek_safety"
+    assert a.lookahead.report()["timeouts"] == 1
+
+
+def test_world_planner_command_toggles_lookahead():
+    w = World("s", seed=1)
+    assert w.handle({"type": "planner"})["data"]["lookahead"] is None
+    on = w.handle({"type": "planner", "lookahead": {"depth": 3}})["data"]["lookahead"]
+    assert on["depth"] == 3
+    w.handle({"type": "tick", "minutes": 1})
+    assert w.handle({"type": "planner"})["data"]["lookahead"]["decisions"] == 1
+    assert w.handle({"type": "planner", "lookahead": None})["data"]["lookahead"] is None
+
+
+def test_invalid_lookahead_settings_are_rejected_unchanged():
+    a = Agency()
+    for bad in ({"depth": 3, "beam": 0}, {"quantum": 0}, {"depth": "abc"}, {"budget_ms": -1}, {"beam": "x"}):
+        with pytest.raises(ValueError):
+            a.set_lookahead(bad)
+        assert a.lookahead is None
+    a.set_lookahead({"depth": 2, "beam": 4})
+    with pytest.raises(ValueError):
+        a.set_lookahead({"depth": 3, "beam": 0})
+    assert (a.lookahead.depth, a.lookahead.beam) == (2, 4)
+    with pytest.raises(ValueError):
+        a.set_lookahead([1, 2])
+
+
+def test_transition_matches_enacted_effects():
+    for action in ACTIONS:
+        a = Agency()
+        a.drives.hunger, a.drives.fatigue, a.drives.curiosity, a.drives.threat = 0.6, 0.7, 0.4, 0.8
+        s = (0.6, 0.7, 0.4, 0.8)
+        a.drives.apply(action)
+        a.drives.update(5.0)
+        assert transition(s, action, a.drives.gains, 5.0, True) == (a.drives.hunger, a.drives.fatigue, a.drives.curiosity, a.drives.threat)
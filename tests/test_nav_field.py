@@ -0,0 +1,85 @@
+from __future__ import annotations
+import math
+import random
+
+from app.agency.nav_field import NavField
+from app.agency.policy import Policy
+
+
+def _scene(n: int, seed: int, extent: float) -> list[dict]:
+    rng = random.Random(seed)
+    tags = ["food", "hazard", "", "obj-3", "rock", "danger_zone"]
+    return [{"id": i, "x": rng.uniform(0, extent), "y": rng.uniform(0, extent), "tag": rng.choice(tags)} for i in range(n)]
+
+
+def test_field_matches_scalar_nav_vector():
+    objects = _scene(500, 1, 800.0)
+    p = Policy()
+    p.set_weight("rock", -0.4)
+    p.set_weight("food", 0.7)
+    drives = {"hunger": 0.6, "threat": 0.3, "curiosity": 0.0}
+    ax, ay = 400.0, 350.0
+    rel = [{"tag": o["tag"], "x": o["x"] - ax, "y": o["y"] - ay} for o in objects]
+    sx, sy = p.nav_vector(rel, drives)
+    fx, fy = p.nav_vector_field(NavField(objects, sigma=p.sigma, eps=1e-12), ax, ay, drives)
+    assert math.isclose(sx, fx, rel_tol=1e-9, abs_tol=1e-12)
+    assert math.isclose(sy, fy, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_grid_skips_far_objects_with_negligible_error():
+    objects = _scene(20000, 2, 50000.0)
+    field = NavField(objects, sigma=120.0, eps=1e-4)
+    assert len(field.candidates(25000.0, 25000.0)) < len(field) / 50
+    p = Policy()
+    drives = {"hunger": 0.8, "threat": 0.5, "curiosity": 0.0}
+    rel = [{"tag": o["tag"], "x": o["x"] - 25000.0, "y": o["y"] - 25000.0} for o in objects]
+    sx, sy = p.nav_vector(rel, drives)
+    fx, fy = p.nav_vector_field(field, 25000.0, 25000.0, drives)
+    assert abs(sx - fx) < 1e-3 and abs(sy - fy) < 1e-3
+
+
+def test_incremental_updates_match_a_rebuilt_field():
+    objects = _scene(300, 3, 1500.0)
+    field = NavField(objects[:200], sigma=120.0)
+    for o in objects[200:]:
+        field.upsert(o)
+    for o in objects[:50]:
+        field.remove(o["id"])
+    moved = [{**o, "x": o["x"] + 40.0, "tag": "food"} for o in objects[50:100]]
+    for o in moved:
+        field.upsert(o)
+    fresh = NavField(moved + objects[100:], sigma=120.0)
+    assert len(field) == len(fresh) == 250
+    p = Policy()
+    drives = {"hunger": 0.7, "threat": 0.4, "curiosity": 0.0}
+    for x, y in ((100.0, 100.0), (750.0, 750.0), (1400.0, 300.0)):
+        a, b = p.nav_vector_field(field, x, y, drives), p.nav_vector_field(fresh, x, y, drives)
+        assert math.isclose(a[0], b[0], rel_tol=1e-9, abs_tol=1e-12) and math.isclose(a[1], b[1], rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_world_keeps_one_field_in_step_with_vision():
+    from app.world import World
+
+    w = World("s", seed=1)
+    w.vision(_scene(100, 4, 400.0))
+    field = w.nav
+    w.vision(add=[{"id": "new", "x": 200.0, "y": 200.0, "tag": "hazard"}], remove=[0, 1])
+    for _ in range(5):
+        w.advance(0.5)
+    assert w.nav is field and len(field) == len(w.objects) == 99
+
+
+def test_large_scene_moves_without_scanning_the_registry(monkeypatch):
+    from app.world import World
+
+    w = World("s", seed=1)
+    w.vision(_scene(200, 5, 400.0))
+
+    def scan(*args, **kwargs):
+        raise AssertionError("per-tick registry scan")
+
+    monkeypatch.setattr(w.objects, "query_radius", scan)
+    x0 = (w.body.state.x, w.body.state.y)
+    for _ in range(10):
+        w.advance(0.5)
+    assert (w.body.state.x, w.body.state.y) != x0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import math
+import random
+
+from app.object_registry import ObjectRegistry
+from app.world import World
+
+
+def _brute_nearest(objects, tag, x, y):
+    best = min((o for o in objects if o["tag"] == tag), key=lambda o: math.hypot(o["x"] - x, o["y"] - y), default=None)
+    return best, (math.hypot(best["x"] - x, best["y"] - y) if best else float("inf"))
+
+
+def test_nearest_and_radius_match_brute_force():
+    rng = random.Random(4)
+    objects = [{"id": i, "x": rng.uniform(-3000, 3000), "y": rng.uniform(-3000, 3000), "tag": rng.choice(["food", "hazard", "rock"])} for i in range(2000)]
+    reg = ObjectRegistry(cell_size=100.0)
+    reg.replace(objects)
+    for _ in range(50):
+        x, y = rng.uniform(-3500, 3500), rng.uniform(-3500, 3500)
+        got, d = reg.nearest("food", x, y)
+        want, wd = _brute_nearest(objects, "food", x, y)
+        assert got["id"] == want["id"] and math.isclose(d, wd)
+        ids = {o["id"] for o in reg.query_radius(x, y, 350.0)}
+        assert ids == {o["id"] for o in objects if math.hypot(o["x"] - x, o["y"] - y) <= 350.0}
+    assert reg.nearest("ghost", 0, 0) == (None, float("inf"))
+
+
+def test_diffs_update_the_spatial_index():
+    reg = ObjectRegistry(cell_size=50.0)
+    reg.apply_diff(add=[{"id": "a", "x": 0, "y": 0, "tag": "food"}, {"id": "b", "x": 500, "y": 0, "tag": "food"}])
+    assert reg.nearest("food", 450, 0)[0]["id"] == "b"
+    reg.apply_diff(update=[{"id": "b", "x": -900}], remove=["a"])
+    assert len(reg) == 1 and reg.get("b")["tag"] == "food"
+    assert reg.nearest("food", 450, 0)[0]["x"] == -900
+    reg.apply_diff(update=[{"id": "b", "tag": "hazard"}])
+    assert reg.tags() == ["hazard"] and reg.nearest("food", 0, 0)[0] is None
+
+
+def test_world_accepts_vision_diffs():
+    w = World()
+    w.handle({"type": "vision", "objects": [{"id": "f", "x": 100, "y": 100, "tag": "food"}]})
+    w.handle({"type": "vision", "add": [{"id": "h", "x": 260, "y": 180, "tag": "hazard"}], "remove": ["f"]})
+    assert [o["id"] for o in w.snapshot()["objects"]] == ["h"]
+    assert w.nearest("hazard")[1] < 15.0
+    assert w.agency.state.context["vision_last_count"] == 1
+
+
+def test_auto_ids_never_collide():
+    reg = ObjectRegistry()
+    reg.upsert({"id": "_0", "x": 0, "y": 0, "tag": "food"})
+    reg.upsert({"id": "1", "x": 0, "y": 0, "tag": "food"})
+    a = reg.upsert({"x": 1, "y": 1, "tag": "rock"})
+    reg.remove(a["id"])
+    b = reg.upsert({"x": 2, "y": 2, "tag": "rock"})
+    assert len({"_0", "1", a["id"], b["id"]}) == 4 and len(reg) == 3
+    reg.replace([{"x": 0, "y": 0, "tag": "food"}, {"id": "_5", "x": 0, "y": 0, "tag": "food"}, {"x": 0, "y": 0, "tag": "food"}])
+    assert len(reg) == 3
@@ -0,0 +1,53 @@
+from __future__ import annotations
+import math
+
+import pytest
+
+from app.agency.policy import Policy
+
+
+def _eager(weights: dict, decay: float, lr: float, visible: list[str], reward: float) -> None:
+    """Reference: the original decay-everything update."""
+    for k in list(weights):
+        weights[k] *= decay
+    for tag in set(visible):
+        weights[tag] = max(-2.5, min(2.5, weights.get(tag, 0.0) + lr * reward))
+
+
+def test_lazy_decay_matches_eager_update():
+    p = Policy()
+    p.renorm_every = 37
+    ref: dict = {}
+    for i in range(500):
+        visible = [f"tag{(i * 7 + j) % 40}" for j in range(3)]
+        reward = math.sin(i) * (3.0 if i % 50 == 0 else 0.5)
+        p.update([{"tag": t} for t in visible], reward)
+        _eager(ref, p.decay, p.lr, visible, reward)
+    for tag, w in ref.items():
+        if abs(w) >= p.prune_below:
+            assert math.isclose(p.weight(tag), w, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_lookups_do_not_insert_and_snapshot_round_trips():
+    p = Policy()
+    assert p.weight("unseen") == 0.0
+    p.nav_vector([{"tag": "novel", "x": 10.0, "y": 0.0}], {"curiosity": 0.0})
+    assert "novel" not in p.tag_weights
+    p.update([{"tag": "food"}], 2.0)
+    q = Policy()
+    q.restore(p.snapshot())
+    assert q.tag_weights == p.tag_weights and q.weight("food") > 0
+
+
+def test_restore_rejects_out_of_range_values():
+    p = Policy()
+    p.update([{"tag": "food"}], 2.0)
+    good = p.snapshot()
+    for bad in ({"decay": 0.0}, {"decay": 1.5}, {"decay": -0.1}, {"lr": float("nan")}, {"sigma": 0.0}, {"weights": {"food": float("inf")}}):
+        q = Policy()
+        q.restore(good)
+        with pytest.raises(ValueError):
+            q.restore({**good, **bad})
+        assert q.snapshot() == good  # unchanged
+    q.restore({**good, "decay": 1.0})
+    q.update([{"tag": "food"}], 1.0)
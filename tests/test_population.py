@@ -0,0 +1,63 @@
+from __future__ import annotations
+import random
+
+import numpy as np
+
+from app.agency.agency import Agency
+from app.agency.population import ACTIONS, MOOD_LABELS, Population
+
+
+def _seeded(n: int, seed: int) -> tuple[Population, list[Agency]]:
+    rng = random.Random(seed)
+    pop, agents = Population(n), []
+    for i in range(n):
+        a = Agency()
+        for k in ("hunger", "fatigue", "curiosity", "threat"):
+            v = rng.random()
+            setattr(a.drives, k, v)
+            getattr(pop, k)[i] = v
+        agents.append(a)
+    return pop, agents
+
+
+def _assert_match(pop: Population, agents: list[Agency]) -> None:
+    for i, a in enumerate(agents):
+        d = pop.as_dict(i)
+        for k in ("hunger", "fatigue", "curiosity", "threat"):
+            assert abs(d[k] - getattr(a.drives, k)) < 1e-9
+        assert abs(d["satiety"] - a.state.satiety) < 1e-9
+        assert abs(d["energy"] - a.state.energy) < 1e-9
+        assert abs(d["appetite"] - a.state.appetite) < 1e-9
+        assert abs(d["valence"] - a.state.mood.valence) < 1e-9
+        assert abs(d["arousal"] - a.state.mood.arousal) < 1e-9
+        assert d["mood"] == a.state.mood.label
+        assert pop.heart.as_dict(i) == a.heart.to_dict()
+        assert abs(pop.heart.phase[i] - a.heart.state._phase_s) < 1e-9
+
+
+def test_population_matches_scalar_agency():
+    n = 64
+    pop, agents = _seeded(n, 11)
+    rng = np.random.default_rng(5)
+    for _ in range(20):
+        minutes = rng.uniform(0.0, 10.0, n)
+        threat = rng.uniform(0.0, 1.0, n)
+        stim = rng.random(n) < 0.3
+        actions = rng.integers(0, len(ACTIONS), n)
+        pop.sense(threat=threat, stimulation=stim)
+        pop.step(minutes, {"threat": threat, "stimulation": stim})
+        pop.enact(actions)
+        for i, a in enumerate(agents):
+            signals = {"threat": float(threat[i]), "stimulation": bool(stim[i])}
+            a.sense(signals)
+            a.step(float(minutes[i]), signals)
+            a.enact(type("Plan", (), {"action": ACTIONS[actions[i]]})())
+        _assert_match(pop, agents)
+
+
+def test_enact_accepts_action_names():
+    pop = Population(3)
+    pop.hunger[:] = 0.9
+    pop.enact(["eat", "think", "eat"])
+    assert pop.hunger.tolist() == [0.4, 0.9, 0.4]
+    assert MOOD_LABELS[pop.mood[1]] == pop.as_dict(1)["mood"]
@@ -0,0 +1,246 @@
+from __future__ import annotations
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.config import Settings
+from app.main import create_app
+from app.render import FrameRenderer, FrameWriter, Trace, render_trace
+from app.world import World
+
+
+def _recorded(tmp_path, frames: int = 6) -> Trace:
+    w = World("s", seed=3)
+    w.vision([{"id": "f", "x": 100, "y": 80, "tag": "food"}])
+    room = w.snapshot()["body"]["room"]
+    trace = Trace(10, (room["w"], room["h"]))
+    for i in range(frames):
+        if i == frames // 2:
+            w.vision(add=[{"id": "h", "x": 400, "y": 300, "tag": "hazard"}])
+        w.tick(1.0)
+        w.advance(0.1)
+        trace.capture_snapshot(w.snapshot())
+        if i % 2:
+            trace.flush_to(tmp_path / "t")
+    trace.flush_to(tmp_path / "t")
+    return trace
+
+
+def test_trace_flushes_and_reloads(tmp_path):
+    trace = _recorded(tmp_path)
+    assert len(trace) == 6 and len(trace.frames) == 0  # flushed rows leave memory
+    loaded = Trace.load(tmp_path / "t")
+    assert len(loaded) == Trace.frame_count(tmp_path / "t") == 6
+    assert len(loaded.scenes) == 2 and loaded.frames["scene"].tolist() == [0, 0, 0, 1, 1, 1]
+    # a torn trailing row is ignored
+    with open(tmp_path / "t" / "frames.bin", "ab") as f:
+        f.write(b"\0" * 7)
+    assert len(Trace.load(tmp_path / "t")) == 6
+
+
+def test_scenes_keep_only_drawn_fields_and_tables_append(tmp_path):
+    trace = Trace(10, (900, 540))
+    snap = World("s", seed=3).snapshot()
+    for dist in (1.0, 2.0, 3.0):
+        snap["objects"] = [{"id": "f", "x": 100, "y": 80, "tag": "food", "dist": dist}]
+        trace.capture_snapshot(snap)
+    assert len(trace.scenes) == 1 and trace.scenes[0] == [{"x": 100.0, "y": 80.0, "tag": "food"}]
+    trace.flush_to(tmp_path / "t")
+    meta = (tmp_path / "t" / "meta.json").stat().st_mtime_ns
+    lines = (tmp_path / "t" / "tables.jsonl").read_text().splitlines()
+    snap["objects"] = []
+    trace.capture_snapshot(snap)
+    trace.flush_to(tmp_path / "t")
+    # only the new scene is appended; flushed entries leave memory
+    assert (tmp_path / "t" / "tables.jsonl").read_text().splitlines()[: len(lines)] == lines
+    assert len(trace.scenes.values) == 0 and (tmp_path / "t" / "meta.json").stat().st_mtime_ns == meta
+    loaded = Trace.load(tmp_path / "t")
+    assert len(loaded.scenes) == 2 and loaded.frames["scene"].tolist() == [0, 0, 0, 1]
+    # a torn table line drops the rows that need it
+    with open(tmp_path / "t" / "tables.jsonl", "ab") as f:
+        f.write(b'["scenes", 2')
+    assert len(Trace.load(tmp_path / "t")) == 4
+
+
+def test_renderer_base_cache_is_bounded():
+    trace = Trace(10, (900, 540))
+    snap = World("s", seed=3).snapshot()
+    for i in range(FrameRenderer.max_bases + 4):
+        snap["objects"] = [{"x": 10.0 * i, "y": 20.0, "tag": "food"}]
+        trace.capture_snapshot(snap)
+    r = FrameRenderer(trace)
+    for i in range(len(trace)):
+        r.render(i)
+    assert len(r._bases) == FrameRenderer.max_bases
+
+
+def test_renderer_redraws_base_per_scene(tmp_path):
+    _recorded(tmp_path)
+    r = FrameRenderer(Trace.load(tmp_path / "t"))
+    a, b = np.asarray(r.render(2)), np.asarray(r.render(3))
+    hazard = (255, 107, 107)
+    room = slice(0, 500)  # left panel; the bpm sparkline shares the hazard colour
+    assert not (a[:, room] == hazard).all(axis=2).any()
+    assert (b[:, room] == hazard).all(axis=2).any()
+    # random access renders the same pixels as sequential playback
+    assert (np.asarray(FrameRenderer(r.trace).render(3)) == b).all()
+
+
+def test_render_trace_streams_gif_with_progress(tmp_path):
+    _recorded(tmp_path)
+    seen = []
+    out = render_trace(Trace.load(tmp_path / "t"), tmp_path / "t.gif", workers=0, progress=lambda d, n: seen.append((d, n)))
+    assert seen[-1] == (6, 6)
+    assert Image.open(out).n_frames == 6
+
+
+def test_record_and_render_endpoints(tmp_path):
+    settings = Settings(MEMORY_PATH=str(tmp_path / "memory.json"), ENABLE_THINK_LOOP=False, SIM_HZ=0, TRACE_DIR=str(tmp_path / "traces"))
+    with TestClient(create_app(settings)) as client:
+        rec = client.post("/record/start", params={"session": "a", "fps": 50}).json()
+        assert rec["recording"]
+        client.post("/agency/step", params={"session": "a"}, json={"type": "text", "value": "", "source": "test", "minutes": 5})
+        time.sleep(0.3)
+        stopped = client.post("/record/stop", params={"session": "a"}).json()
+        assert stopped["trace"] == rec["trace"] and stopped["frames"] > 0 and not stopped["recording"]
+        assert client.post("/record/stop", params={"session": "a"}).status_code == 404
+
+        assert client.post("/render", json={"trace": "missing", "format": "gif"}).status_code == 404
+        for name in (".", ".."):
+            assert client.post("/render", json={"trace": name, "format": "gif"}).status_code == 422
+        job = client.post("/render", json={"trace": rec["trace"], "format": "gif"}).json()
+        deadline = time.time() + 120
+        while (status := client.get(f"/render/{job['job']}").json())["status"] in ("queued", "running"):
+            assert time.time() < deadline
+            time.sleep(0.1)
+        assert status["status"] == "done" and status["progress"] == 1.0, status
+        r = client.get(f"/render/{job['job']}/file")
+        assert r.status_code == 200 and r.content[:6] == b"GIF89a"
+        assert client.get("/render/nope").status_code == 404
+
+
+def test_recorder_stop_waits_for_inflight_flush(tmp_path, monkeypatch):
+    import asyncio
+
+    from app.recorder import SessionRecorder
+
+    snap = World("s", seed=3).snapshot()
+
+    class Host:
+        async def call(self, session, msg):
+            return {"data": snap}
+
+    write = Trace.write_batch
+
+    def slow(path, batch):
+        time.sleep(0.05)
+        return write(path, batch)
+
+    monkeypatch.setattr(Trace, "write_batch", staticmethod(slow))
+
+    async def run():
+        rec = SessionRecorder(Host(), "s", tmp_path, fps=200, flush_every=0.0)
+        rec.start()
+        await asyncio.sleep(0.2)
+        return await rec.stop()
+
+    info = asyncio.run(run())
+    assert Trace.frame_count(tmp_path / info["trace"]) == info["frames"] > 0
+    assert len(Trace.load(tmp_path / info["trace"])) == info["frames"]
+
+
+def test_recorder_reports_a_failed_recording(tmp_path):
+    import asyncio
+
+    from app.recorder import SessionRecorder
+
+    class Host:
+        async def call(self, session, msg):
+            raise RuntimeError("shard gone")
+
+    async def run():
+        rec = SessionRecorder(Host(), "s", tmp_path)
+        rec.start()
+        await asyncio.sleep(0.05)
+        return rec.info(), await rec.stop()
+
+    running, stopped = asyncio.run(run())
+    assert not running["recording"] and running["error"] == "RuntimeError: shard gone"
+    assert stopped["error"] == running["error"] and stopped["frames"] == 0
+
+
+def test_render_jobs_keep_only_recent_finished_jobs(tmp_path):
+    from concurrent.futures import Future
+
+    from app.recorder import RenderJobs
+
+    jobs = RenderJobs(tmp_path, keep_finished=2)
+    for i in range(4):
+        jobs.jobs[f"j{i}"] = {"job": f"j{i}", "status": "running", "total": 1}
+    for i in range(3):
+        fut = Future()
+        fut.set_exception(RuntimeError("boom"))
+        jobs._finish(f"j{i}", fut)
+    assert sorted(jobs.jobs) == ["j1", "j2", "j3"]
+    assert jobs.status("j2")["status"] == "failed" and jobs.status("j0") is None
+
+
+def _decoded(path) -> list:
+    img = Image.open(path)
+    frames = []
+    for i in range(img.n_frames):
+        img.seek(i)
+        frames.append(np.asarray(img.convert("RGB")))
+    return frames
+
+
+def test_parallel_render_matches_inline(tmp_path):
+    _recorded(tmp_path, frames=10)
+    trace = Trace.load(tmp_path / "t")
+    inline = render_trace(trace, tmp_path / "inline.gif", workers=0, chunk=3)
+    parallel = render_trace(trace, tmp_path / "parallel.gif", workers=2, chunk=3)
+    a, b = _decoded(inline), _decoded(parallel)
+    assert len(a) == len(b) == 10
+    assert all((x == y).all() for x, y in zip(a, b))
+
+
+def test_frame_writer_falls_back_to_gif(tmp_path, monkeypatch):
+    import app.render as render
+
+    def no_ffmpeg(*args, **kwargs):
+        raise RuntimeError("ffmpeg not available")
+
+    monkeypatch.setattr(render.imageio, "get_writer", no_ffmpeg)
+    frames = [np.full((24, 32, 3), v, dtype=np.uint8) for v in (0, 128, 255)]
+    with FrameWriter(tmp_path / "out.mp4", 10, (32, 24), max_memory=32 * 24 * 3) as w:
+        for f in frames:
+            w.write(f)
+    assert w.path == tmp_path / "out.gif" and w.frames == 3
+    assert not (tmp_path / "out.mp4").exists()
+    decoded = _decoded(w.path)
+    assert len(decoded) == 3 and all((d == f).all() for d, f in zip(decoded, frames))
+
+
+def test_frame_writer_removes_partial_mp4(tmp_path, monkeypatch):
+    import app.render as render
+
+    class Broken:
+        closed = False
+
+        def __init__(self, path, **kwargs):
+            self.path = path
+            path.write_bytes(b"partial")
+
+        def append_data(self, frame):
+            raise RuntimeError("encoder died")
+
+        def close(self):
+            Broken.closed = True
+
+    monkeypatch.setattr(render.imageio, "get_writer", Broken)
+    with FrameWriter(tmp_path / "out.mp4", 10, (32, 24)) as w:
+        w.write(np.zeros((24, 32, 3), dtype=np.uint8))
+    assert Broken.closed and w.path == tmp_path / "out.gif"
+    assert not (tmp_path / "out.mp4").exists()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from app.shards import LocalHost
+from app.sim.replay import Replayer
+
+
+def _drive(host: LocalHost) -> dict:
+    w = host.world("incident")
+    w.handle({"type": "vision", "objects": [{"id": "f", "x": 90, "y": 90, "tag": "food"}, {"id": "h", "x": 300, "y": 200, "tag": "hazard"}]})
+    w.handle({"type": "planner", "lookahead": {"depth": 3, "budget_ms": 0.05}})
+    for i in range(40):
+        w.handle({"type": "advance", "dt": 0.05, "steps": 5})
+        if i % 4 == 0:
+            w.handle({"type": "tick", "minutes": 2, "food_available": i % 8 == 0, "threat": 0.6 if i == 12 else None})
+        if i == 20:
+            w.handle({"type": "sense", "stimulation": True})
+            w.handle({"type": "body_cmd", "cmd": "turn", "delta": 0.5})
+            w.handle({"type": "vision", "remove": ["h"]})
+    snap = w.snapshot()
+    snap.pop("ts")
+    return snap
+
+
+def test_replay_reproduces_logged_session(tmp_path):
+    host = LocalHost(event_log_dir=str(tmp_path))
+    expected = _drive(host)
+    host.close()
+    (log,) = tmp_path.glob("incident.*.jsonl")
+
+    rp = Replayer(log, snapshot_every=4)
+    stats = rp.run()
+    # one line per command: the 200 clock steps ride along on them
+    assert stats["events"] == len(rp) < 30
+    assert sum(e.get("clock", {}).get("steps", 0) for e in rp.events) == 200
+    got = rp.world.snapshot()
+    got.pop("ts")
+    assert got == expected
+
+    # seek back through a snapshot, then forward again to the same end state
+    rp.seek(5)
+    assert rp.position == 5
+    rp.run()
+    again = rp.world.snapshot()
+    again.pop("ts")
+    assert again == expected
+
+
+def test_quiet_session_log_is_flushed_and_keeps_trailing_steps(tmp_path):
+    from app.event_log import read_log
+
+    host = LocalHost(event_log_dir=str(tmp_path))
+    w = host.world("quiet")
+    w.handle({"type": "tick", "minutes": 1})
+    (log,) = tmp_path.glob("quiet.*.jsonl")
+    host.flush_logs()
+    _, events = read_log(log)
+    assert [e["msg"]["type"] for e in events] == ["tick"]
+
+    w.handle({"type": "advance", "dt": 0.05, "steps": 3})
+    host.close()
+    _, events = read_log(log)
+    events = list(events)
+    assert events[-1]["clock"] == {"dt": 0.05, "steps": 3} and "msg" not in events[-1]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import asyncio
+
+from app.shards import LocalHost, ShardPool, shard_index
+
+
+def test_shard_index_is_stable():
+    assert shard_index("agent-1", 4) == shard_index("agent-1", 4)
+    assert {shard_index(f"agent-{i}", 4) for i in range(64)} == {0, 1, 2, 3}
+
+
+def test_local_host_keeps_sessions_apart():
+    host = LocalHost()
+
+    async def run():
+        await host.call("a", {"type": "body_cmd", "cmd": "move", "forward": 1.0, "dt": 1.0})
+        a = await host.call("a", {"type": "get_state"})
+        b = await host.call("b", {"type": "get_state"})
+        return a, b
+
+    a, b = asyncio.run(run())
+    assert a["data"]["body"]["x"] > b["data"]["body"]["x"]
+
+
+def test_shard_pool_routes_to_owning_worker():
+    pool = ShardPool(2)
+    pool.start()
+
+    async def run():
+        await asyncio.gather(*(pool.call(f"s{i}", {"type": "tick", "minutes": 5.0}) for i in range(4)))
+        return await asyncio.gather(*(pool.call(f"s{i}", {"type": "agency_state"}) for i in range(4)))
+
+    try:
+        states = asyncio.run(run())
+    finally:
+        pool.close()
+    assert all(s["data"]["drives"]["hunger"] > 0.2 for s in states)
+
+
+def test_busy_shard_keeps_simulating():
+    import multiprocessing as mp
+    import threading
+    import time
+
+    from app.shards import _serve
+
+    parent, child = mp.Pipe(duplex=True)
+    threading.Thread(target=_serve, args=(child, 50.0), daemon=True).start()
+    stop, lock, stats = threading.Event(), threading.Lock(), {}
+
+    def flood():
+        # requests are always queued, so the worker's poll never times out
+        rid = 0
+        while not stop.is_set():
+            with lock:
+                parent.send((rid, "a", {"type": "get_state"}))
+            rid += 1
+
+    def drain():
+        while (reply := parent.recv())[0] != -1:
+            pass
+        stats.update(reply[2])
+
+    threading.Thread(target=flood, daemon=True).start()
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    time.sleep(0.5)
+    stop.set()
+    with lock:
+        parent.send((-1, None, {"op": "stats"}))
+    reader.join(timeout=5.0)
+    with lock:
+        parent.send(None)
+    assert stats["steps"] >= 15
+
+
+def test_dead_worker_fails_requests():
+    import pytest
+
+    from app.shards import ShardError
+
+    pool = ShardPool(1)
+    pool.start()
+
+    async def run():
+        assert (await pool.call("a", {"type": "get_state"}))["type"]
+        pool._procs[0].kill()
+        # whether the send races the worker's exit or not, the call fails instead of hanging
+        for _ in range(2):
+            with pytest.raises(ShardError):
+                await asyncio.wait_for(pool.call("a", {"type": "get_state"}), 10.0)
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.close()
+
+
+def test_local_host_evicts_idle_and_least_recent_sessions():
+    import time
+
+    host = LocalHost(max_sessions=2)
+    for s in ("a", "b", "a", "c"):
+        host.world(s)
+    assert sorted(host.worlds) == ["a", "c"] and host.sim_stats()["evicted"] == 1
+
+    host = LocalHost(idle_timeout=0.05)
+    host.world("a")
+    time.sleep(0.1)
+    host.world("b")
+    assert list(host.worlds) == ["b"]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from app.sim_clock import FixedStepClock
+from app.world import World
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_accumulator_runs_fixed_steps_and_caps_catch_up():
+    clock = FakeClock()
+    c = FixedStepClock(20.0, max_catchup=4, clock=clock)
+    c.start()
+    clock.t = 0.049
+    assert c.due() == 0
+    clock.t = 0.101
+    assert c.due() == 2
+    # a one-second stall only catches up 4 steps, the rest is dropped and reported
+    clock.t = 1.101
+    assert c.due() == 4
+    stats = c.stats()
+    assert stats["dropped_steps"] == 16
+    assert stats["late_wakeups"] >= 1 and stats["max_lag_ms"] > 900
+
+
+def test_headless_ignores_wall_clock():
+    c = FixedStepClock(20.0, max_catchup=8, headless=True, clock=FakeClock())
+    assert c.due() == 8 and c.due() == 8
+    assert c.time_to_next() == 0.0
+    assert c.stats()["sim_seconds"] == 0.8
+
+
+def test_world_motion_is_independent_of_step_size():
+    objects = [{"id": "f", "x": 400.0, "y": 180.0, "tag": "food"}]
+    coarse, fine = World(), World()
+    for w in (coarse, fine):
+        w.vision(objects)
+        w.agency.drives.curiosity = 0.0
+        w.agency.step(0.0, {})
+    coarse.advance(1.0)
+    for _ in range(20):
+        fine.advance(0.05)
+    assert abs(coarse.body.state.x - fine.body.state.x) < 2.0
+    assert len(coarse.ts["bpm"]) == len(fine.ts["bpm"]) == 1
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from app.agency.agency import Agency
+from app.world import World
+
+
+def test_dump_state_matches_pydantic_shape():
+    a = Agency()
+    a.sense({"threat": 0.4})
+    a.decide({"food_available": True})
+    a.observe_vision([{"id": 1, "tag": "food"}])
+    assert a.dump_state() == a.state.to_model().model_dump(mode="json")
+
+
+def test_snapshot_is_cached_until_a_version_changes():
+    w = World("s", seed=1)
+    first = w.snapshot()
+    again = w.snapshot()
+    assert again["state"] is first["state"] and again["body"] is first["body"]
+
+    w.body_cmd({"cmd": "turn", "delta": 0.3})
+    moved = w.snapshot()
+    assert moved["body"] is not first["body"] and moved["state"] is first["state"]
+
+    w.tick(10.0)
+    assert w.snapshot()["state"]["drives"] == w.agency.drives.as_dict() != first["state"]["drives"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+import csv
+
+from app.sim.sweep import Sweep, SweepSpec, grid
+
+
+def _spec(**kw) -> SweepSpec:
+    return SweepSpec(
+        scenario={"seconds": 10.0, "dt": 0.2, "schedule": [{"at": 2.0, "threat": 0.7}]},
+        grid={"gains.hunger_gain_per_min": [0.02, 6.0], "policy.lr": [0.05]},
+        seeds=[0, 1],
+        **kw,
+    )
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_grid_expands_product():
+    assert len(list(grid({"a": [1, 2, 3], "b": [0, 1]}))) == 6
+
+
+def test_sweep_writes_metrics_and_resumes(tmp_path):
+    out = tmp_path / "sweep.csv"
+    first = Sweep(_spec(), out, workers=0)
+    best = first.run()
+    rows = _rows(out)
+    assert len(rows) == 4 and first.completed == 4
+    assert all(float(r["threat_exposure"]) > 0 for r in rows)
+    fast = [r for r in rows if float(r["gains.hunger_gain_per_min"]) == 6.0]
+    assert all(float(r["time_hungry"]) > 0 for r in fast)
+    assert float(best["gains.hunger_gain_per_min"]) == 0.02
+
+    again = Sweep(_spec(), out, workers=0)
+    again.run()
+    assert again.completed == 0 and again.skipped == 4
+    assert len(_rows(out)) == 4
+
+
+def test_limits_stop_runs_early(tmp_path):
+    out = tmp_path / "sweep.csv"
+    Sweep(_spec(limits={"threat_exposure": 0.5}), out, workers=0).run()
+    rows = _rows(out)
+    assert all(r["stopped"] == "1" and int(r["steps"]) < 50 for r in rows)
+
+
+def test_process_pool_matches_inline_and_honours_patience(tmp_path):
+    inline, pooled = tmp_path / "inline.csv", tmp_path / "pooled.csv"
+    Sweep(_spec(), inline, workers=0).run()
+    sweep = Sweep(_spec(), pooled, workers=2)
+    sweep.run()
+    assert sweep.completed == 4
+    key = lambda r: r["key"]
+    drop = ("elapsed",)
+    assert [{k: v for k, v in r.items() if k not in drop} for r in sorted(_rows(pooled), key=key)] == \
+        [{k: v for k, v in r.items() if k not in drop} for r in sorted(_rows(inline), key=key)]
+
+    # prune_below has no effect on a 10 s run: every run ties, so none improves on the first
+    spec = _spec(patience=1)
+    spec.grid = {"policy.prune_below": [1e-6, 1e-7, 1e-8, 1e-9, 1e-10, 1e-11]}
+    out = tmp_path / "patience.csv"
+    stopped = Sweep(spec, out, workers=2)
+    stopped.run()
+    assert 2 <= stopped.completed < 12 and len(_rows(out)) == stopped.completed
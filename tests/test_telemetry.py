@@ -0,0 +1,102 @@
+from __future__ import annotations
+import time
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.telemetry import TelemetryStore
+from app.world import World
+
+
+def test_rollups_keep_min_max_mean():
+    store = TelemetryStore()
+    t0 = 1_699_999_200.0  # aligned to the hour
+    for i in range(180):
+        store.record("s", "bpm", 60 + i % 60, t=t0 + i)
+    q = store.query("s", "bpm", t0, t0 + 179, max_points=10)
+    assert q["resolution"] == "1m"
+    assert q["t"] == [t0, t0 + 60, t0 + 120]
+    assert q["min"] == [60.0] * 3 and q["max"] == [119.0] * 3
+    assert q["mean"][0] == 89.5
+    raw = store.query("s", "bpm", t0, t0 + 179, max_points=1000)
+    assert raw["resolution"] == "raw" and len(raw["t"]) == 180
+
+
+def test_resolution_falls_back_when_raw_has_wrapped():
+    store = TelemetryStore()
+    t0 = 1_699_999_200.0
+    for i in range(2 * 3600):
+        store.record("s", "x", float(i), t=t0 + i)
+    assert store.query("s", "x", t0 + 5000, t0 + 5100)["resolution"] == "raw"
+    q = store.query("s", "x", t0, t0 + 100)  # raw ring no longer reaches t0
+    assert q["resolution"] == "1m" and q["t"] == [t0, t0 + 60]
+
+
+def test_memory_mapped_series_survive_reopen(tmp_path):
+    t0 = 1_699_999_200.0
+    a = TelemetryStore(tmp_path)
+    for i in range(120):
+        a.record("s/1", "hunger", i / 120, t=t0 + i)
+    a.flush()
+    b = TelemetryStore(tmp_path)
+    assert b.metrics("s/1") == ["hunger"]
+    q = b.query("s/1", "hunger", t0, t0 + 200)
+    assert q["resolution"] == "raw" and len(q["t"]) == 120
+    b.record("s/1", "hunger", 1.0, t=t0 + 120)  # appends after the recovered head
+    assert len(b.query("s/1", "hunger", t0, t0 + 200)["t"]) == 121
+
+
+def test_world_samples_into_store():
+    w = World("s", seed=1)
+    w.telemetry = TelemetryStore()
+    for _ in range(30):
+        w.advance(0.5)
+    assert set(w.telemetry_query({})["metrics"]) >= {"bpm", "hunger", "threat", "activity"}
+    q = w.telemetry_query({"metric": "bpm", "start": time.time() - 60})
+    assert q["resolution"] == "raw" and len(q["t"]) == 15
+    assert w.telemetry_query({"metric": "bpm"})["resolution"] == "1m"  # an hour at 1 s is > max_points
+
+
+def test_telemetry_endpoint(tmp_path):
+    settings = Settings(MEMORY_PATH=str(tmp_path / "memory.json"), ENABLE_THINK_LOOP=False, SIM_HZ=0, TELEMETRY_DIR=str(tmp_path / "tm"))
+    with TestClient(create_app(settings)) as client:
+        w = client.app.state.runtime.host.world("a")
+        for _ in range(4):
+            w.advance(1.0)
+        assert "bpm" in client.get("/telemetry", params={"session": "a"}).json()["metrics"]
+        r = client.get("/telemetry/bpm", params={"session": "a", "start": time.time() - 60})
+        assert r.status_code == 200
+        assert r.json()["resolution"] == "raw" and len(r.json()["t"]) == 4
+    assert (client.app.state.runtime.host.telemetry.path("a", "bpm") / "1h.ring").exists()
+    settings = Settings(MEMORY_PATH=str(tmp_path / "memory.json"), ENABLE_THINK_LOOP=False, SIM_HZ=0)
+    with TestClient(create_app(settings)) as client:
+        assert client.get("/telemetry/bpm").status_code == 400
+
+
+def test_similar_names_do_not_collide_and_reads_create_nothing(tmp_path):
+    store = TelemetryStore(tmp_path)
+    store.record("s", "a/b", 1.0, t=100.0)
+    store.record("s", "a_b", 2.0, t=100.0)
+    assert store.metrics("s") == ["a/b", "a_b"]
+    assert store.query("s", "a/b", 0, 200)["mean"] == [1.0]
+    # empty ring slots (t = 0) are not samples, even for windows reaching back to 0
+    assert store.query("s", "a_b", -10, 200)["t"] == [100.0]
+    q = store.query("s", "missing", 0, 200)
+    assert q["t"] == [] and "missing" not in store.metrics("s")
+    assert store.path("s", "missing") is not None and not store.path("s", "missing").exists()
+    assert TelemetryStore(tmp_path).metrics("s") == ["a/b", "a_b"]
+
+
+def test_open_buckets_survive_restart(tmp_path):
+    t0 = 1_699_999_200.0
+    a = TelemetryStore(tmp_path)
+    for i in range(30):
+        a.record("s", "x", 1.0, t=t0 + i)
+    a.flush()
+    b = TelemetryStore(tmp_path)
+    for i in range(30, 90):
+        b.record("s", "x", 3.0, t=t0 + i)
+    q = b.query("s", "x", t0, t0 + 119, max_points=3)
+    assert q["resolution"] == "1m" and q["t"] == [t0, t0 + 60]
+    assert q["mean"][0] == 2.0 and q["min"][0] == 1.0 and q["max"][0] == 3.0
@@ -0,0 +1,44 @@
+from __future__ import annotations
+import random
+
+from app.think_scheduler import ThinkScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_skips_unchanged_state_and_backs_off():
+    s = ThinkScheduler(base_interval=5.0, max_interval=40.0, backoff=2.0, jitter=0.0, clock=FakeClock())
+    assert s.should_think(("calm", 0.2)) == (True, "changed")
+    delays = []
+    for _ in range(5):
+        assert s.should_think(("calm", 0.2)) == (False, "unchanged")
+        delays.append(s.next_delay())
+    assert delays == [10.0, 20.0, 40.0, 40.0, 40.0]
+    assert s.should_think(("anxious", 0.8)) == (True, "changed")
+    assert s.next_delay() == 5.0
+    stats = s.stats()
+    assert stats["ticks_run"] == 2 and stats["ticks_skipped"] == 5
+
+
+def test_pauses_under_heavy_traffic():
+    clock = FakeClock()
+    s = ThinkScheduler(base_interval=5.0, busy_rps=1.0, window_seconds=10.0, jitter=0.0, clock=clock)
+    for _ in range(20):
+        s.note_activity()
+    assert s.should_think(1) == (False, "busy")
+    clock.t = 30.0
+    assert s.should_think(1) == (True, "changed")
+    assert s.stats()["skipped_by_reason"]["busy"] == 1
+
+
+def test_jitter_stays_within_bounds():
+    s = ThinkScheduler(base_interval=10.0, jitter=0.2, rng=random.Random(3))
+    delays = [s.next_delay() for _ in range(50)]
+    assert all(8.0 <= d <= 12.0 for d in delays)
+    assert len(set(delays)) > 1
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from app.agency.agency import Agency
+from app.agency.thoughts import ThoughtLog
+
+
+def test_decide_records_without_rendering():
+    a = Agency()
+    a.decide({"food_available": True})
+    assert len(a.thoughts) == 1 and a.state.last_thoughts == []
+    lines = a.dump_state()["last_thoughts"]
+    assert len(lines) == 6 and lines[-1].startswith("Chosen: ")
+    assert a.thoughts.render() is a.thoughts.render()  # cached until the next push
+
+
+def test_vision_prepends_and_buffer_is_bounded():
+    a = Agency()
+    a.decide({})
+    a.observe_vision([{"id": 1, "tag": "food"}, {"id": 2}])
+    lines = a.thoughts.render()
+    assert lines[0] == "Vision: 2 object(s) in view -> food, 2"
+    assert lines[1].startswith("Assessing drives:") and len(lines) == 6
+
+    log = ThoughtLog(maxlen=3)
+    for i in range(10):
+        log.push("vision", i, ())
+    assert len(log) == 3 and log.render()[0].startswith("Vision: 9 ")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from app.world import World
+
+
+def test_batch_applies_in_order_with_one_coalesced_reply():
+    w = World()
+    x0 = w.body.state.x
+    cmds = [{"type": "body_cmd", "cmd": "move", "forward": 1.0, "dt": 0.5} for _ in range(10)]
+    cmds.append({"type": "body_cmd", "cmd": "turn", "delta": 0.5})
+    reply = w.handle({"type": "batch", "commands": cmds})
+    assert reply["type"] == "batch_result" and reply["count"] == 11
+    assert reply["errors"] == []
+    assert set(reply["data"]) == {"body"}
+    assert reply["data"]["body"]["x"] > x0 and reply["data"]["body"]["yaw"] == 0.5
+
+
+def test_batch_snapshot_subsumes_body_state_and_reports_errors():
+    w = World()
+    reply = w.handle_batch([
+        {"type": "sense", "threat": 0.7},
+        {"type": "body_cmd", "cmd": "turn", "delta": 0.1},
+        {"type": "bogus"},
+        {"type": "tick", "minutes": 1.0},
+    ])
+    assert set(reply["data"]) == {"state", "step"}
+    assert reply["data"]["state"]["body"]["yaw"] == 0.1
+    assert reply["errors"] == [{"index": 2, "error": "unknown_type"}]
+    assert reply["applied"] == 3  # the commands around the failure still applied
+
+
+def test_no_reply_batches_stay_silent_unless_something_failed():
+    w = World()
+    assert w.handle_batch([{"type": "body_cmd", "cmd": "turn", "delta": 0.2}], no_reply=True) is None
+    assert w.body.state.yaw == 0.2
+    partial = w.handle_batch([{"type": "body_cmd", "cmd": "turn", "delta": 0.1, "no_reply": True}, {"type": "get_state"}])
+    assert set(partial["data"]) == {"state"}
+    failed = w.handle_batch([{"type": "nope"}], no_reply=True)
+    assert failed["errors"] and failed["data"] == {}
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import argparse, time
+
+# Import internal modules (no server needed)
+import sys
+from pathlib import Path as _Path
+sys.path.append(str(_Path(__file__).resolve().parents[1]))
+import numpy as np
+
+from app.body.crowd import BodyBank
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark vectorized multi-body physics with grid broadphase")
+    p.add_argument("--sizes", default="1000,10000,100000")
+    p.add_argument("--density", type=float, default=2e-3, help="Bodies per square pixel")
+    p.add_argument("--obstacles", type=float, default=0.05, help="Obstacles per body")
+    p.add_argument("--steps", type=int, default=20)
+    args = p.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'bodies':>8} {'ms/step':>9} {'us/body':>8} {'contacts':>9}")
+    for n in map(int, args.sizes.split(",")):
+        side = (n / args.density) ** 0.5
+        bank = BodyBank(n, side, side, radius=6.0, seed=1)
+        m = int(n * args.obstacles)
+        bank.set_obstacles([{"x": float(x), "y": float(y)} for x, y in rng.uniform(10, side - 10, (m, 2))])
+        forward = rng.uniform(0.0, 1.0, n)
+        bank.move(forward, dt=0.05)  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(args.steps):
+            bank.turn(rng.uniform(-0.2, 0.2, n))
+            bank.tick(0.05)
+            bank.move(forward, dt=0.05)
+        dt = (time.perf_counter() - t0) / args.steps
+        print(f"{n:>8} {dt * 1e3:>9.2f} {dt / n * 1e6:>8.2f} {bank.last_pairs:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+import argparse, random, time
+
+# Import internal modules (no server needed)
+import sys
+from pathlib import Path as _Path
+sys.path.append(str(_Path(__file__).resolve().parents[1]))
+from app.agency.nav_field import NavField
+from app.agency.policy import Policy
+
+
+def _scene(n: int, extent: float, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    tags = ["food", "hazard", "", "obj", "rock"]
+    return [{"id": i, "x": rng.uniform(0, extent), "y": rng.uniform(0, extent), "tag": rng.choice(tags)} for i in range(n)]
+
+
+def _timeit(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark scalar vs vectorized Policy nav field queries")
+    p.add_argument("--sizes", default="1000,10000,50000")
+    p.add_argument("--density", type=float, default=2e-4, help="Objects per square pixel")
+    p.add_argument("--repeat", type=int, default=20)
+    args = p.parse_args()
+
+    policy = Policy()
+    drives = {"hunger": 0.6, "threat": 0.4, "curiosity": 0.0}
+    print(f"{'objects':>8} {'scalar ms':>10} {'field ms':>9} {'build ms':>9} {'candidates':>10}")
+    for n in map(int, args.sizes.split(",")):
+        extent = (n / args.density) ** 0.5
+        objects = _scene(n, extent, 1)
+        ax = ay = extent / 2
+        rel = [{"tag": o["tag"], "x": o["x"] - ax, "y": o["y"] - ay} for o in objects]
+        scalar = _timeit(lambda: policy.nav_vector(rel, drives), max(1, args.repeat // 5))
+        t0 = time.perf_counter()
+        field = NavField(objects, sigma=policy.sigma)
+        build = time.perf_counter() - t0
+        vec = _timeit(lambda: policy.nav_vector_field(field, ax, ay, drives), args.repeat)
+        print(f"{n:>8} {scalar * 1e3:>10.2f} {vec * 1e3:>9.3f} {build * 1e3:>9.1f} {len(field.candidates(ax, ay)):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+import argparse, os, tempfile, time
+
+# Import internal modules (no server needed)
+import sys
+from pathlib import Path as _Path
+sys.path.append(str(_Path(__file__).resolve().parents[1]))
+
+from app.render import render_trace
+from tools.render_demo import simulate
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark render_demo frame rendering across worker processes")
+    p.add_argument("--seconds", type=float, default=20.0)
+    p.add_argument("--fps", type=int, default=30)
+    p.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 0,1,2,4,...,cores)")
+    p.add_argument("--format", default="mp4", choices=("mp4", "gif"))
+    args = p.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = [int(w) for w in args.workers.split(",")] if args.workers else sorted({0, 1, *(2**k for k in range(1, 6) if 2**k <= cores), cores})
+    t0 = time.perf_counter()
+    trace = simulate(args.seconds, args.fps)
+    sim = time.perf_counter() - t0
+    print(f"simulated {len(trace)} frames in {sim:.2f}s ({trace.frames.nbytes / 1024:.0f} KiB trace), {cores} cores")
+    print(f"{'workers':>8} {'seconds':>8} {'frames/s':>9} {'speedup':>8}")
+    base = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for w in counts:
+            t0 = time.perf_counter()
+            render_trace(trace, _Path(tmp) / f"bench_{w}.{args.format}", workers=w)
+            dt = time.perf_counter() - t0
+            base = base or dt
+            print(f"{w:>8} {dt:>8.2f} {len(trace) / dt:>9.1f} {base / dt:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+import argparse, asyncio, os, time
+
+# Import internal modules (no server needed)
+import sys
+from pathlib import Path as _Path
+sys.path.append(str(_Path(__file__).resolve().parents[1]))
+from app.shards import ShardPool
+
+
+async def _drive(pool: ShardPool, sessions: list[str], steps: int, rounds: int) -> float:
+    msg = {"type": "advance", "dt": 1.0, "steps": steps}
+    # warm-up: create worlds on their shards
+    await asyncio.gather(*(pool.call(s, {"type": "get_state"}) for s in sessions))
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(pool.call(s, msg) for s in sessions))
+    return time.perf_counter() - t0
+
+
+def bench(workers: int, sessions: int, steps: int, rounds: int) -> float:
+    """Return simulated agent-steps per second for a pool of `workers` shards."""
+    pool = ShardPool(workers)
+    pool.start()
+    try:
+        names = [f"agent-{i}" for i in range(sessions)]
+        elapsed = asyncio.run(_drive(pool, names, steps, rounds))
+    finally:
+        pool.close()
+    return sessions * steps * rounds / elapsed
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark sharded world hosting: agent-steps/s vs worker count")
+    p.add_argument("--sessions", type=int, default=256, help="Number of agent sessions")
+    p.add_argument("--steps", type=int, default=50, help="Simulation steps per session per round")
+    p.add_argument("--rounds", type=int, default=3)
+    p.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = p.parse_args()
+
+    base = None
+    print(f"{'workers':>7} {'agent-steps/s':>14} {'speedup':>8} {'efficiency':>10}")
+    for n in range(1, args.max_workers + 1):
+        rate = bench(n, args.sessions, args.steps, args.rounds)
+        base = base or rate
+        print(f"{n:>7} {rate:>14.0f} {rate / base:>8.2f} {rate / base / n:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import argparse, os, subprocess, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_SPAWN_SNIPPET = """
+import time
+t0 = time.perf_counter()
+from app.shards import ShardPool
+pool = ShardPool(1)
+pool.start()
+import asyncio
+asyncio.run(pool.call("bench", {"type": "get_state"}))
+print(time.perf_counter() - t0)
+pool.close()
+"""
+
+_APP_SNIPPET = """
+import time
+t0 = time.perf_counter()
+from app.main import create_app
+from fastapi.testclient import TestClient
+app = create_app()
+t1 = time.perf_counter()
+with TestClient(app) as client:
+    t2 = time.perf_counter()
+    client.get("/health")
+    t3 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2)
+"""
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, ENABLE_THINK_LOOP="false", PYTHONPATH=str(ROOT))
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    """Parse `python -X importtime` output into (self_us, cumulative_us, name)."""
+    res = _python(f"import {module}", "-X", "importtime")
+    rows = []
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(self_us), int(cum_us), name))
+    return rows
+
+
+def main():
+    p = argparse.ArgumentParser(description="Report cold-start import time, app factory startup and shard worker spawn cost")
+    p.add_argument("--module", default="app.main")
+    p.add_argument("--top", type=int, default=15, help="Show the N slowest imports (cumulative)")
+    args = p.parse_args()
+
+    rows = import_times(args.module)
+    target = next((r for r in rows if r[2].strip() == args.module), None)
+    print(f"import {args.module}: {target[1] / 1000 if target else float('nan'):.1f} ms cumulative")
+    print(f"{'self ms':>9} {'cum ms':>9}  module")
+    for self_us, cum_us, name in sorted(rows, key=lambda r: -r[1])[: args.top]:
+        print(f"{self_us / 1000:>9.1f} {cum_us / 1000:>9.1f}  {name}")
+
+    build, startup, first = map(float, _python(_APP_SNIPPET).stdout.split())
+    print(f"create_app: {build * 1000:.1f} ms | lifespan startup: {startup * 1000:.1f} ms | first request: {first * 1000:.1f} ms")
+    t0 = time.perf_counter()
+    spawn = float(_python(_SPAWN_SNIPPET).stdout.split()[0])
+    print(f"shard worker spawn + first reply: {spawn * 1000:.1f} ms (process total {1000 * (time.perf_counter() - t0):.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()